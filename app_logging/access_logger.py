@@ -1,15 +1,27 @@
 
 
+import atexit
 import logging  # Python built-in logging
+import logging.handlers
 import os
+import queue
+import threading
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 from enum import Enum
 
-from config.settings import LOG_FILE, LOG_FORMAT
-from recognition.recognizer import RecognitionResult
-from database.crud import create_access_log
-from database.models import User
+from face_access_system.config.settings import (
+    LOG_FILE,
+    LOG_FORMAT,
+    ACCESS_LOG_ASYNC,
+    ACCESS_LOG_QUEUE_SIZE,
+    DOOR_ID,
+)
+from face_access_system.recognition.recognizer import RecognitionResult
+from face_access_system.database.crud import create_access_log
+from face_access_system.database.models import User
+from face_access_system.app_logging.log_writer import AccessLogWriter
+from face_access_system.app_logging.metrics import metrics
 
 class AccessStatus(Enum):
     GRANTED = "ACCESS GRANTED"
@@ -25,20 +37,91 @@ class AccessDecision:
     message: str
 
 
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Kuyruk doluyken kare döngüsünü bekletmez; kaydı atar ve sayar."""
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+# Konsol / dosya handler'ları tek bir QueueListener iş parçacığında çalışır.
+# Dinleyici AccessLogger örnekleri arasında referans sayılır: son örnek
+# close() edilince durur (kuyrukta kalanları yazar), sonra oluşturulan bir
+# örnek onu yeniden başlatır.
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_users = 0
+_listener_lock = threading.Lock()
+_queue_handler: Optional[_DroppingQueueHandler] = None
+_targets: List[logging.Handler] = []
+
+
+def _acquire_listener() -> None:
+    global _listener, _listener_users
+    with _listener_lock:
+        _listener_users += 1
+        if _listener is None:
+            _listener = logging.handlers.QueueListener(
+                _queue_handler.queue, *_targets, respect_handler_level=True
+            )
+            _listener.start()
+
+
+def _release_listener() -> None:
+    global _listener_users
+    with _listener_lock:
+        _listener_users = max(0, _listener_users - 1)
+        if _listener_users == 0:
+            _stop_listener_locked()
+
+
+def _stop_listener_locked() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()     # Kuyrukta kalan kayıtları yazar
+        _listener = None
+
+
+def _stop_listener() -> None:
+    with _listener_lock:
+        _stop_listener_locked()
+
+
 class AccessLogger:
-    def __init__(self):
+    def __init__(
+        self,
+        writer: Optional[AccessLogWriter] = None,
+        async_db: bool = ACCESS_LOG_ASYNC,
+        door: Optional[str] = DOOR_ID
+    ):
+        self.door = door
+        self._closed = False
         self._setup_logger()
+        _acquire_listener()
+        # async_db kapalıysa her karar eskisi gibi anında (senkron) yazılır
+        self.writer = writer if writer is not None else (AccessLogWriter() if async_db else None)
+        if self.writer is not None:
+            atexit.register(self.writer.close)
 
     def _setup_logger(self) -> None:
         """Log dizinini ve handler'ları ayarlar."""
+        global _queue_handler
         os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
 
         # Orijinal logging kütüphanesinden bir logger nesnesi oluşturuyoruz
         self.logger = logging.getLogger("access_audit")
         self.logger.setLevel(logging.INFO)
 
-        # Eğer handler'lar yoksa (yeniden başlatmada çift log yazmaması için) ekle
-        if not self.logger.handlers:
+        # Handler'lar süreçte bir kez eklenir (yeniden başlatmada çift log yazmaması için)
+        with _listener_lock:
+            if _queue_handler is not None:
+                return
             formatter = logging.Formatter(LOG_FORMAT)
 
             # Konsol (Terminal) Logu
@@ -49,9 +132,30 @@ class AccessLogger:
             file_h = logging.FileHandler(LOG_FILE)
             file_h.setFormatter(formatter)
 
-            self.logger.addHandler(console)
-            self.logger.addHandler(file_h)
-
+            # Çağıran yalnızca kuyruğa koyar; biçimlendirme + disk G/Ç dinleyicide
+            _queue_handler = _DroppingQueueHandler(queue.Queue(ACCESS_LOG_QUEUE_SIZE))
+            _targets.extend([console, file_h])
+            self.logger.addHandler(_queue_handler)
+            self.logger.propagate = False
+            atexit.register(_stop_listener)
+
+    def close(self) -> None:
+        """Bekleyen veritabanı ve dosya kayıtlarını yazar (kapanışta çağrılır)."""
+        if self._closed:
+            return
+        self._closed = True
+        if self.writer is not None:
+            self.writer.close()
+        _release_listener()
+
+    def _record(self, user_id: Optional[int], confidence: float, access_granted: bool) -> None:
+        if self.writer is not None:
+            self.writer.submit(user_id, confidence, access_granted, door=self.door)
+        else:
+            create_access_log(user_id=user_id, confidence=confidence, access_granted=access_granted,
+                              door=self.door)
+
+    @metrics.timed("access_decision_seconds")
     def log_access(self, result: RecognitionResult) -> AccessDecision:
         """Tanıma sonucunu değerlendirir, loglar ve veritabanına işler."""
         user = result.matched_user if result.is_recognized else None
@@ -60,13 +164,16 @@ class AccessLogger:
         if result.is_recognized and user:
             if user.is_authorized:
                 self.logger.info(f"[GRANTED] User: {user.name} | Score: {conf:.4f}")
-                create_access_log(user_id=user.id, confidence=conf, access_granted=True)
+                self._record(user.id, conf, True)
+                metrics.inc("access_decisions_total", labels={"status": "granted"})
                 return AccessDecision(AccessStatus.GRANTED, user, conf, f"Welcome, {user.name}!")
 
             self.logger.warning(f"[DENIED] Unauthorized Attempt: {user.name}")
-            create_access_log(user_id=user.id, confidence=conf, access_granted=False)
+            self._record(user.id, conf, False)
+            metrics.inc("access_decisions_total", labels={"status": "denied"})
             return AccessDecision(AccessStatus.DENIED, user, conf, "Access Denied")
 
         self.logger.warning(f"[UNKNOWN] Not recognized | Score: {conf:.4f}")
-        create_access_log(user_id=None, confidence=conf, access_granted=False)
+        self._record(None, conf, False)
+        metrics.inc("access_decisions_total", labels={"status": "unknown"})
         return AccessDecision(AccessStatus.UNKNOWN, None, conf, "Unknown Face")
\ No newline at end of file
@@ -0,0 +1,130 @@
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from face_access_system.config.settings import (
+    ACCESS_LOG_BATCH_SIZE,
+    ACCESS_LOG_FLUSH_INTERVAL,
+    ACCESS_LOG_QUEUE_SIZE,
+    ACCESS_LOG_PUT_TIMEOUT,
+    DOOR_ID,
+)
+from face_access_system.database.crud import AccessLogRow, create_access_logs
+
+
+class AccessLogWriter:
+    """
+    access_logs için arka plan yazıcısı.
+
+    submit() kaydı sınırlı bir kuyruğa koyar ve hemen döner; yazıcı iş parçacığı
+    kayıtları batch_size'a ulaşınca ya da flush_interval dolunca tek
+    transaction'da (executemany) yazar. Kuyruk doluysa put_timeout kadar
+    beklenir (geri basınç), hâlâ doluysa kayıt atılır ve dropped sayılır.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = ACCESS_LOG_BATCH_SIZE,
+        flush_interval: float = ACCESS_LOG_FLUSH_INTERVAL,
+        max_queue: int = ACCESS_LOG_QUEUE_SIZE,
+        put_timeout: float = ACCESS_LOG_PUT_TIMEOUT
+    ):
+        self.batch_size     = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.put_timeout    = put_timeout
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="access-log-writer", daemon=True)
+
+        self.written = 0
+        self.dropped = 0
+        self.failed  = 0
+        self.batches = 0
+
+        self._thread.start()
+
+    # ─── Üretici tarafı ─────────────────────────────
+    def submit(
+        self,
+        user_id: Optional[int],
+        confidence: float,
+        access_granted: bool,
+        timestamp: Optional[datetime] = None,
+        door: Optional[str] = DOOR_ID
+    ) -> bool:
+        if self._closed:
+            self.dropped += 1
+            return False
+
+        row: AccessLogRow = (user_id, confidence, access_granted, timestamp or datetime.now(), door)
+        try:
+            self._queue.put(row, timeout=self.put_timeout)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Şu ana kadar kuyruğa girmiş kayıtlar yazılana kadar bekler."""
+        if not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Yeni kayıt kabul etmeyi bırakır, kalanları yazar ve iş parçacığını durdurur."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "written":     self.written,
+            "dropped":     self.dropped,
+            "failed":      self.failed,
+            "batches":     self.batches,
+            "queue_depth": self._queue.qsize(),
+        }
+
+    # ─── Yazıcı iş parçacığı ────────────────────────
+    def _run(self) -> None:
+        batch: List[AccessLogRow] = []
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False      # Süre doldu → elde ne varsa yaz
+
+            if isinstance(item, tuple):
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) < self.batch_size:
+                    continue
+
+            self._write(batch)
+            batch, deadline = [], None
+
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is None:
+                return
+
+    def _write(self, batch: List[AccessLogRow]) -> None:
+        if not batch:
+            return
+        try:
+            self.written += create_access_logs(batch)
+            self.batches += 1
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"[AccessLogWriter] {len(batch)} kayıt yazılamadı: {e}")
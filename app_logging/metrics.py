@@ -0,0 +1,235 @@
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from face_access_system.config.settings import (
+    METRICS_ENABLED,
+    METRICS_DUMP_PATH,
+    METRICS_DUMP_INTERVAL_SEC,
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# 10 µs … ~10 sn, oktav başına 4 kova (~%19 genişlik) → yüzdelik hatası ≤ ~%10
+BUCKET_BOUNDS: List[float] = [1e-5 * 2 ** (i / 4) for i in range(81)]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> Labels:
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def _label_text(labels: Labels, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels] + ([extra] if extra else [])
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    """Sabit log ölçekli kovalar; observe O(log kova), yüzdelikler kovalardan."""
+
+    def __init__(self):
+        self._lock   = threading.Lock()
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)    # Son kova: +Inf
+        self.count   = 0
+        self.sum     = 0.0
+        self.max     = 0.0
+
+    def observe(self, seconds: float) -> None:
+        i = bisect.bisect_left(BUCKET_BOUNDS, seconds)
+        with self._lock:
+            self.buckets[i] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Kova içinde log-doğrusal ara değer; örnek yoksa 0."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                if i >= len(BUCKET_BOUNDS):
+                    return self.max
+                lower = BUCKET_BOUNDS[i - 1] if i else 0.0
+                upper = BUCKET_BOUNDS[i]
+                frac = (rank - seen) / n
+                value = lower * (upper / lower) ** frac if lower else upper * frac
+                return min(value, self.max)
+            seen += n
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count":   self.count,
+            "mean_ms": round(self.sum / self.count * 1e3, 3) if self.count else 0.0,
+            "p50_ms":  round(self.quantile(0.50) * 1e3, 3),
+            "p95_ms":  round(self.quantile(0.95) * 1e3, 3),
+            "p99_ms":  round(self.quantile(0.99) * 1e3, 3),
+            "max_ms":  round(self.max * 1e3, 3),
+        }
+
+
+class MetricsRegistry:
+    """
+    Süreç içi metrik deposu. enabled=False iken inc / observe hemen döner ve
+    timed() fonksiyonu hiç sarmaz; bu yüzden kapalı durumda ölçümün maliyeti
+    yoktur (bayrak içe aktarma anında okunur).
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._help: Dict[str, str] = {}
+        self.started_at = time.time()
+
+    def describe(self, name: str, text: str) -> None:
+        self._help[name] = text
+
+    def histogram(self, name: str, labels: Optional[Dict[str, str]] = None) -> Histogram:
+        key = (name, _label_key(labels))
+        hist = self._histograms.get(key)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(key, Histogram())
+        return hist
+
+    def observe(self, name: str, seconds: float, labels: Optional[Dict[str, str]] = None) -> None:
+        if self.enabled:
+            self.histogram(name, labels).observe(seconds)
+
+    def inc(self, name: str, value: float = 1, labels: Optional[Dict[str, str]] = None) -> None:
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def timed(self, name: str, labels: Optional[Dict[str, str]] = None) -> Callable:
+        """Fonksiyon süresini time.perf_counter ile name histogramına yazar."""
+        def decorator(fn: Callable) -> Callable:
+            if not self.enabled:
+                return fn
+            hist = self.histogram(name, labels)
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    hist.observe(time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    # ─── Dışa aktarma ───────────────────────────────
+    def snapshot(self) -> Dict[str, object]:
+        def key_text(name: str, labels: Labels) -> str:
+            return name + _label_text(labels)
+
+        with self._lock:
+            histograms = list(self._histograms.items())
+            counters = dict(self._counters)
+        return {
+            "ts":         round(time.time(), 3),
+            "uptime_sec": round(time.time() - self.started_at, 1),
+            "latency":    {key_text(*key): hist.summary() for key, hist in sorted(histograms)},
+            "counters":   {key_text(*key): value for key, value in sorted(counters.items())},
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus metin biçimi (0.0.4); boş kovalar atlanmaz, kümülatiftir."""
+        lines: List[str] = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                typed.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{_label_text(labels)} {value:g}")
+
+        for (name, labels), hist in histograms:
+            if name not in typed:
+                typed.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, n in zip(BUCKET_BOUNDS + [float("inf")], hist.buckets):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else f"{bound:.6g}"
+                bucket_labels = _label_text(labels, f'le="{le}"')
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{name}_sum{_label_text(labels)} {hist.sum:.9g}")
+            lines.append(f"{name}_count{_label_text(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump_json(self, path: str = METRICS_DUMP_PATH) -> None:
+        # Okuyucu yarım dosya görmesin: geçici dosya + atomik yer değiştirme
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+
+
+class MetricsDumper:
+    """Arka planda her interval saniyede bir registry.dump_json(path)."""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        path: str = METRICS_DUMP_PATH,
+        interval: float = METRICS_DUMP_INTERVAL_SEC
+    ):
+        self.registry = registry
+        self.path     = path
+        self.interval = interval
+        self._stop    = threading.Event()
+        self._thread  = threading.Thread(target=self._run, name="metrics-dump", daemon=True)
+
+    def start(self) -> "MetricsDumper":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=2.0)
+        self._write()           # Son durum
+
+    def _write(self) -> None:
+        try:
+            self.registry.dump_json(self.path)
+        except OSError as e:
+            print(f"[Metrics] {self.path} yazılamadı: {e}")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._write()
+
+
+# Süreç genelinde tek depo
+metrics = MetricsRegistry()
+metrics.describe("face_detect_seconds", "FaceDetector.detect_faces süresi")
+metrics.describe("face_align_seconds", "FaceDetector._align_face süresi")
+metrics.describe("embedding_extract_seconds", "EmbeddingExtractor.extract / extract_batch süresi")
+metrics.describe("recognize_seconds", "FaceRecognizer.recognize / recognize_batch süresi")
+metrics.describe("access_decision_seconds", "AccessLogger.log_access süresi")
+metrics.describe("db_access_log_write_seconds", "access_logs yazma transaction'ı süresi")
+metrics.describe("faces_detected_total", "Algılanan yüz sayısı")
+metrics.describe("embeddings_total", "Çıkarılan embedding sayısı")
+metrics.describe("access_decisions_total", "Loglanan erişim kararları")
+metrics.describe("cooldown_suppressed_total", "Cooldown yüzünden loglanmayan kararlar")
+metrics.describe("access_log_rows_total", "Veritabanına yazılan erişim kaydı")
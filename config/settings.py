@@ -12,6 +12,17 @@ CAMERA_INDEX: int = 0          # Sistem kamerası (0 = varsayılan)
 FRAME_WIDTH: int  = 640
 FRAME_HEIGHT: int = 480
 FPS: int = 30
+DOOR_ID: str = "main"          # Bu kameranın kapısı; access_logs.door sütununa yazılır
+
+# ─── İşlem Hattı ───────────────────────────────────
+# 0 → yakalama/çıkarım/log aynı süreçte ayrı iş parçacıklarında
+# N → yakalama ayrı süreçte, çıkarım N işçi sürecinde (paylaşımlı bellek halkası).
+#     Bu kipte iz takibi (TRACKING_ENABLED) kullanılmaz: kareler işçilere
+#     dağıtıldığından her analiz edilen karede tüm yüzler yeniden tanınır.
+INFERENCE_WORKERS: int = 0
+# Çok süreçli kipte sıradaki karenin sonucu bu kadar gecikirse (işçi çöktü /
+# takıldı) kare atlanır; sonraki kararlar beklemede kalmaz
+INFERENCE_RESULT_TIMEOUT_SEC: float = 5.0
 
 # ─── Proje dizinleri ───────────────────────────────
 # face_access_system/ klasörü
@@ -19,18 +30,152 @@ BASE_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # PythonProject/ kök dizini (bir üst klasör)
 PROJECT_ROOT: str = os.path.dirname(BASE_DIR)
 
+# ─── Çoklu Kamera ──────────────────────────────────
+# Akış listesi boş değilse main.py tek süreçte çoklu akış sunucusunu çalıştırır.
+# Dosya varsa STREAMS yerine o okunur: [{"door": "lobi", "source": 0}, ...]
+STREAMS_CONFIG_PATH: str = os.path.join(BASE_DIR, "config", "streams.json")
+STREAMS: list = []
+MULTISTREAM_DETECT_WORKERS: int = 2      # Akışlar arasında round-robin algılama iş parçacığı
+MULTISTREAM_EMBED_BATCH: int = 32        # Akışlar arası embedding batch'i (yüz)
+MULTISTREAM_BATCH_WAIT_MS: float = 5.0   # Batch dolana kadar en fazla bekleme
+
+# ─── Servis (HTTP API) ─────────────────────────────
+# scripts/serve.py: ekran / kamera olmadan görüntü alıp erişim kararı döner
+SERVICE_HOST: str = "127.0.0.1"
+SERVICE_PORT: int = 8080
+SERVICE_DETECT_WORKERS: int = 2          # Çözme + algılama iş parçacığı
+SERVICE_MAX_BATCH: int = 32              # İstekler arası embedding micro-batch'i (yüz)
+SERVICE_BATCH_WAIT_MS: float = 5.0       # İlk yüzden sonra batch için en fazla bekleme
+SERVICE_MAX_IMAGE_SIDE: int = 1280       # Daha büyük görüntüler algılamadan önce küçültülür
+SERVICE_MAX_BODY_BYTES: int = 16 * 1024 * 1024
+SERVICE_SUBSCRIBER_QUEUE: int = 256      # /decisions izleyicisi başına; dolunca eski olay atılır
+# POST /enroll galeriye kişi ekler: varsayılan kapalıdır. Açıkken istekler
+# "Authorization: Bearer <token>" taşımalıdır; token ortam değişkeninden okunur
+# (boşsa uç nokta yine kapalı kalır)
+SERVICE_ENROLL_ENABLED: bool = False
+SERVICE_ENROLL_TOKEN: str = os.environ.get("FAS_ENROLL_TOKEN", "")
+
 # ─── Yüz Algılama ──────────────────────────────────
 # Dlib model dosyaları PythonProject/ kök dizininde
 DLIB_PREDICTOR_PATH: str = os.path.join(PROJECT_ROOT, "shape_predictor_68_face_landmarks.dat")
 DLIB_RECOGNITION_MODEL_PATH: str = os.path.join(PROJECT_ROOT, "dlib_face_recognition_resnet_model_v1.dat")
 
+# Dlib yoksa kullanılan izdüşüm matrisinin önbelleği (None = yalnızca bellekte)
+FALLBACK_PROJECTION_PATH: str = os.path.join(BASE_DIR, "data", "fallback_projection.npy")
+# True → toplu fallback tekli çağrıyla bit düzeyinde aynı (satır satır çarpım)
+FALLBACK_EXACT_BATCH: bool = True
+
+# ─── Hareket Kapılı Zamanlama ──────────────────────
+# Hareket yoksa algılama atlanır, varsa yalnızca hareketli bölgelerde çalışır;
+# analiz aralığı ve ölçeği ölçülen gecikmeye göre ayarlanır
+MOTION_GATING_ENABLED: bool = True
+MOTION_ANALYSIS_WIDTH: int = 160        # Fark alma bu genişlikte yapılır
+MOTION_BACKGROUND_RATE: float = 0.05    # Arka plan ortalamasının öğrenme hızı
+MOTION_PIXEL_THRESHOLD: int = 25
+MOTION_MIN_AREA_FRACTION: float = 0.002
+MOTION_ROI_PADDING: float = 0.25
+SCHEDULER_IDLE_HEARTBEAT_SEC: float = 2.0   # Boşta bile tam kare analiz aralığı
+SCHEDULER_ACTIVE_HOLD_SEC: float = 2.0      # Son yüzden sonra aktif kalma süresi
+SCHEDULER_LATENCY_BUDGET_MS: float = 80.0   # Analiz başına hedef gecikme
+SCHEDULER_MIN_SCALE: float = 0.35
+SCHEDULER_MAX_SCALE: float = 0.75
+SCHEDULER_MAX_INTERVAL: int = 6             # En fazla kaç karede bir analiz
+
+# ─── Yüz Takibi ────────────────────────────────────
+# Embedding + eşleştirme iz başına bir kez; sonra yalnızca gerektiğinde.
+# Tek süreçli hat, çoklu akış ve replay için geçerli; INFERENCE_WORKERS > 0 iken kapalı
+TRACKING_ENABLED: bool = True
+TRACK_IOU_THRESHOLD: float = 0.3
+TRACK_MAX_MISSES: int = 5               # Algılanmadan geçen işlenmiş kare sınırı
+TRACK_REVERIFY_SEC: float = 10.0        # Tanınan iz için yavaş yeniden doğrulama
+TRACK_UNKNOWN_RETRY_SEC: float = 1.0    # Tanınmayan iz için yeniden deneme
+# Kimlik güveninin yarılanma süresi (sn); yalnızca aynı anda doğrulanacak
+# izlerin sırasını belirler, TRACK_REVERIFY_SEC'i kısaltmaz
+TRACK_CONFIDENCE_HALF_LIFE: float = 60.0
+
 # ─── Embedding & Benzerlik ─────────────────────────
 EMBEDDING_DIM: int = 128       # Dlib → 128 boyutlu vektör
+# Nicemleme: "float32" | "float16" | "int8" (vektör başına ölçekli)
+EMBEDDING_STORAGE_DTYPE: str = "float32"   # SQLite BLOB formatı (yeni kayıtlar)
+GALLERY_MATRIX_DTYPE: str = "float32"      # Bellekteki eşleştirme matrisi
 SIMILARITY_THRESHOLD: float = 0.6   # Cosine similarity eşiği
+RECOGNITION_TOP_K: int = 3          # RecognitionResult.all_scores'ta tutulan aday sayısı
+RECOGNITION_DEBUG_SCORES: bool = False  # True → tüm galeri puanları sıralı döner (yavaş)
+# Kullanıcı başına birden çok şablon (user_embeddings) nasıl eşleşir:
+#   "max"      → en benzer şablon, "mean" → şablon puanlarının ortalaması,
+#   "centroid" → yalnızca users.embedding (şablonların ortalama vektörü)
+TEMPLATE_MATCH: str = "max"
+
+# ─── Galeri Önbelleği ──────────────────────────────
+# Başka süreçlerin (ör. enroll_user.py) yaptığı değişiklikleri yakalamak için
+# users tablosunun sürüm sayacı en fazla bu aralıkla kontrol edilir (0 = kapalı)
+GALLERY_POLL_INTERVAL: float = 2.0
+
+# Galeri, users tablosuyla senkron tutulan bellek eşlemeli bir dosyadan okunur:
+# açılış galeri boyutundan bağımsızdır ve tüm süreçler aynı sayfaları paylaşır
+EMBEDDING_STORE_ENABLED: bool = True
+EMBEDDING_STORE_PATH: str = os.path.join(BASE_DIR, "data", "embeddings.bin")
+# Çok şablonlu eşleştirmede (TEMPLATE_MATCH "max" / "mean") user_embeddings'ın
+# sahibine göre sıralı, bellek eşlemeli kopyası
+TEMPLATE_STORE_PATH: str = os.path.join(BASE_DIR, "data", "templates.bin")
+
+# ─── Toplu Kayıt ───────────────────────────────────
+# scripts/bulk_enroll.py: görüntü dizini / manifest'ten süreç havuzuyla kayıt
+ENROLL_WORKERS: int = 0                 # 0 = CPU çekirdek sayısı
+ENROLL_BATCH_SIZE: int = 50             # Transaction başına kişi
+ENROLL_CHUNK_SIZE: int = 4              # İşçiye tek seferde verilen görüntü
+ENROLL_MAX_TEMPLATES: int = 5           # Kişi başına en fazla şablon (fazlası yok sayılır)
+ENROLL_MIN_TEMPLATES: int = 1           # Bundan az yüz çıkan kişi kaydedilmez
+ENROLL_MAX_IMAGE_SIDE: int = 1280       # Daha büyük fotoğraflar algılamadan önce küçültülür
 
 # ─── Veritabanı ────────────────────────────────────
 DATABASE_PATH: str = os.path.join(BASE_DIR, "data", "biometric.db")
 
+# Bağlantılar iş parçacığı başına bir kez açılıp yeniden kullanılır; aşağıdaki
+# PRAGMA'lar her bağlantı açılırken uygulanır
+DB_JOURNAL_MODE: str = "WAL"            # Okuyucular yazıcıyı (log yazıcısı) bekletmez
+DB_SYNCHRONOUS: str = "NORMAL"          # WAL ile güvenli; her commit'te fsync yok
+DB_CACHE_SIZE_KB: int = 16_384          # Bağlantı başına sayfa önbelleği
+DB_MMAP_SIZE: int = 256 * 1024 * 1024   # Bellek eşlemeli okuma (0 = kapalı)
+DB_TEMP_STORE: str = "MEMORY"
+DB_AUTO_VACUUM: str = "INCREMENTAL"     # Yeni dosyalarda; eskilerde bir kez tam VACUUM gerekir
+DB_BUSY_TIMEOUT_MS: int = 5_000         # Kilitliyse hata vermeden önce bekle
+DB_STATEMENT_CACHE_SIZE: int = 256      # Bağlantı başına hazır ifade önbelleği
+
+# ─── Yaklaşık En Yakın Komşu (IVF) ─────────────────
+# Galeri ANN_MIN_GALLERY_SIZE'a ulaşınca tam tarama yerine IVF indeksi kullanılır.
+# İndeks arka planda eğitilir / güncellenir; hazır olana kadar tam tarama sürer.
+ANN_ENABLED: bool = True
+ANN_MIN_GALLERY_SIZE: int = 50_000
+ANN_NLIST: int = 0              # Küme sayısı (0 = otomatik, ~√N)
+ANN_NPROBE: int = 16            # Sorgu başına taranan küme (recall ↔ hız)
+ANN_TRAIN_ITERATIONS: int = 10
+ANN_INDEX_PATH: str = os.path.join(os.path.dirname(DATABASE_PATH), "gallery_ivf.npz")
+
 # ─── Loglama ───────────────────────────────────────
 LOG_FILE: str = os.path.join(BASE_DIR, "data", "access.log")
-LOG_FORMAT: str = "%(asctime)s | %(levelname)s | %(message)s"
\ No newline at end of file
+LOG_FORMAT: str = "%(asctime)s | %(levelname)s | %(message)s"
+# Erişim kayıtları arka planda toplanıp toplu transaction'larla yazılır
+ACCESS_LOG_ASYNC: bool = True
+ACCESS_LOG_BATCH_SIZE: int = 64          # Bu kadar kayıt birikince yaz
+ACCESS_LOG_FLUSH_INTERVAL: float = 0.5   # ... ya da en geç bu kadar saniyede bir
+ACCESS_LOG_QUEUE_SIZE: int = 10_000
+ACCESS_LOG_PUT_TIMEOUT: float = 0.05     # Kuyruk doluysa bu kadar bekle, sonra kaydı at (sayılır)
+
+# ─── Metrikler ─────────────────────────────────────
+# Kapalıyken zamanlayıcılar hiç sarılmaz (ek maliyet yok). Açıkken aşama
+# gecikme histogramları + sayaçlar: servis /metrics (Prometheus metni),
+# main.py METRICS_DUMP_PATH'e periyodik JSON yazar. Süreç başına tutulur.
+METRICS_ENABLED: bool = False
+METRICS_DUMP_PATH: str = os.path.join(BASE_DIR, "data", "metrics.json")
+METRICS_DUMP_INTERVAL_SEC: float = 10.0
+
+# ─── Saklama / Arşiv ───────────────────────────────
+# RETENTION_DAYS'ten eski access_logs kayıtları günlük dosyalara arşivlenip
+# veritabanından parça parça silinir (scripts/log_retention.py)
+RETENTION_DAYS: int = 730
+ARCHIVE_DIR: str = os.path.join(BASE_DIR, "data", "archive")
+ARCHIVE_FORMAT: str = "ndjson"          # ndjson | csv (gzip ile sıkıştırılır)
+RETENTION_CHUNK_SIZE: int = 5_000       # Silme transaction'ı başına satır
+RETENTION_CHUNK_PAUSE: float = 0.02     # Parçalar arası bekleme; canlı yazıcı kilidi alabilsin
+EXPORT_FETCH_SIZE: int = 5_000          # Dışa aktarımda tek seferde okunan satır
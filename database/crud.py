@@ -1,32 +1,87 @@
+import sqlite3
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Callable, Sequence, Tuple
 import numpy as np
 
+from face_access_system.app_logging.metrics import metrics
+from face_access_system.config.settings import DOOR_ID
 from face_access_system.database.db import db_manager
+from face_access_system.database.timeutil import to_epoch_us, from_epoch_us
+from face_access_system.database.embedding_codec import (
+    blob_to_embedding,
+    blobs_to_matrix,
+    embedding_to_blob,
+)
 from face_access_system.database.models import User, AccessLog
 
 
-def _embedding_to_blob(embedding: np.ndarray) -> bytes:
-    return embedding.astype(np.float32).tobytes()
+# ─── users değişiklik bildirimi ────────────────────
+# Dinleyiciler (event, user_id, version) ile çağrılır; event ∈ {"create", "update",
+# "delete"}, version bu yazmanın ürettiği gallery_version değeridir (-1: sayaç yok)
+UsersListener = Callable[[str, int, int], None]
+_users_listeners: List[UsersListener] = []
 
 
-def _blob_to_embedding(blob: bytes) -> np.ndarray:
-    return np.frombuffer(blob, dtype=np.float32)
+def add_users_listener(listener: UsersListener) -> None:
+    if listener not in _users_listeners:
+        _users_listeners.append(listener)
+
+
+def remove_users_listener(listener: UsersListener) -> None:
+    if listener in _users_listeners:
+        _users_listeners.remove(listener)
+
+
+def _notify_users_changed(event: str, user_id: int, version: int) -> None:
+    for listener in list(_users_listeners):
+        listener(event, user_id, version)
+
+
+def _read_users_version(conn: sqlite3.Connection) -> int:
+    try:
+        row = conn.execute(
+            "SELECT version FROM gallery_version WHERE id = 1"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        # Eski şema: sayaç tablosu yok → her kontrolde değişmiş say
+        return -1
+
+    return row["version"] if row is not None else -1
+
+
+def get_users_version() -> int:
+    """users tablosunun trigger ile tutulan değişiklik sayacını döndürür."""
+    with db_manager.get_connection(readonly=True) as conn:
+        return _read_users_version(conn)
+
+
+def get_db_uuid() -> Optional[str]:
+    """create_tables'ın veritabanına verdiği kimlik (eski şemada None)."""
+    with db_manager.get_connection(readonly=True) as conn:
+        try:
+            row = conn.execute("SELECT db_uuid FROM gallery_version WHERE id = 1").fetchone()
+        except sqlite3.OperationalError:
+            return None
+    return row["db_uuid"] if row is not None else None
 
 
 def create_user(name: str, embedding: np.ndarray, is_authorized: bool = True) -> User:
-    blob = _embedding_to_blob(embedding)
+    blob = embedding_to_blob(embedding)
     now = datetime.now()
 
     with db_manager.get_connection() as conn:
         cursor = conn.execute(
             """
-            INSERT INTO users (name, embedding, is_authorized, created_at)
+            INSERT INTO users (name, embedding, is_authorized, created_ts)
             VALUES (?, ?, ?, ?)
             """,
-            (name, blob, int(is_authorized), now.isoformat())
+            (name, blob, int(is_authorized), to_epoch_us(now))
         )
         user_id = cursor.lastrowid
+        # Aynı transaction içinde okunur → tam olarak bu yazmanın sürümü
+        version = _read_users_version(conn)
+
+    _notify_users_changed("create", user_id, version)
 
     return User(
         id=user_id,
@@ -38,7 +93,7 @@ def create_user(name: str, embedding: np.ndarray, is_authorized: bool = True) ->
 
 
 def get_user_by_id(user_id: int) -> Optional[User]:
-    with db_manager.get_connection() as conn:
+    with db_manager.get_connection(readonly=True) as conn:
         row = conn.execute(
             "SELECT * FROM users WHERE id = ?", (user_id,)
         ).fetchone()
@@ -49,23 +104,23 @@ def get_user_by_id(user_id: int) -> Optional[User]:
     return User(
         id=row["id"],
         name=row["name"],
-        embedding=_blob_to_embedding(row["embedding"]),
+        embedding=blob_to_embedding(row["embedding"]),
         is_authorized=bool(row["is_authorized"]),
-        created_at=datetime.fromisoformat(row["created_at"])
+        created_at=from_epoch_us(row["created_ts"])
     )
 
 
 def get_all_users() -> List[User]:
-    with db_manager.get_connection() as conn:
+    with db_manager.get_connection(readonly=True) as conn:
         rows = conn.execute("SELECT * FROM users").fetchall()
 
     return [
         User(
             id=row["id"],
             name=row["name"],
-            embedding=_blob_to_embedding(row["embedding"]),
+            embedding=blob_to_embedding(row["embedding"]),
             is_authorized=bool(row["is_authorized"]),
-            created_at=datetime.fromisoformat(row["created_at"])
+            created_at=from_epoch_us(row["created_ts"])
         )
         for row in rows
     ]
@@ -77,43 +132,207 @@ def update_user_authorization(user_id: int, is_authorized: bool) -> None:
             "UPDATE users SET is_authorized = ? WHERE id = ?",
             (int(is_authorized), user_id)
         )
+        version = _read_users_version(conn)
+
+    _notify_users_changed("update", user_id, version)
 
 
 def delete_user(user_id: int) -> None:
     with db_manager.get_connection() as conn:
+        # foreign_keys kapalı → bağlı satırlar elle silinir
+        conn.execute("DELETE FROM user_embeddings WHERE user_id = ?", (user_id,))
+        conn.execute("DELETE FROM enrollments WHERE user_id = ?", (user_id,))
         conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
+        version = _read_users_version(conn)
+
+    _notify_users_changed("delete", user_id, version)
+
+
+# (external_id, name, şablonlar (K×D), is_authorized)
+EnrollmentRow = Tuple[str, str, np.ndarray, bool]
+
+
+def template_centroid(templates: np.ndarray) -> np.ndarray:
+    """users.embedding'e yazılan tek vektör: şablonların ortalaması."""
+    return np.asarray(templates, dtype=np.float32).mean(axis=0)
+
+
+def create_users_with_templates(rows: Sequence[EnrollmentRow]) -> List[int]:
+    """
+    Birden çok kullanıcıyı şablonları ve dış kimlikleriyle tek transaction'da
+    ekler; yeni id'leri sırayla döndürür. Transaction bölünmediği için bir
+    kullanıcı ya tüm şablonlarıyla kayıtlıdır ya hiç değildir.
+    """
+    if not rows:
+        return []
 
+    now_ts = to_epoch_us(datetime.now())
+    user_ids: List[int] = []
 
+    with db_manager.get_connection() as conn:
+        for external_id, name, templates, is_authorized in rows:
+            cursor = conn.execute(
+                """
+                INSERT INTO users (name, embedding, is_authorized, created_ts)
+                VALUES (?, ?, ?, ?)
+                """,
+                (name, embedding_to_blob(template_centroid(templates)), int(is_authorized), now_ts)
+            )
+            user_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO user_embeddings (user_id, embedding, created_ts) VALUES (?, ?, ?)",
+                [(user_id, embedding_to_blob(t), now_ts) for t in templates]
+            )
+            conn.execute(
+                "INSERT INTO enrollments (external_id, user_id, images, created_ts) VALUES (?, ?, ?, ?)",
+                (external_id, user_id, len(templates), now_ts)
+            )
+            user_ids.append(user_id)
+        version = _read_users_version(conn)
+
+    for user_id in user_ids:
+        _notify_users_changed("create", user_id, version)
+
+    return user_ids
+
+
+def add_user_templates(user_id: int, templates: np.ndarray) -> int:
+    """
+    Mevcut kullanıcıya yeni örnekler (gözlük, ışık, açı...) ekler ve
+    users.embedding'i tüm şablonların ortalamasına günceller. Şablonu hiç
+    olmayan eski kayıtlarda mevcut embedding ilk şablon olarak korunur.
+    """
+    templates = np.atleast_2d(np.asarray(templates, dtype=np.float32))
+    now_ts = to_epoch_us(datetime.now())
+
+    with db_manager.get_connection() as conn:
+        rows = conn.execute(
+            "SELECT embedding FROM user_embeddings WHERE user_id = ? ORDER BY id", (user_id,)
+        ).fetchall()
+        existing = [blob_to_embedding(row["embedding"]) for row in rows]
+        if not existing:
+            row = conn.execute("SELECT embedding FROM users WHERE id = ?", (user_id,)).fetchone()
+            if row is None:
+                raise ValueError(f"Kullanıcı bulunamadı: {user_id}")
+            templates = np.vstack([blob_to_embedding(row["embedding"])[None, :], templates])
+
+        conn.executemany(
+            "INSERT INTO user_embeddings (user_id, embedding, created_ts) VALUES (?, ?, ?)",
+            [(user_id, embedding_to_blob(t), now_ts) for t in templates]
+        )
+        all_templates = np.vstack(existing + [templates]) if existing else templates
+        conn.execute(
+            "UPDATE users SET embedding = ? WHERE id = ?",
+            (embedding_to_blob(template_centroid(all_templates)), user_id)
+        )
+        version = _read_users_version(conn)
+
+    _notify_users_changed("update", user_id, version)
+    return len(templates)
+
+
+def get_templates_since(
+    last_id: int = 0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    id'si last_id'den büyük şablonlar → (şablon id'leri, user_id'ler, (T×D) matris).
+    Şablonlar yalnızca eklenir (kullanıcı silinince birlikte silinir), bu yüzden
+    son görülen id'den devam etmek yeni satırları eksiksiz verir.
+    """
+    with db_manager.get_connection(readonly=True) as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        try:
+            rows = cursor.execute(
+                "SELECT id, user_id, embedding FROM user_embeddings WHERE id > ? ORDER BY id",
+                (last_id,)
+            ).fetchall()
+        except sqlite3.OperationalError:
+            rows = []       # Eski şema: şablon tablosu yok
+
+    if not rows:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros((0, 0), np.float32)
+
+    ids, user_ids, blobs = zip(*rows)
+    return (np.asarray(ids, dtype=np.int64), np.asarray(user_ids, dtype=np.int64),
+            blobs_to_matrix(blobs))
+
+
+def get_user_ids() -> np.ndarray:
+    """Kayıtlı kullanıcıların id'leri (artan, int64)."""
+    with db_manager.get_connection(readonly=True) as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        rows = cursor.execute("SELECT id FROM users ORDER BY id").fetchall()
+    return np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+
+
+def get_enrolled_external_ids() -> set:
+    with db_manager.get_connection(readonly=True) as conn:
+        rows = conn.execute("SELECT external_id FROM enrollments").fetchall()
+    return {row["external_id"] for row in rows}
+
+
+@metrics.timed("db_access_log_write_seconds", {"mode": "single"})
 def create_access_log(
     user_id: Optional[int],
     confidence: float,
-    access_granted: bool
+    access_granted: bool,
+    door: Optional[str] = DOOR_ID
 ) -> AccessLog:
     now = datetime.now()
 
     with db_manager.get_connection() as conn:
         cursor = conn.execute(
             """
-            INSERT INTO access_logs (user_id, confidence, access_granted, timestamp)
-            VALUES (?, ?, ?, ?)
+            INSERT INTO access_logs (user_id, confidence, access_granted, ts, door)
+            VALUES (?, ?, ?, ?, ?)
             """,
-            (user_id, round(confidence, 4), int(access_granted), now.isoformat())
+            (user_id, round(confidence, 4), int(access_granted), to_epoch_us(now), door)
         )
         log_id = cursor.lastrowid
+    metrics.inc("access_log_rows_total")
 
     return AccessLog(
         id=log_id,
         user_id=user_id,
         confidence=confidence,
         access_granted=access_granted,
-        timestamp=now
+        timestamp=now,
+        door=door
     )
 
 
-def get_access_logs(limit: int = 50) -> List[AccessLog]:
+# (user_id, confidence, access_granted, timestamp, door)
+AccessLogRow = Tuple[Optional[int], float, bool, datetime, Optional[str]]
+
+
+@metrics.timed("db_access_log_write_seconds", {"mode": "batch"})
+def create_access_logs(rows: Sequence[AccessLogRow]) -> int:
+    """Birden çok erişim kaydını tek transaction'da (executemany) yazar."""
+    if not rows:
+        return 0
+
     with db_manager.get_connection() as conn:
+        conn.executemany(
+            """
+            INSERT INTO access_logs (user_id, confidence, access_granted, ts, door)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [
+                (user_id, round(confidence, 4), int(access_granted), to_epoch_us(ts), door)
+                for user_id, confidence, access_granted, ts, door in rows
+            ]
+        )
+    metrics.inc("access_log_rows_total", len(rows))
+
+    return len(rows)
+
+
+def get_access_logs(limit: int = 50) -> List[AccessLog]:
+    with db_manager.get_connection(readonly=True) as conn:
         rows = conn.execute(
-            "SELECT * FROM access_logs ORDER BY timestamp DESC LIMIT ?",
+            "SELECT * FROM access_logs ORDER BY ts DESC LIMIT ?",
             (limit,)
         ).fetchall()
 
@@ -123,19 +342,22 @@ def get_access_logs(limit: int = 50) -> List[AccessLog]:
             user_id=row["user_id"],
             confidence=row["confidence"],
             access_granted=bool(row["access_granted"]),
-            timestamp=datetime.fromisoformat(row["timestamp"])
+            timestamp=from_epoch_us(row["ts"]),
+            door=row["door"]
         )
         for row in rows
     ]
 
 
 def get_logs_by_user(user_id: int, limit: int = 20) -> List[AccessLog]:
-    with db_manager.get_connection() as conn:
+    # Yalnızca idx_logs_user_ts'teki sütunlar seçilir → tabloya dokunulmaz
+    # (door index'te yok; kullanıcı geçmişinde gösterilmez)
+    with db_manager.get_connection(readonly=True) as conn:
         rows = conn.execute(
             """
-            SELECT * FROM access_logs
+            SELECT id, user_id, confidence, access_granted, ts FROM access_logs
             WHERE user_id = ?
-            ORDER BY timestamp DESC
+            ORDER BY ts DESC
             LIMIT ?
             """,
             (user_id, limit)
@@ -147,7 +369,7 @@ def get_logs_by_user(user_id: int, limit: int = 20) -> List[AccessLog]:
             user_id=row["user_id"],
             confidence=row["confidence"],
             access_granted=bool(row["access_granted"]),
-            timestamp=datetime.fromisoformat(row["timestamp"])
+            timestamp=from_epoch_us(row["ts"])
         )
         for row in rows
     ]
\ No newline at end of file
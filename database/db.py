@@ -2,11 +2,136 @@ import sqlite3
 import os
 import threading
 from contextlib import contextmanager
+from typing import List, Tuple
 
-from face_access_system.config.settings import DATABASE_PATH
+from face_access_system.config.settings import (
+    DATABASE_PATH,
+    DB_JOURNAL_MODE,
+    DB_SYNCHRONOUS,
+    DB_CACHE_SIZE_KB,
+    DB_MMAP_SIZE,
+    DB_TEMP_STORE,
+    DB_AUTO_VACUUM,
+    DB_BUSY_TIMEOUT_MS,
+    DB_STATEMENT_CACHE_SIZE,
+)
 
 
-class DatabaseManager:
+class ConnectionManager:
+    """
+    İş parçacığı başına kalıcı SQLite bağlantıları.
+
+    Her iş parçacığı bir yazma bağlantısı ve (gerekirse) bir salt okunur
+    bağlantı açar, işlem sonunda kapatmak yerine yeniden kullanır; PRAGMA'lar
+    ve hazır ifade önbelleği böylece korunur. WAL kipinde salt okunur
+    bağlantılar yazıcıyı bloklamaz. Sonlanan iş parçacıklarının bağlantıları
+    bir sonraki yeni bağlantı açılışında kapatılır.
+    """
+
+    def __init__(self, path: str = DATABASE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._all: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+        self._all_lock = threading.Lock()
+
+    def _connect(self, readonly: bool) -> sqlite3.Connection:
+        if readonly:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True,
+                                   timeout=DB_BUSY_TIMEOUT_MS / 1e3,
+                                   cached_statements=DB_STATEMENT_CACHE_SIZE,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            # Dizin ilk yazma bağlantısında oluşturulur (yalnızca içe aktarmak
+            # diske dokunmasın)
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=DB_BUSY_TIMEOUT_MS / 1e3,
+                                   cached_statements=DB_STATEMENT_CACHE_SIZE,
+                                   check_same_thread=False)
+            # auto_vacuum yalnızca dosya oluşturulmadan önce etkili → WAL'dan önce
+            conn.execute(f"PRAGMA auto_vacuum = {DB_AUTO_VACUUM}")
+            # journal_mode kalıcıdır ama yalnızca yazabilen bağlantı değiştirebilir
+            conn.execute(f"PRAGMA journal_mode = {DB_JOURNAL_MODE}")
+
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA synchronous = {DB_SYNCHRONOUS}")
+        conn.execute(f"PRAGMA cache_size = {-DB_CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE}")
+        conn.execute(f"PRAGMA temp_store = {DB_TEMP_STORE}")
+
+        return conn
+
+    def open_connection(self, readonly: bool = True) -> sqlite3.Connection:
+        """
+        Havuz dışı, ayarlı yeni bir bağlantı (kapatmak çağırana ait). Uzun süren
+        akış okumaları iş parçacığının ortak bağlantısını meşgul etmesin diye.
+        """
+        if readonly and not os.path.exists(self.path):
+            readonly = False
+        return self._connect(readonly)
+
+    def _thread_connection(self, readonly: bool) -> sqlite3.Connection:
+        if os.getpid() != self._pid:
+            # fork sonrası üst sürecin bağlantıları kullanılmaz
+            self._local = threading.local()
+            self._all = []
+            self._pid = os.getpid()
+
+        attr = "ro" if readonly else "rw"
+        conn = getattr(self._local, attr, None)
+        if conn is None:
+            self._prune_dead()
+            conn = self._connect(readonly)
+            setattr(self._local, attr, conn)
+            with self._all_lock:
+                self._all.append((threading.current_thread(), conn))
+        return conn
+
+    def _prune_dead(self) -> None:
+        """Sonlanmış iş parçacıklarından kalan bağlantıları kapatır."""
+        with self._all_lock:
+            dead = [conn for thread, conn in self._all if not thread.is_alive()]
+            if not dead:
+                return
+            self._all = [(thread, conn) for thread, conn in self._all if thread.is_alive()]
+        for conn in dead:
+            conn.close()
+
+    @contextmanager
+    def get_connection(self, readonly: bool = False):
+        # Veritabanı dosyası henüz yoksa salt okunur açılamaz → yazma bağlantısı
+        if readonly and not os.path.exists(self.path):
+            readonly = False
+        conn = self._thread_connection(readonly)
+
+        # İç içe kullanımda commit / rollback yalnızca aynı bağlantının en
+        # dıştaki bloğunda yapılır; ro ve rw bağlantılarının derinliği ayrıdır
+        # (ro bloğu içindeki rw bloğu kendi sonunda commit eder)
+        depth_attr = "ro_depth" if readonly else "rw_depth"
+        depth = getattr(self._local, depth_attr, 0)
+        setattr(self._local, depth_attr, depth + 1)
+        try:
+            yield conn
+            if depth == 0:
+                conn.commit()
+        except Exception:
+            if depth == 0:
+                conn.rollback()
+            raise
+        finally:
+            setattr(self._local, depth_attr, depth)
+
+    def close_all(self) -> None:
+        """Tüm iş parçacıklarının bağlantılarını kapatır (kapanışta)."""
+        with self._all_lock:
+            for _, conn in self._all:
+                conn.close()
+            self._all = []
+        self._local = threading.local()
+
+
+class DatabaseManager(ConnectionManager):
     _instance = None
     _lock = threading.Lock()
 
@@ -20,21 +145,8 @@ class DatabaseManager:
     def __init__(self):
         if self._initialized:
             return
-        os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
+        super().__init__(DATABASE_PATH)
         self._initialized = True
 
-    @contextmanager
-    def get_connection(self):
-        conn = sqlite3.connect(DATABASE_PATH)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
-
 
-db_manager = DatabaseManager()
\ No newline at end of file
+db_manager = DatabaseManager()
@@ -0,0 +1,96 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from face_access_system.config.settings import EMBEDDING_DIM, EMBEDDING_STORAGE_DTYPE
+
+
+# Desteklenen gösterimler: ad → NumPy tipi
+QUANT_DTYPES = {
+    "float32": np.float32,
+    "float16": np.float16,
+    "int8":    np.int8,
+}
+
+INT8_MAX: int = 127
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Vektör başına ölçekli simetrik int8: x ≈ scale * q, q ∈ [-127, 127]."""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    peak = np.abs(vectors).max(axis=1)
+    scales = np.where(peak == 0, 1.0, peak / INT8_MAX).astype(np.float32)
+
+    q = np.rint(vectors / scales[:, None])
+    return np.clip(q, -INT8_MAX, INT8_MAX).astype(np.int8), scales
+
+
+def dequantize_int8(q: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    return q.astype(np.float32) * np.asarray(scales, dtype=np.float32)[:, None]
+
+
+# ─── Embedding BLOB formatı ────────────────────────
+# v0 (eski): başlıksız ham float32 dizisi. float32 kayıtlar hâlâ bu formatta
+#     yazılır → varsayılan ayarla veritabanı eski sürümlerle uyumlu kalır.
+# v1: 8 baytlık başlık  b"EMB" | sürüm (1) | tip kodu (1) | 3 bayt boşluk
+#     ardından tipe göre: float32 / float16 dizisi ya da
+#     int8 için float32 ölçek (4 bayt) + int8 dizisi.
+# v0 BLOB'u tam EMBEDDING_DIM × 4 bayttır; hiçbir v1 BLOB'u bu uzunlukta
+# olamaz. Ham float32'nin ilk baytları da b"EMB" olabileceğinden (ilk değer
+# ~0.047) biçim önce uzunluktan, sonra başlıktan anlaşılır.
+BLOB_MAGIC   = b"EMB"
+BLOB_VERSION = 1
+BLOB_HEADER  = 8
+BLOB_CODES   = {"float32": 0, "float16": 1, "int8": 2}
+BLOB_TYPES   = {code: name for name, code in BLOB_CODES.items()}
+LEGACY_BLOB_BYTES = EMBEDDING_DIM * 4
+
+
+def is_legacy_blob(blob: bytes) -> bool:
+    return len(blob) == LEGACY_BLOB_BYTES or len(blob) < BLOB_HEADER or blob[:3] != BLOB_MAGIC
+
+
+def embedding_to_blob(
+    embedding: np.ndarray,
+    dtype: str = EMBEDDING_STORAGE_DTYPE
+) -> bytes:
+    if dtype not in BLOB_CODES:
+        raise ValueError(f"Desteklenmeyen embedding saklama tipi: {dtype}")
+
+    embedding = np.asarray(embedding, dtype=np.float32).ravel()
+    if dtype == "float32":
+        return embedding.tobytes()
+
+    header = BLOB_MAGIC + bytes([BLOB_VERSION, BLOB_CODES[dtype], 0, 0, 0])
+
+    if dtype == "int8":
+        q, scales = quantize_int8(embedding)
+        return header + scales.astype(np.float32).tobytes() + q.tobytes()
+
+    return header + embedding.astype(QUANT_DTYPES[dtype]).tobytes()
+
+
+def blob_to_embedding(blob: bytes) -> np.ndarray:
+    if is_legacy_blob(blob):
+        return np.frombuffer(blob, dtype=np.float32)
+
+    version, code = blob[3], blob[4]
+    if version != BLOB_VERSION or code not in BLOB_TYPES:
+        raise ValueError(f"Bilinmeyen embedding BLOB formatı: v{version}, tip={code}")
+
+    dtype   = BLOB_TYPES[code]
+    payload = blob[BLOB_HEADER:]
+
+    if dtype == "int8":
+        scale = np.frombuffer(payload[:4], dtype=np.float32)
+        q = np.frombuffer(payload[4:], dtype=np.int8)
+        return dequantize_int8(q[None, :], scale)[0]
+
+    return np.frombuffer(payload, dtype=QUANT_DTYPES[dtype]).astype(np.float32, copy=False)
+
+
+def blobs_to_matrix(blobs: Sequence[bytes]) -> np.ndarray:
+    # Hepsi başlıksız float32 (v0) ise tek frombuffer; aksi halde satır satır
+    if blobs and all(len(b) == LEGACY_BLOB_BYTES for b in blobs):
+        return np.frombuffer(b"".join(blobs), dtype=np.float32).reshape(len(blobs), -1)
+    return np.stack([blob_to_embedding(b) for b in blobs]) if blobs else np.zeros((0, 0), np.float32)
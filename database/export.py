@@ -0,0 +1,125 @@
+import csv
+import gzip
+import io
+import json
+from typing import IO, Iterator, Optional, Tuple, Union
+
+from face_access_system.config.settings import EXPORT_FETCH_SIZE
+from face_access_system.database.db import db_manager
+from face_access_system.database.queries import TimeLike, log_filters, time_range
+from face_access_system.database.timeutil import from_epoch_us
+
+EXPORT_FORMATS = ("csv", "ndjson")
+EXPORT_COLUMNS = ("id", "user_id", "confidence", "access_granted", "timestamp", "ts", "door")
+
+# (id, user_id, confidence, access_granted, ts, door)
+LogTuple = Tuple[int, Optional[int], float, int, int, Optional[str]]
+
+
+def iter_log_rows(
+    start: Optional[TimeLike] = None,
+    end: Optional[TimeLike] = None,
+    fetch_size: int = EXPORT_FETCH_SIZE,
+    granted: Optional[bool] = None,
+    door: Optional[str] = None,
+    user_id: Optional[int] = None
+) -> Iterator[LogTuple]:
+    """
+    Aralıktaki kayıtları (ts, id) artan sırada tek bir imleçten fetchmany ile
+    akıtır; bellekte en fazla fetch_size satır tutulur.
+    """
+    lo, hi = time_range(start, end)
+    where, params = log_filters(granted, door, user_id)
+
+    # Ayrı bağlantı: üretici yarıda bırakılsa da ortak bağlantıdaki
+    # transaction durumu etkilenmez
+    conn = db_manager.open_connection(readonly=True)
+    try:
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(
+            f"""
+            SELECT id, user_id, confidence, access_granted, ts, door
+            FROM access_logs
+            WHERE ts >= ? AND ts < ?{where}
+            ORDER BY ts, id
+            """,
+            [lo, hi] + params,
+        )
+        while True:
+            rows = cursor.fetchmany(fetch_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        conn.close()
+
+
+def _record(row: LogTuple) -> dict:
+    log_id, user_id, confidence, granted, ts, door = row
+    return {
+        "id":             log_id,
+        "user_id":        user_id,
+        "confidence":     confidence,
+        "access_granted": bool(granted),
+        "timestamp":      from_epoch_us(ts).isoformat(),
+        "ts":             ts,
+        "door":           door,
+    }
+
+
+class LogFileWriter:
+    """Satırları CSV ya da NDJSON olarak (isteğe bağlı gzip) bir akışa yazar."""
+
+    def __init__(self, stream: IO[str], fmt: str = "ndjson"):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Desteklenmeyen format: {fmt} (seçenekler: {EXPORT_FORMATS})")
+        self.stream = stream
+        self.fmt = fmt
+        self.rows = 0
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=EXPORT_COLUMNS)
+            self._csv.writeheader()
+
+    def write(self, row: LogTuple) -> None:
+        record = _record(row)
+        if self._csv is not None:
+            self._csv.writerow(record)
+        else:
+            self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.rows += 1
+
+
+def open_export(path: str, compress: Optional[bool] = None) -> IO[str]:
+    """compress verilmezse .gz uzantısına bakılır."""
+    if compress is None:
+        compress = path.endswith(".gz")
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def export_logs(
+    target: Union[str, IO[str]],
+    fmt: str = "ndjson",
+    start: Optional[TimeLike] = None,
+    end: Optional[TimeLike] = None,
+    compress: Optional[bool] = None,
+    **filters
+) -> int:
+    """
+    access_logs'u dosyaya ya da açık bir metin akışına sabit bellekle aktarır.
+    Yazılan satır sayısını döndürür.
+    """
+    stream = open_export(target, compress) if isinstance(target, str) else target
+    try:
+        writer = LogFileWriter(stream, fmt)
+        for row in iter_log_rows(start, end, **filters):
+            writer.write(row)
+        return writer.rows
+    finally:
+        if isinstance(target, str):
+            stream.close()
+        elif isinstance(stream, io.TextIOBase):
+            stream.flush()
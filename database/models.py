@@ -19,4 +19,5 @@ class AccessLog:
     user_id: Optional[int]
     confidence: float
     access_granted: bool
-    timestamp: datetime
\ No newline at end of file
+    timestamp: datetime
+    door: Optional[str] = None
\ No newline at end of file
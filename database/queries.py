@@ -0,0 +1,266 @@
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from face_access_system.database.db import db_manager
+from face_access_system.database.timeutil import US_PER_SEC, now_us, to_epoch_us
+
+# Zaman sınırları datetime ya da epoch mikrosaniye (int) olarak verilebilir
+TimeLike = Union[datetime, int]
+
+BUCKET_US: Dict[str, int] = {
+    "minute": 60 * US_PER_SEC,
+    "hour":   3600 * US_PER_SEC,
+    "day":    86400 * US_PER_SEC,
+    "week":   7 * 86400 * US_PER_SEC,
+}
+
+# Gruplama yapılabilecek sütunlar (SQL'e yalnızca bu adlar girer)
+GROUP_COLUMNS = {
+    "door":    "COALESCE(door, '')",
+    "user":    "COALESCE(user_id, -1)",
+    "granted": "access_granted",
+}
+
+# Sayfa satırları; NULL user_id → -1, NULL door → ''
+_LOG_FIELDS = [
+    ("id",             np.int64),
+    ("user_id",        np.int64),
+    ("confidence",     np.float32),
+    ("access_granted", np.bool_),
+    ("ts",             np.int64),
+]
+
+
+def log_dtype(door_len: int = 1) -> np.dtype:
+    """Sayfa dtype'ı; door sütunu sayfadaki en uzun kapı adına göre boyutlanır (kesilmez)."""
+    return np.dtype(_LOG_FIELDS + [("door", f"U{max(1, door_len)}")])
+
+
+LOG_DTYPE = log_dtype()     # Boş sayfalar için
+
+
+def _as_us(value: Optional[TimeLike], default: int) -> int:
+    if value is None:
+        return default
+    if isinstance(value, datetime):
+        return to_epoch_us(value)
+    return int(value)
+
+
+def time_range(start: Optional[TimeLike], end: Optional[TimeLike]) -> Tuple[int, int]:
+    """[start, end) aralığı; verilmeyen uçlar açık kabul edilir."""
+    return _as_us(start, 0), _as_us(end, 2 ** 62)
+
+
+def log_filters(
+    granted: Optional[bool],
+    door: Optional[str],
+    user_id: Optional[int]
+) -> Tuple[str, list]:
+    sql, params = "", []
+    if granted is not None:
+        sql += " AND access_granted = ?"
+        params.append(int(granted))
+    if door is not None:
+        sql += " AND door = ?"
+        params.append(door)
+    if user_id is not None:
+        sql += " AND user_id = ?"
+        params.append(user_id)
+    return sql, params
+
+
+def _local_offset_us() -> int:
+    # Gün / hafta kovaları yerel gece yarısına hizalansın (DST geçişi yok sayılır)
+    return time.localtime().tm_gmtoff * US_PER_SEC
+
+
+def _fetch(sql: str, params: list) -> list:
+    with db_manager.get_connection(readonly=True) as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = None       # sqlite3.Row yerine düz tuple (daha ucuz)
+        return cursor.execute(sql, params).fetchall()
+
+
+# ─── Sayımlar ──────────────────────────────────────
+@dataclass
+class BucketCounts:
+    """Kova başlangıcı (epoch µs) × grup başına sayım; hepsi aynı uzunlukta."""
+    bucket_us: np.ndarray             # int64
+    group:     np.ndarray             # Gruplama yoksa boş
+    total:     np.ndarray             # int64
+    granted:   np.ndarray             # int64
+
+    @property
+    def denied(self) -> np.ndarray:
+        return self.total - self.granted
+
+    def bucket_datetimes(self) -> List[datetime]:
+        return [datetime.fromtimestamp(us / US_PER_SEC) for us in self.bucket_us.tolist()]
+
+
+def count_by_bucket(
+    start: Optional[TimeLike] = None,
+    end: Optional[TimeLike] = None,
+    bucket: str = "hour",
+    group_by: Optional[str] = None,
+    granted: Optional[bool] = None,
+    door: Optional[str] = None,
+    user_id: Optional[int] = None
+) -> BucketCounts:
+    """
+    Zaman kovası (ve istenirse kapı / kullanıcı / durum) başına kayıt sayısı.
+    Örn. "kapı başına saatlik geçiş": count_by_bucket(t0, t1, "hour", group_by="door").
+    Kovalama ve GROUP BY SQLite içinde yapılır; yalnızca sonuç satırları döner.
+    """
+    if bucket not in BUCKET_US:
+        raise ValueError(f"Bilinmeyen kova: {bucket} (seçenekler: {sorted(BUCKET_US)})")
+    if group_by is not None and group_by not in GROUP_COLUMNS:
+        raise ValueError(f"Bilinmeyen gruplama: {group_by} (seçenekler: {sorted(GROUP_COLUMNS)})")
+
+    width = BUCKET_US[bucket]
+    offset = _local_offset_us() if width >= BUCKET_US["day"] else 0
+    lo, hi = time_range(start, end)
+    where, params = log_filters(granted, door, user_id)
+
+    group_sql = GROUP_COLUMNS[group_by] if group_by else "NULL"
+    rows = _fetch(
+        f"""
+        SELECT ((ts + ?) / ?) * ? - ? AS bucket, {group_sql} AS grp,
+               COUNT(*), SUM(access_granted)
+        FROM access_logs
+        WHERE ts >= ? AND ts < ?{where}
+        GROUP BY bucket, grp
+        ORDER BY bucket, grp
+        """,
+        [offset, width, width, offset, lo, hi] + params,
+    )
+
+    if not rows:
+        empty = np.empty(0, dtype=np.int64)
+        return BucketCounts(empty, np.empty(0), empty, empty)
+
+    buckets, groups, totals, grants = zip(*rows)
+    return BucketCounts(
+        bucket_us=np.asarray(buckets, dtype=np.int64),
+        group=np.asarray(groups) if group_by else np.empty(0),
+        total=np.asarray(totals, dtype=np.int64),
+        granted=np.asarray(grants, dtype=np.int64),
+    )
+
+
+def count_attempts(
+    start: Optional[TimeLike] = None,
+    end: Optional[TimeLike] = None,
+    granted: Optional[bool] = None,
+    door: Optional[str] = None,
+    user_id: Optional[int] = None
+) -> int:
+    lo, hi = time_range(start, end)
+    where, params = log_filters(granted, door, user_id)
+    rows = _fetch(f"SELECT COUNT(*) FROM access_logs WHERE ts >= ? AND ts < ?{where}",
+                  [lo, hi] + params)
+    return int(rows[0][0])
+
+
+def denied_attempts(hours: float = 24.0, door: Optional[str] = None) -> int:
+    """Son `hours` saatteki reddedilen (yetkisiz + tanınmayan) girişim sayısı."""
+    since = now_us() - int(hours * 3600 * US_PER_SEC)
+    return count_attempts(start=since, granted=False, door=door)
+
+
+# ─── Kullanıcı bazlı özet ──────────────────────────
+@dataclass
+class SeenStats:
+    user_id:  np.ndarray      # int64
+    first_us: np.ndarray      # int64
+    last_us:  np.ndarray      # int64
+    count:    np.ndarray      # int64
+    granted:  np.ndarray      # int64
+
+
+def first_last_seen(
+    start: Optional[TimeLike] = None,
+    end: Optional[TimeLike] = None,
+    user_ids: Optional[List[int]] = None
+) -> SeenStats:
+    """Tanınan her kullanıcı için ilk / son görülme, kayıt ve izinli geçiş sayısı."""
+    lo, hi = time_range(start, end)
+    sql = """
+        SELECT user_id, MIN(ts), MAX(ts), COUNT(*), SUM(access_granted)
+        FROM access_logs
+        WHERE user_id IS NOT NULL AND ts >= ? AND ts < ?
+    """
+    params: list = [lo, hi]
+    if user_ids is not None:
+        sql += f" AND user_id IN ({','.join('?' * len(user_ids))})"
+        params += list(user_ids)
+    rows = _fetch(sql + " GROUP BY user_id ORDER BY user_id", params)
+
+    cols = list(zip(*rows)) if rows else [()] * 5
+    return SeenStats(*(np.asarray(c, dtype=np.int64) for c in cols))
+
+
+# ─── Keyset sayfalama ──────────────────────────────
+@dataclass
+class LogPage:
+    rows:   np.ndarray                      # log_dtype() yapılı dizi, ts azalan
+    cursor: Optional[Tuple[int, int]]       # Sonraki sayfa için (ts, id); None → bitti
+
+
+def fetch_log_page(
+    start: Optional[TimeLike] = None,
+    end: Optional[TimeLike] = None,
+    page_size: int = 1000,
+    cursor: Optional[Tuple[int, int]] = None,
+    granted: Optional[bool] = None,
+    door: Optional[str] = None,
+    user_id: Optional[int] = None
+) -> LogPage:
+    """
+    Aralıktaki kayıtları en yeniden eskiye sayfa sayfa döndürür. OFFSET yerine
+    son satırın (ts, id) anahtarından devam edilir; her sayfa index üzerinde
+    doğrudan konumlanır, derin sayfalar da ilk sayfa kadar ucuzdur.
+    """
+    lo, hi = time_range(start, end)
+    where, params = log_filters(granted, door, user_id)
+    sql = f"""
+        SELECT id, COALESCE(user_id, -1), confidence, access_granted, ts, COALESCE(door, '')
+        FROM access_logs
+        WHERE ts >= ? AND ts < ?{where}
+    """
+    args: list = [lo, hi] + params
+    if cursor is not None:
+        sql += " AND (ts, id) < (?, ?)"
+        args += list(cursor)
+    rows = _fetch(sql + " ORDER BY ts DESC, id DESC LIMIT ?", args + [page_size])
+
+    if rows:
+        page = np.array(rows, dtype=log_dtype(max(len(row[5]) for row in rows)))
+    else:
+        page = np.empty(0, dtype=LOG_DTYPE)
+    next_cursor = None
+    if len(page) == page_size:
+        next_cursor = (int(page["ts"][-1]), int(page["id"][-1]))
+    return LogPage(rows=page, cursor=next_cursor)
+
+
+def iter_log_pages(
+    start: Optional[TimeLike] = None,
+    end: Optional[TimeLike] = None,
+    page_size: int = 1000,
+    **filters
+) -> Iterator[np.ndarray]:
+    cursor = None
+    while True:
+        page = fetch_log_page(start, end, page_size, cursor, **filters)
+        if len(page.rows):
+            yield page.rows
+        if page.cursor is None:
+            return
+        cursor = page.cursor
+
@@ -0,0 +1,154 @@
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+from face_access_system.config.settings import (
+    RETENTION_DAYS,
+    ARCHIVE_DIR,
+    ARCHIVE_FORMAT,
+    RETENTION_CHUNK_SIZE,
+    RETENTION_CHUNK_PAUSE,
+)
+from face_access_system.database.db import db_manager
+from face_access_system.database.export import LogFileWriter, iter_log_rows, open_export
+from face_access_system.database.timeutil import from_epoch_us, to_epoch_us
+
+
+@dataclass
+class RetentionReport:
+    cutoff:   datetime
+    archived: int = 0
+    deleted:  int = 0
+    files:    List[str] = field(default_factory=list)
+    freed_pages: int = 0
+
+
+def _archive_path(archive_dir: str, day: date, fmt: str) -> str:
+    # Aynı gün için dosya zaten varsa (önceki çalışma yarıda kaldıysa) üzerine
+    # yazılmaz; sonraki parça numarasıyla yeni dosya açılır
+    base = os.path.join(archive_dir, f"access_logs-{day.isoformat()}")
+    path, part = f"{base}.{fmt}.gz", 1
+    while os.path.exists(path):
+        path = f"{base}-{part}.{fmt}.gz"
+        part += 1
+    return path
+
+
+def _archive_day(lo: int, hi: int, path: str, fmt: str) -> Tuple[int, int]:
+    """
+    [lo, hi) aralığını geçici dosyaya yazar, fsync sonrası adını verir.
+    (satır sayısı, arşivlenen en büyük id) döndürür.
+    """
+    tmp = path + ".tmp"
+    max_id = -1
+    with open_export(tmp, compress=True) as stream:
+        writer = LogFileWriter(stream, fmt)
+        for row in iter_log_rows(lo, hi):
+            writer.write(row)
+            max_id = max(max_id, row[0])
+    if writer.rows == 0:
+        os.remove(tmp)
+        return 0, max_id
+    with open(tmp, "rb") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return writer.rows, max_id
+
+
+def _delete_range(lo: int, hi: int, max_id: int, chunk_size: int, pause: float) -> int:
+    """
+    Aralığı küçük transaction'larla siler; her parça arasında kilit bırakılır,
+    böylece canlı log yazıcısı en fazla bir parça süresi bekler.
+    """
+    deleted = 0
+    while True:
+        with db_manager.get_connection() as conn:
+            cursor = conn.execute(
+                """
+                DELETE FROM access_logs WHERE id IN (
+                    SELECT id FROM access_logs WHERE ts >= ? AND ts < ? AND id <= ? LIMIT ?
+                )
+                """,
+                (lo, hi, max_id, chunk_size),
+            )
+            n = cursor.rowcount
+        deleted += n
+        if n < chunk_size:
+            return deleted
+        time.sleep(pause)
+
+
+def incremental_vacuum(max_pages: int = 0, allow_full: bool = False) -> int:
+    """
+    Boş sayfaları dosyadan geri verir; döndürülen değer serbest kalan sayfa
+    sayısıdır. auto_vacuum=INCREMENTAL olmayan eski veritabanları yalnızca
+    allow_full ile (bir kerelik, uzun süren) tam VACUUM'la dönüştürülür.
+    """
+    # VACUUM transaction içinde çalışamaz; incremental_vacuum da tek adım değil
+    # tamamı çalışsın diye executescript ile → havuz dışı, autocommit bağlantı
+    conn = db_manager.open_connection(readonly=False)
+    try:
+        conn.isolation_level = None
+        mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+        if mode != 2:
+            if not allow_full:
+                print("[Retention] auto_vacuum=INCREMENTAL değil; alan geri verilmedi "
+                      "(bir kez --full-vacuum ile dönüştürün).")
+                return 0
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        else:
+            conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages)});")
+
+        after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return before - after
+    finally:
+        conn.close()
+
+
+def run_retention(
+    days: int = RETENTION_DAYS,
+    archive_dir: str = ARCHIVE_DIR,
+    fmt: str = ARCHIVE_FORMAT,
+    chunk_size: int = RETENTION_CHUNK_SIZE,
+    pause: float = RETENTION_CHUNK_PAUSE,
+    vacuum_pages: int = 0,
+    full_vacuum: bool = False,
+    now: Optional[datetime] = None
+) -> RetentionReport:
+    """
+    `days` günden eski kayıtları yerel gün başına bir gzip dosyasına arşivler,
+    ardından o günün satırlarını parça parça siler ve sonunda boş sayfaları
+    geri verir. Bir gün dosyası diske yazılmadan o günün satırları silinmez.
+    """
+    now = now or datetime.now()
+    cutoff = datetime.combine((now - timedelta(days=days)).date(), datetime.min.time())
+    cutoff_us = to_epoch_us(cutoff)
+    report = RetentionReport(cutoff=cutoff)
+    os.makedirs(archive_dir, exist_ok=True)
+
+    with db_manager.get_connection(readonly=True) as conn:
+        oldest = conn.execute("SELECT MIN(ts) FROM access_logs WHERE ts < ?", (cutoff_us,)).fetchone()[0]
+
+    if oldest is not None:
+        day = from_epoch_us(oldest).date()
+        while day < cutoff.date():
+            lo = to_epoch_us(datetime.combine(day, datetime.min.time()))
+            hi = to_epoch_us(datetime.combine(day + timedelta(days=1), datetime.min.time()))
+            path = _archive_path(archive_dir, day, fmt)
+
+            archived, max_id = _archive_day(lo, hi, path, fmt)
+            if archived:
+                report.archived += archived
+                report.files.append(path)
+                # Yalnızca dosyaya yazılmış satırlar (id <= max_id) silinir
+                report.deleted += _delete_range(lo, hi, max_id, chunk_size, pause)
+                print(f"[Retention] {day.isoformat()}: {archived} kayıt → {os.path.basename(path)}")
+            day += timedelta(days=1)
+
+    report.freed_pages = incremental_vacuum(vacuum_pages, allow_full=full_vacuum)
+    return report
@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Optional
+
+# Zaman damgaları veritabanında yerel saatle, Unix epoch'undan bu yana geçen
+# mikrosaniye (INTEGER) olarak saklanır; modeller datetime görmeye devam eder.
+US_PER_SEC = 1_000_000
+
+
+def to_epoch_us(dt: datetime) -> int:
+    """Yerel (naive) ya da tz'li datetime → epoch mikrosaniye (kayıpsız)."""
+    return int(dt.replace(microsecond=0).timestamp()) * US_PER_SEC + dt.microsecond
+
+
+def from_epoch_us(us: int) -> datetime:
+    """Epoch mikrosaniye → yerel (naive) datetime."""
+    seconds, micros = divmod(int(us), US_PER_SEC)
+    return datetime.fromtimestamp(seconds).replace(microsecond=micros)
+
+
+def now_us() -> int:
+    return to_epoch_us(datetime.now())
+
+
+def iso_to_epoch_us(text: Optional[str]) -> Optional[int]:
+    """Eski şemadaki ISO TEXT değerleri için (göç sırasında SQL fonksiyonu olarak)."""
+    if text is None:
+        return None
+    return to_epoch_us(datetime.fromisoformat(text))
@@ -8,17 +8,28 @@ import time
 # Proje kök dizini
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config.settings import (
+from face_access_system.config.settings import (
     CAMERA_INDEX,
     FRAME_WIDTH,
     FRAME_HEIGHT,
     FPS,
+    INFERENCE_WORKERS,
+    METRICS_ENABLED,
+    MOTION_GATING_ENABLED,
+    TRACKING_ENABLED,
 )
-from vision.face_detector import FaceDetector
-from vision.embedding_extractor import EmbeddingExtractor
-from recognition.recognizer import FaceRecognizer
-from app_logging.access_logger import AccessLogger, AccessStatus, AccessDecision
-from scripts.init_db import create_tables
+from face_access_system.vision.face_detector import FaceDetector
+from face_access_system.vision.embedding_extractor import EmbeddingExtractor
+from face_access_system.vision.tracker import FaceTracker
+from face_access_system.recognition.recognizer import FaceRecognizer
+from face_access_system.app_logging.access_logger import AccessLogger, AccessStatus
+from face_access_system.app_logging.metrics import MetricsDumper, metrics
+from face_access_system.pipeline.analyzer import FaceAnalyzer, DecisionGate
+from face_access_system.pipeline.threaded import ThreadedPipeline
+from face_access_system.pipeline.scheduler import AdaptiveScheduler
+from face_access_system.pipeline.multiprocess import MultiProcessPipeline
+from face_access_system.pipeline.multistream import MultiStreamServer, load_stream_configs
+from face_access_system.scripts.init_db import create_tables
 
 # --- GÖRSEL AYARLAR ---
 COLORS = {
@@ -32,8 +43,11 @@ COLORS = {
 FONT = cv2.FONT_HERSHEY_SIMPLEX
 
 # --- OPTİMİZASYON AYARLARI ---
-PROCESS_EVERY_N_FRAME = 3  # Her 3 karede bir AI çalıştır
-SCALE_FACTOR = 0.5  # AI analizi için görüntüyü %50 küçült (Hızı 2 kat artırır)
+PROCESS_EVERY_N_FRAME = 3  # Her 3 karede bir AI çalıştır (hareket kapısı açıkken başlangıç değeri)
+SCALE_FACTOR = 0.5  # AI analizi için görüntüyü %50 küçült (Hızı 2 kat artırır; başlangıç değeri)
+QUEUE_SIZE = 2  # Aşamalar arası kuyruk; dolunca en eski kare atılır
+COOLDOWN_SEC = 3.0
+STATS_INTERVAL_SEC = 10.0  # Aşama gecikmelerinin konsola yazılma aralığı
 
 
 def draw_box_with_info(frame, x, y, w, h, name, confidence, status):
@@ -58,80 +72,125 @@ def draw_box_with_info(frame, x, y, w, h, name, confidence, status):
     cv2.putText(frame, status.value, (text_x, panel_y + 62), FONT, 0.5, color, 2)
 
 
+def run_multistream(configs) -> None:
+    """Çoklu kamera: ekran yok; akış başına FPS ve karar gecikmesi konsola yazılır."""
+    server = MultiStreamServer(configs, cooldown_sec=COOLDOWN_SEC)
+    server.start()
+    print(f"[MultiStream] {len(configs)} akış başlatıldı: {', '.join(c.door for c in configs)}")
+    try:
+        while server.is_running:
+            time.sleep(STATS_INTERVAL_SEC)
+            print(f"[MultiStream] {server.format_stats()}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()   # Kuyrukta bekleyen erişim kayıtlarını yazar, akış logger'larını kapatır
+
+
 def main() -> None:
     create_tables()
-    detector, extractor, recognizer, logger = FaceDetector(), EmbeddingExtractor(), FaceRecognizer(), AccessLogger()
-
-    cap = cv2.VideoCapture(CAMERA_INDEX)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_WIDTH)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, FRAME_HEIGHT)
+    # Aşama histogramları + sayaçlar METRICS_DUMP_PATH'e periyodik JSON olarak
+    dumper = MetricsDumper(metrics).start() if METRICS_ENABLED else None
+    try:
+        configs = load_stream_configs()
+        if configs:
+            run_multistream(configs)
+        else:
+            run_camera()
+    finally:
+        if dumper is not None:
+            dumper.stop()
+
+
+def run_camera() -> None:
+    gate = DecisionGate(AccessLogger(), cooldown_sec=COOLDOWN_SEC)
+    cap = None
+    recognizer = None
+
+    if INFERENCE_WORKERS > 0:
+        if TRACKING_ENABLED:
+            print("[Pipeline] Çok süreçli kipte iz takibi kullanılmaz; her karede tanıma yapılır.")
+        # Modeller yalnızca işçi süreçlerinde yüklenir; ana süreç çizer ve loglar
+        pipeline = MultiProcessPipeline(
+            CAMERA_INDEX,
+            gate,
+            workers=INFERENCE_WORKERS,
+            frame_shape=(FRAME_HEIGHT, FRAME_WIDTH, 3),
+            scale_factor=SCALE_FACTOR,
+            process_every_n=PROCESS_EVERY_N_FRAME,
+        )
+    else:
+        detector, extractor, recognizer = FaceDetector(), EmbeddingExtractor(), FaceRecognizer()
+
+        cap = cv2.VideoCapture(CAMERA_INDEX)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_WIDTH)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, FRAME_HEIGHT)
+        # Sürücü tamponunda kare birikmesin (destekleyen backend'lerde)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        # Yakalama, AI ve loglama ayrı iş parçacıklarında; bu döngü yalnızca çizer
+        pipeline = ThreadedPipeline(
+            cap,
+            FaceAnalyzer(detector, extractor, recognizer, scale_factor=SCALE_FACTOR,
+                         tracker=FaceTracker() if TRACKING_ENABLED else None),
+            gate,
+            process_every_n=PROCESS_EVERY_N_FRAME,
+            queue_size=QUEUE_SIZE,
+            # Hareket yoksa AI uyur; varsa yalnızca hareketli bölgeler, yüke göre ölçek/aralık
+            scheduler=AdaptiveScheduler(interval=PROCESS_EVERY_N_FRAME, scale=SCALE_FACTOR)
+            if MOTION_GATING_ENABLED else None,
+        )
+
+    pipeline.start()
 
     prev_time = time.time()
-    frame_count = 0
-    cached_faces = []  # AI sonuçlarını saklamak için
-
-    last_decision_time = {}
-    COOLDOWN_SEC = 3.0
-
-    while True:
-        ret, frame = cap.read()
-        if not ret: break
-
-        # 1. FPS Hesaplama
+    last_stats_time = prev_time
+    last_frame_id = -1
+    fps_actual = None
+
+    while pipeline.is_running:
+        packet = pipeline.latest_frame()
+        if packet is None or packet.frame_id == last_frame_id:
+            if cv2.waitKey(1) & 0xFF == ord('q'): break
+            continue
+        last_frame_id = packet.frame_id
+        frame = packet.frame.copy()
+
+        # 1. FPS Hesaplama (ekrana basılan kare hızı; tek kare aralığı gürültülü → EMA)
         curr_time = time.time()
-        fps_actual = 1.0 / (curr_time - prev_time)
+        fps_instant = 1.0 / max(curr_time - prev_time, 1e-6)
+        fps_actual = fps_instant if fps_actual is None else fps_actual + 0.1 * (fps_instant - fps_actual)
         prev_time = curr_time
 
-        # 2. ANALİZ (Sadece belirli karelerde ve küçük boyutta)
-        if frame_count % PROCESS_EVERY_N_FRAME == 0:
-            cached_faces = []
-            # Görüntüyü küçülterek işle (Hız kazancı)
-            small_frame = cv2.resize(frame, (0, 0), fx=SCALE_FACTOR, fy=SCALE_FACTOR)
-            detected_faces = detector.detect_faces(small_frame)
-
-            for face_img, (sx, sy, sw, sh) in detected_faces:
-                # Koordinatları orijinal boyuta geri getir
-                x, y, w, h = int(sx / SCALE_FACTOR), int(sy / SCALE_FACTOR), int(sw / SCALE_FACTOR), int(
-                    sh / SCALE_FACTOR)
-
-                embedding = extractor.extract(face_img)
-                if embedding is None: continue
-
-                result = recognizer.recognize(embedding)
-                user_key = result.matched_user.id if result.matched_user else "unknown"
-
-                # Cooldown ve Loglama Mantığı
-                now = time.time()
-                if user_key not in last_decision_time or (now - last_decision_time[user_key] > COOLDOWN_SEC):
-                    decision = logger.log_access(result)
-                    last_decision_time[user_key] = now
-                else:
-                    status = AccessStatus.UNKNOWN
-                    if result.is_recognized:
-                        status = AccessStatus.GRANTED if result.matched_user.is_authorized else AccessStatus.DENIED
-                    decision = AccessDecision(status=status, user=result.matched_user, confidence=result.confidence,
-                                              message="")
-
-                cached_faces.append({"coords": (x, y, w, h), "dec": decision})
-
-        # 3. ÇİZİM (Her karede cached sonuçları bas)
-        for face in cached_faces:
-            x, y, w, h = face["coords"]
-            d = face["dec"]
+        # 2. ÇİZİM (En yeni kareye en son kararları bas; kutular iz hızıyla
+        #    karenin yakalanma anına ilerletilir)
+        for face in pipeline.latest_faces():
+            x, y, w, h = face.coords_at(packet.captured_at)
+            d = face.decision
             draw_box_with_info(frame, x, y, w, h, name=d.user.name if d.user else "", confidence=d.confidence,
                                status=d.status)
 
         # Header ve UI
+        stats = pipeline.stats()
         cv2.rectangle(frame, (0, 0), (frame.shape[1], 35), (0, 0, 0), -1)
-        cv2.putText(frame, f"AI ACCESS | FPS: {fps_actual:.1f}", (15, 22), FONT, 0.6, (255, 255, 255), 2)
+        cv2.putText(frame, f"AI ACCESS | FPS: {fps_actual:.1f} | AI: {stats['inference']['latency_ms']:.0f}ms",
+                    (15, 22), FONT, 0.6, (255, 255, 255), 2)
+
+        if curr_time - last_stats_time >= STATS_INTERVAL_SEC:
+            print(f"[Pipeline] {pipeline.format_stats()}")
+            last_stats_time = curr_time
 
         cv2.imshow("Biometric Access Control", frame)
-        frame_count += 1
         if cv2.waitKey(1) & 0xFF == ord('q'): break
 
-    cap.release()
+    pipeline.stop()
+    gate.logger.close()   # Kuyrukta bekleyen erişim kayıtlarını yaz
+    if recognizer is not None:
+        recognizer.close()
+    if cap is not None:
+        cap.release()
     cv2.destroyAllWindows()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,271 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from face_access_system.app_logging.access_logger import (
+    AccessDecision,
+    AccessLogger,
+    AccessStatus,
+)
+from face_access_system.app_logging.metrics import metrics
+from face_access_system.recognition.recognizer import FaceRecognizer, RecognitionResult
+from face_access_system.vision.embedding_extractor import EmbeddingExtractor
+from face_access_system.vision.face_detector import FaceDetector
+from face_access_system.vision.tracker import FaceTracker
+
+Box = Tuple[int, int, int, int]
+
+
+# Kutunun bilinen hızıyla en fazla bu kadar ileri tahmin edilir (sn)
+MAX_EXTRAPOLATION_SEC: float = 0.5
+
+
+@dataclass
+class FaceResult:
+    coords: Box                   # Orijinal kare koordinatları (x, y, w, h)
+    result: RecognitionResult
+    track_id:    Optional[int] = None
+    fresh:       bool = True      # Sonuç bu karede mi hesaplandı (False → izden)
+    velocity:    Tuple[float, float] = (0.0, 0.0)   # piksel/sn
+    observed_at: float = 0.0      # time.monotonic()
+
+
+@dataclass
+class FaceDecision:
+    coords:   Box
+    decision: AccessDecision
+    track_id:    Optional[int] = None
+    velocity:    Tuple[float, float] = (0.0, 0.0)
+    observed_at: float = 0.0
+
+    def coords_at(self, t: float) -> Box:
+        """Kutuyu izin hızıyla t anına ilerletir (algılama olmayan kareler için)."""
+        dt = min(max(t - self.observed_at, 0.0), MAX_EXTRAPOLATION_SEC)
+        x, y, w, h = self.coords
+        return (int(x + self.velocity[0] * dt), int(y + self.velocity[1] * dt), w, h)
+
+
+class FaceAnalyzer:
+    """Tek bir kare için algılama → embedding → tanıma zinciri."""
+
+    def __init__(
+        self,
+        detector: FaceDetector,
+        extractor: EmbeddingExtractor,
+        recognizer: FaceRecognizer,
+        scale_factor: float = 0.5,
+        tracker: Optional[FaceTracker] = None
+    ):
+        self.detector     = detector
+        self.extractor    = extractor
+        self.recognizer   = recognizer
+        self.scale_factor = scale_factor
+        self.tracker      = tracker
+
+        # Takibin kazancını görmek için: algılanan yüz ↔ çalıştırılan tanıma
+        self.faces_seen        = 0
+        self.recognitions_run  = 0
+
+    def analyze(
+        self,
+        frame: np.ndarray,
+        timestamp: Optional[float] = None,
+        rois: Optional[List[Box]] = None,
+        scale: Optional[float] = None
+    ) -> List[FaceResult]:
+        """
+        rois verilirse algılama yalnızca bu bölgelerde (tam kare koordinatı)
+        çalışır; scale verilirse scale_factor yerine kullanılır.
+        """
+        job = self.prepare(frame, timestamp, rois, scale)
+        # Karedeki tüm yüzler tek model çağrısı + tek matris çarpımıyla işlenir
+        return self.finish(job, recognize_faces(self.extractor, self.recognizer, job.crops))
+
+    def prepare(
+        self,
+        frame: np.ndarray,
+        timestamp: Optional[float] = None,
+        rois: Optional[List[Box]] = None,
+        scale: Optional[float] = None,
+        detector: Optional[FaceDetector] = None
+    ) -> "AnalysisJob":
+        """
+        Algılama (+ takip) adımı; embedding gerektiren yüzler job.crops'tadır.
+        Çoklu akışta birden çok karenin crops'u tek batch'te işlenip her biri
+        kendi finish() çağrısına dağıtılır. detector verilirse (algılama iş
+        parçacığının kendi örneği) self.detector yerine kullanılır.
+        """
+        s = self.scale_factor if scale is None else scale
+        detected = self._detect(frame, rois, s, detector or self.detector)
+        now = time.monotonic() if timestamp is None else timestamp
+
+        if self.tracker is None:
+            self.faces_seen += len(detected)
+            self.recognitions_run += len(detected)
+            return AnalysisJob(detected, now, None, list(range(len(detected))))
+
+        tracks = self.tracker.update([coords for _, coords in detected], now)
+        self.faces_seen += len(tracks)
+        # Yalnızca yeni / doğrulama süresi dolmuş izler için embedding + eşleştirme
+        pending = self.tracker.pending_recognitions(tracks, now)
+        return AnalysisJob(detected, now, tracks, pending)
+
+    def finish(
+        self,
+        job: "AnalysisJob",
+        results: List[Optional[RecognitionResult]]
+    ) -> List[FaceResult]:
+        """results job.crops ile hizalıdır; None → embedding çıkarılamadı."""
+        if job.tracks is None:
+            return [FaceResult(coords=job.detected[i][1], result=result)
+                    for i, result in zip(job.pending, results) if result is not None]
+
+        fresh = set()
+        for i, result in zip(job.pending, results):
+            if result is None:
+                continue
+            self.tracker.set_result(job.tracks[i], result, job.now)
+            fresh.add(i)
+        self.recognitions_run += len(fresh)
+
+        faces: List[FaceResult] = []
+        for i, track in enumerate(job.tracks):
+            if track.result is None:
+                continue
+            faces.append(FaceResult(
+                coords=job.detected[i][1],
+                result=track.result,
+                track_id=track.track_id,
+                fresh=i in fresh,
+                velocity=(float(track.velocity[0]), float(track.velocity[1])),
+                observed_at=job.now,
+            ))
+
+        return faces
+
+    def _detect(self, frame: np.ndarray, rois: Optional[List[Box]], s: float, detector: FaceDetector):
+        """(yüz görüntüsü, orijinal kare koordinatlarında kutu) listesi döner."""
+        regions = [(0, 0, frame)] if rois is None else [
+            (x, y, frame[y:y + h, x:x + w]) for x, y, w, h in rois
+        ]
+
+        detected = []
+        for ox, oy, region in regions:
+            if region.size == 0:
+                continue
+            # Görüntüyü küçülterek işle (Hız kazancı)
+            small = region if s == 1.0 else cv2.resize(region, (0, 0), fx=s, fy=s)
+            for face_img, (sx, sy, sw, sh) in detector.detect_faces(small):
+                # Koordinatları orijinal boyuta geri getir
+                coords = (ox + int(sx / s), oy + int(sy / s), int(sw / s), int(sh / s))
+                detected.append((face_img, coords))
+        return detected
+
+
+@dataclass
+class AnalysisJob:
+    detected: List[Tuple[np.ndarray, Box]]    # (yüz görüntüsü, kutu)
+    now:      float
+    tracks:   Optional[list]                  # Takip kapalıysa None
+    pending:  List[int]                       # Embedding gereken detected indeksleri
+
+    @property
+    def crops(self) -> List[np.ndarray]:
+        return [self.detected[i][0] for i in self.pending]
+
+
+def recognize_faces(
+    extractor: EmbeddingExtractor,
+    recognizer: FaceRecognizer,
+    crops: List[np.ndarray]
+) -> List[Optional[RecognitionResult]]:
+    """Tek embedding çağrısı + tek eşleştirme; sonuçlar crops ile hizalı."""
+    if not crops:
+        return []
+    embeddings = extractor.extract_batch(crops)
+    valid = np.flatnonzero(np.any(embeddings != 0, axis=1))
+    results: List[Optional[RecognitionResult]] = [None] * len(crops)
+    for j, result in zip(valid, recognizer.recognize_batch(embeddings[valid])):
+        results[j] = result
+    return results
+
+
+def classify(result: RecognitionResult) -> AccessDecision:
+    """Sonucun erişim kararı; log yazılmaz (cooldown içi / çevrimdışı tekrar oynatma)."""
+    status = AccessStatus.UNKNOWN
+    if result.is_recognized:
+        status = AccessStatus.GRANTED if result.matched_user.is_authorized else AccessStatus.DENIED
+    return AccessDecision(status=status, user=result.matched_user,
+                          confidence=result.confidence, message="")
+
+
+def decision_to_dict(face: FaceDecision) -> Dict[str, Any]:
+    """JSON (API yanıtı / NDJSON) için düz sözlük."""
+    d = face.decision
+    x, y, w, h = face.coords
+    out = {
+        "box":        [x, y, w, h],
+        "status":     d.status.value,
+        "user_id":    d.user.id if d.user else None,
+        "name":       d.user.name if d.user else None,
+        "confidence": round(float(d.confidence), 4),
+        "message":    d.message,
+    }
+    if face.track_id is not None:
+        out["track_id"] = face.track_id
+    return out
+
+
+class DecisionGate:
+    """
+    Tanıma sonucunu erişim kararına çevirir. Aynı kişi için cooldown_sec
+    içinde tekrar log yazılmaz; bu durumda karar yalnızca ekran için üretilir.
+    Takip edilen bir yüzün sonucu izden geliyorsa (fresh=False) iz için verilmiş
+    karar yeniden kullanılır, log yazılmaz.
+    """
+
+    # Bu süre görülmeyen izlerin kararları unutulur
+    TRACK_DECISION_TTL: float = 30.0
+
+    def __init__(self, logger: AccessLogger, cooldown_sec: float = 3.0):
+        self.logger       = logger
+        self.cooldown_sec = cooldown_sec
+        self._last_decision_time: Dict[Union[int, str], float] = {}
+        self._track_decisions: Dict[int, Tuple[AccessDecision, float]] = {}
+
+    def decide(self, result: RecognitionResult, now: Optional[float] = None) -> AccessDecision:
+        now = time.time() if now is None else now
+        user_key = result.matched_user.id if result.matched_user else "unknown"
+
+        last = self._last_decision_time.get(user_key)
+        if last is None or now - last > self.cooldown_sec:
+            self._last_decision_time[user_key] = now
+            return self.logger.log_access(result)
+
+        metrics.inc("cooldown_suppressed_total")
+        return classify(result)
+
+    def decide_all(self, faces: List[FaceResult]) -> List[FaceDecision]:
+        now = time.time()
+        decisions: List[FaceDecision] = []
+
+        for f in faces:
+            cached = self._track_decisions.get(f.track_id) if f.track_id is not None else None
+            if cached is not None and not f.fresh:
+                decision = cached[0]
+            else:
+                decision = self.decide(f.result, now)
+            if f.track_id is not None:
+                self._track_decisions[f.track_id] = (decision, now)
+
+            decisions.append(FaceDecision(coords=f.coords, decision=decision, track_id=f.track_id,
+                                          velocity=f.velocity, observed_at=f.observed_at))
+
+        self._track_decisions = {
+            tid: entry for tid, entry in self._track_decisions.items()
+            if now - entry[1] <= self.TRACK_DECISION_TTL
+        }
+        return decisions
@@ -0,0 +1,294 @@
+import csv
+import multiprocessing as mp
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from face_access_system.config.settings import (
+    ENROLL_WORKERS,
+    ENROLL_BATCH_SIZE,
+    ENROLL_CHUNK_SIZE,
+    ENROLL_MAX_TEMPLATES,
+    ENROLL_MIN_TEMPLATES,
+    ENROLL_MAX_IMAGE_SIDE,
+)
+from face_access_system.database.crud import (
+    EnrollmentRow,
+    create_users_with_templates,
+    get_enrolled_external_ids,
+)
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+# Görüntü başına işçi sonucu
+IMAGE_OK         = "ok"
+IMAGE_UNREADABLE = "unreadable"
+IMAGE_NO_FACE    = "no_face"
+IMAGE_ERROR      = "error"
+
+
+@dataclass
+class EnrollmentItem:
+    external_id: str            # Personel no / dizin adı; devam etmenin anahtarı
+    name:        str
+    images:      List[str]
+    authorized:  bool = True
+
+
+@dataclass
+class EnrollmentReport:
+    people:     int = 0         # Girdideki kişi sayısı
+    skipped:    int = 0         # Önceki çalışmada kaydedilmiş
+    enrolled:   int = 0
+    failed:     List[str] = field(default_factory=list)   # Şablonu yetmeyen / yazılamayan external_id'ler
+    images:     int = 0         # İşlenen görüntü
+    templates:  int = 0         # Kaydedilen şablon
+    no_face:    int = 0
+    multi_face: int = 0         # Birden çok yüz → en büyüğü alındı
+    unreadable: int = 0
+    errors:     int = 0
+    elapsed:    float = 0.0
+    interrupted: bool = False
+
+    @property
+    def images_per_sec(self) -> float:
+        return self.images / self.elapsed if self.elapsed > 0 else 0.0
+
+
+# ─── Girdi ─────────────────────────────────────────
+def _is_image(path: str) -> bool:
+    return path.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def scan_directory(root: str, authorized: bool = True) -> List[EnrollmentItem]:
+    """
+    root/<kişi>/*.jpg → alt dizin başına bir kişi, içindeki her görüntü bir şablon;
+    root/<kişi>.jpg   → tek görüntülü kişi. Kişi adı = dizin / dosya adı.
+    Aynı ada çıkan girdiler (alice/ + alice.jpg, alice.jpg + alice.png) tek
+    kişinin görüntüleri olarak birleştirilir; external_id benzersiz kalır.
+    """
+    items: dict = {}
+    for entry in sorted(os.scandir(root), key=lambda e: e.name):
+        if entry.is_dir():
+            external_id = entry.name
+            images = sorted(
+                os.path.join(entry.path, f) for f in os.listdir(entry.path) if _is_image(f)
+            )
+        elif entry.is_file() and _is_image(entry.name):
+            external_id = os.path.splitext(entry.name)[0]
+            images = [entry.path]
+        else:
+            continue
+        if not images:
+            continue
+
+        item = items.get(external_id)
+        if item is None:
+            items[external_id] = EnrollmentItem(external_id, external_id, images, authorized)
+        else:
+            print(f"[Enrollment] {external_id}: aynı ada sahip girdiler tek kişide birleştirildi")
+            item.images.extend(images)
+    return list(items.values())
+
+
+def read_manifest(path: str, authorized: bool = True) -> List[EnrollmentItem]:
+    """
+    CSV: external_id,name,image[,authorized] — görüntü başına bir satır; aynı
+    external_id'nin satırları tek kişinin şablonlarıdır. Göreli görüntü yolları
+    manifest dizinine göre çözülür.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    items: dict = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            external_id = row["external_id"].strip()
+            image = row["image"].strip()
+            if not os.path.isabs(image):
+                image = os.path.join(base, image)
+
+            item = items.get(external_id)
+            if item is None:
+                flag = (row.get("authorized") or "").strip().lower()
+                item_authorized = authorized if not flag else flag in ("1", "true", "yes", "evet")
+                item = items[external_id] = EnrollmentItem(
+                    external_id, row["name"].strip(), [], item_authorized
+                )
+            item.images.append(image)
+    return list(items.values())
+
+
+# ─── İşçi süreç (spawn ile import edilebilir olmalı) ─
+_detector  = None
+_extractor = None
+
+
+def _init_worker() -> None:
+    global _detector, _extractor
+    # Her işçi tek çekirdek kullansın; paralellik süreç sayısından gelir
+    cv2.setNumThreads(1)
+
+    from face_access_system.vision.embedding_extractor import EmbeddingExtractor
+    from face_access_system.vision.face_detector import FaceDetector
+
+    _detector  = FaceDetector()
+    _extractor = EmbeddingExtractor()
+
+
+def _embed_image(task: Tuple[int, str]) -> Tuple[int, str, Optional[np.ndarray], str, int]:
+    """(kişi sırası, yol) → (kişi sırası, yol, embedding | None, durum, yüz sayısı)"""
+    index, path = task
+    try:
+        image = cv2.imread(path)
+        if image is None:
+            return index, path, None, IMAGE_UNREADABLE, 0
+
+        # Yüksek çözünürlüklü fotoğraflar algılamadan önce küçültülür
+        side = max(image.shape[:2])
+        if ENROLL_MAX_IMAGE_SIDE and side > ENROLL_MAX_IMAGE_SIDE:
+            s = ENROLL_MAX_IMAGE_SIDE / side
+            image = cv2.resize(image, None, fx=s, fy=s, interpolation=cv2.INTER_AREA)
+
+        faces = _detector.detect_faces(image)
+        if not faces:
+            return index, path, None, IMAGE_NO_FACE, 0
+
+        # Rozet fotoğrafında asıl kişi en büyük yüzdür
+        face_img, _ = max(faces, key=lambda f: f[1][2] * f[1][3])
+        embedding = _extractor.extract(face_img)
+        if embedding is None:
+            return index, path, None, IMAGE_ERROR, len(faces)
+        return index, path, np.asarray(embedding, dtype=np.float32), IMAGE_OK, len(faces)
+    except Exception as e:
+        print(f"[Enrollment] {path}: {e}")
+        return index, path, None, IMAGE_ERROR, 0
+
+
+# ─── Çalıştırma ────────────────────────────────────
+def _results(tasks: List[Tuple[int, str]], workers: int, chunk_size: int, pools: list) -> Iterator:
+    if workers == 1:
+        # Tek işçi: süreç açmadan aynı süreçte (hata ayıklama / küçük girdiler)
+        _init_worker()
+        return map(_embed_image, tasks)
+
+    pool = mp.get_context("spawn").Pool(workers, initializer=_init_worker)
+    pools.append(pool)
+    return pool.imap_unordered(_embed_image, tasks, chunksize=chunk_size)
+
+
+def run_bulk_enrollment(
+    items: List[EnrollmentItem],
+    workers: int = ENROLL_WORKERS,
+    batch_size: int = ENROLL_BATCH_SIZE,
+    max_templates: int = ENROLL_MAX_TEMPLATES,
+    min_templates: int = ENROLL_MIN_TEMPLATES,
+    chunk_size: int = ENROLL_CHUNK_SIZE,
+    progress_interval: float = 5.0
+) -> EnrollmentReport:
+    """
+    Algılama + embedding bir süreç havuzunda görüntü başına yapılır; bir
+    kişinin tüm görüntüleri bitince kişi toplu yazma kuyruğuna girer ve
+    batch_size kişi bir transaction'da eklenir.
+
+    Devam etme: her kişi external_id'siyle aynı transaction'da enrollments
+    tablosuna yazılır. Yarıda kesilen bir çalışma aynı girdiyle yeniden
+    başlatıldığında kaydedilmiş kişiler atlanır; yarım kalan kişiler baştan
+    işlenir (kısmi kayıt oluşmaz).
+    """
+    workers = workers or os.cpu_count() or 1
+    report = EnrollmentReport(people=len(items))
+
+    done = get_enrolled_external_ids()
+    pending: List[EnrollmentItem] = []
+    seen = set()
+    for item in items:
+        if item.external_id in done:
+            report.skipped += 1
+        elif item.external_id in seen:
+            # Girdide tekrarlanan external_id: ilki kaydedilir, tekrarı hata sayılır
+            print(f"[Enrollment] {item.external_id}: girdide birden çok kez var, tekrarı atlandı")
+            report.failed.append(item.external_id)
+        else:
+            seen.add(item.external_id)
+            pending.append(item)
+
+    tasks = [(i, path) for i, item in enumerate(pending) for path in item.images[:max_templates]]
+    remaining = [min(len(item.images), max_templates) for item in pending]
+    templates: List[List[np.ndarray]] = [[] for _ in pending]
+    batch: List[EnrollmentRow] = []
+
+    def write(rows: List[EnrollmentRow]) -> None:
+        create_users_with_templates(rows)
+        report.enrolled += len(rows)
+        report.templates += sum(len(row[2]) for row in rows)
+
+    def flush() -> None:
+        # Batch yazmadan önce boşaltılır: başarısız bir yazma aynı satırlarla
+        # tekrar denenmez (finally içindeki son flush dahil)
+        rows = list(batch)
+        batch.clear()
+        if not rows:
+            return
+        try:
+            write(rows)
+        except sqlite3.Error:
+            # Batch tek transaction'dır ve tamamen geri alınmıştır; kişiler tek
+            # tek yazılır, yalnızca yazılamayanlar başarısız sayılır
+            for row in rows:
+                try:
+                    write([row])
+                except sqlite3.Error as e:
+                    print(f"[Enrollment] {row[0]}: kaydedilemedi: {e}")
+                    report.failed.append(row[0])
+
+    start = time.monotonic()
+    last_progress = start
+    pools: list = []
+    try:
+        for index, path, embedding, status, n_faces in _results(tasks, workers, chunk_size, pools):
+            report.images += 1
+            if status == IMAGE_OK:
+                templates[index].append(embedding)
+                report.multi_face += int(n_faces > 1)
+            elif status == IMAGE_NO_FACE:
+                report.no_face += 1
+            elif status == IMAGE_UNREADABLE:
+                report.unreadable += 1
+            else:
+                report.errors += 1
+
+            remaining[index] -= 1
+            if remaining[index] == 0:
+                item = pending[index]
+                if len(templates[index]) >= max(1, min_templates):
+                    batch.append((item.external_id, item.name,
+                                  np.stack(templates[index]), item.authorized))
+                else:
+                    report.failed.append(item.external_id)
+                templates[index] = []
+                if len(batch) >= batch_size:
+                    flush()
+
+            now = time.monotonic()
+            if progress_interval and now - last_progress >= progress_interval:
+                last_progress = now
+                print(f"[Enrollment] {report.images}/{len(tasks)} görüntü, "
+                      f"{report.enrolled + len(batch)} kişi, "
+                      f"{report.images / (now - start):.1f} görüntü/sn")
+    except KeyboardInterrupt:
+        # Tamamlanmış kişiler yazılır; kalanlar bir sonraki çalışmada işlenir
+        report.interrupted = True
+        for pool in pools:
+            pool.terminate()
+    finally:
+        flush()
+        for pool in pools:
+            pool.close()
+            pool.join()
+        report.elapsed = time.monotonic() - start
+
+    return report
@@ -0,0 +1,272 @@
+import asyncio
+import base64
+import binascii
+import hmac
+import json
+import sqlite3
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from face_access_system.app_logging.metrics import metrics
+from face_access_system.config.settings import (
+    SERVICE_HOST,
+    SERVICE_PORT,
+    SERVICE_MAX_BODY_BYTES,
+    SERVICE_ENROLL_ENABLED,
+    SERVICE_ENROLL_TOKEN,
+)
+from face_access_system.pipeline.analyzer import decision_to_dict
+from face_access_system.pipeline.service import RecognitionService
+
+# Bağımlılıksız (yalnızca asyncio) HTTP/1.1 katmanı. Uç noktalar:
+#   GET  /health              → servis istatistikleri
+#   POST /recognize?door=...  → gövde: ham JPEG/PNG; {"faces": [...]} (door: tanımlı kapılardan biri)
+#   POST /recognize/batch     → {"images": [base64, ...], "door": ...}; {"results": [...]}
+#   POST /enroll              → {"name", "images": [base64], "authorized", "external_id"}
+#                               (SERVICE_ENROLL_ENABLED + "Authorization: Bearer <token>")
+#   GET  /decisions           → NDJSON akışı (chunked), her karar bir satır
+#   GET  /metrics             → Prometheus metni (METRICS_ENABLED açıksa dolu)
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+    404: "Not Found", 405: "Method Not Allowed",
+    409: "Conflict", 411: "Length Required", 413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _Request:
+    def __init__(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        parts       = urlsplit(target)
+        self.method  = method
+        self.path    = parts.path.rstrip("/") or "/"
+        self.query   = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        self.headers = headers
+        self.body    = body
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get("connection", "").lower() != "close"
+
+    def json(self) -> Dict[str, Any]:
+        try:
+            data = json.loads(self.body or b"{}")
+        except ValueError:
+            raise HttpError(400, "Geçersiz JSON")
+        if not isinstance(data, dict):
+            raise HttpError(400, "JSON nesnesi bekleniyor")
+        return data
+
+
+def _decode_images(data: Dict[str, Any]) -> list:
+    images = data.get("images")
+    if not isinstance(images, list) or not images:
+        raise HttpError(400, "images: base64 görüntü listesi gerekli")
+    try:
+        return [base64.b64decode(img, validate=True) for img in images]
+    except (binascii.Error, TypeError):
+        raise HttpError(400, "images: geçersiz base64")
+
+
+class RecognitionHTTPServer:
+    def __init__(
+        self,
+        service: RecognitionService,
+        host: str = SERVICE_HOST,
+        port: int = SERVICE_PORT,
+        max_body: int = SERVICE_MAX_BODY_BYTES,
+        enroll_enabled: bool = SERVICE_ENROLL_ENABLED,
+        enroll_token: str = SERVICE_ENROLL_TOKEN
+    ):
+        self.service  = service
+        self.host     = host
+        self.port     = port
+        self.max_body = max_body
+        # Token'sız kayıt uç noktası açılmaz
+        self.enroll_token = enroll_token if enroll_enabled else ""
+        if enroll_enabled and not enroll_token:
+            print("[Service] ⚠️  /enroll açık ama FAS_ENROLL_TOKEN boş; uç nokta kapalı.")
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        await self.service.start()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # port=0 → işletim sisteminin verdiği port
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"[Service] http://{self.host}:{self.port} dinleniyor.")
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.service.close()
+
+    # ─── HTTP ───────────────────────────────────────
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[_Request]:
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Geçersiz istek satırı")
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        body = b""
+        if method == "POST":
+            if "content-length" not in headers:
+                raise HttpError(411, "Content-Length gerekli")
+            length = int(headers["content-length"])
+            if length > self.max_body:
+                raise HttpError(413, f"Gövde en fazla {self.max_body} bayt olabilir")
+            body = await reader.readexactly(length)
+        return _Request(method, target, headers, body)
+
+    @staticmethod
+    def _response(status: int, payload: Any, keep_alive: bool = True) -> bytes:
+        if isinstance(payload, str):
+            body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), \
+                "application/json; charset=utf-8"
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode("latin-1") + body
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    if request.method == "GET" and request.path == "/decisions":
+                        await self._stream_decisions(writer)
+                        break
+                    status, payload = await self._route(request)
+                    keep_alive = request.keep_alive
+                except HttpError as e:
+                    status, payload, keep_alive = e.status, {"error": str(e)}, False
+                except (asyncio.IncompleteReadError, ValueError) as e:
+                    status, payload, keep_alive = 400, {"error": str(e)}, False
+
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, request: _Request) -> Tuple[int, Any]:
+        routes = {
+            "/health":          ("GET",  self._health),
+            "/metrics":         ("GET",  self._metrics),
+            "/recognize":       ("POST", self._recognize),
+            "/recognize/batch": ("POST", self._recognize_batch),
+            "/enroll":          ("POST", self._enroll),
+        }
+        route = routes.get(request.path)
+        if route is None:
+            raise HttpError(404, f"Bilinmeyen yol: {request.path}")
+        if request.method != route[0]:
+            raise HttpError(405, f"{request.path} yalnızca {route[0]} kabul eder")
+        try:
+            return 200, await route[1](request)
+        except HttpError:
+            raise
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except sqlite3.IntegrityError as e:
+            return 409, {"error": str(e)}
+        except Exception as e:
+            print(f"[Service] {request.path} hatası: {e}")
+            return 500, {"error": "İç hata"}
+
+    # ─── Uç noktalar ────────────────────────────────
+    async def _health(self, request: _Request) -> Dict[str, Any]:
+        return {"status": "ok", "stats": self.service.stats()}
+
+    async def _metrics(self, request: _Request) -> str:
+        return metrics.to_prometheus()
+
+    async def _recognize(self, request: _Request) -> Dict[str, Any]:
+        if not request.body:
+            raise HttpError(400, "Gövde boş: JPEG / PNG bekleniyor")
+        faces = await self.service.recognize(request.body, door=request.query.get("door"))
+        return {"faces": [decision_to_dict(f) for f in faces]}
+
+    async def _recognize_batch(self, request: _Request) -> Dict[str, Any]:
+        data = request.json()
+        results = await self.service.recognize_batch(_decode_images(data), door=data.get("door"))
+        return {"results": [
+            {"error": str(r)} if isinstance(r, BaseException)
+            else {"faces": [decision_to_dict(f) for f in r]}
+            for r in results
+        ]}
+
+    def _check_enroll_auth(self, request: _Request) -> None:
+        if not self.enroll_token:
+            raise HttpError(403, "/enroll kapalı (SERVICE_ENROLL_ENABLED / FAS_ENROLL_TOKEN)")
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(
+                token.strip().encode("utf-8"), self.enroll_token.encode("utf-8")):
+            raise HttpError(401, "Geçersiz ya da eksik kayıt token'ı")
+
+    async def _enroll(self, request: _Request) -> Dict[str, Any]:
+        self._check_enroll_auth(request)
+        data = request.json()
+        # Yetki yalnızca açıkça verilir; "false" gibi metinler kabul edilmez
+        authorized = data.get("authorized", False)
+        if not isinstance(authorized, bool):
+            raise HttpError(400, "authorized: JSON boolean (true / false) olmalı")
+        result = await self.service.enroll(
+            name=str(data.get("name", "")).strip(),
+            images=_decode_images(data),
+            authorized=authorized,
+            external_id=data.get("external_id"),
+        )
+        return {
+            "user_id":     result.user_id,
+            "external_id": result.external_id,
+            "templates":   result.templates,
+            "rejected":    result.rejected,
+        }
+
+    async def _stream_decisions(self, writer: asyncio.StreamWriter) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        await writer.drain()
+        q = self.service.subscribe()
+        try:
+            while True:
+                line = json.dumps(await q.get(), ensure_ascii=False).encode("utf-8") + b"\n"
+                writer.write(f"{len(line):x}\r\n".encode("latin-1") + line + b"\r\n")
+                await writer.drain()
+        finally:
+            self.service.unsubscribe(q)
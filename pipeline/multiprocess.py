@@ -0,0 +1,426 @@
+import multiprocessing as mp
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from face_access_system.config.settings import INFERENCE_RESULT_TIMEOUT_SEC
+from face_access_system.pipeline.analyzer import (
+    DecisionGate,
+    FaceAnalyzer,
+    FaceDecision,
+    FaceResult,
+)
+from face_access_system.pipeline.threaded import FramePacket, StageStats
+
+# Halka tamponu slot durumları
+SLOT_FREE    = 0
+SLOT_PENDING = 1      # Yakalama yazdı; işçi / ana süreç henüz bırakmadı
+
+
+class SharedFrameRing:
+    """
+    Paylaşımlı bellekte sabit boyutlu kare halkası. Her slot (H×W×3) uint8 bir
+    NumPy görünümüdür; süreçler kareyi kopyalamadan aynı sayfalardan okur.
+    Slot durumları ve slottaki görevin sıra numarası ayrı paylaşımlı dizilerde
+    tutulur (kaybolan bir görevin slotu sıra numarasından bulunur).
+    """
+
+    def __init__(
+        self,
+        shape: Tuple[int, int, int],
+        slots: int,
+        name: Optional[str] = None,
+        states=None,
+        seqs=None
+    ):
+        self.shape = tuple(shape)
+        self.slots = slots
+        frame_bytes = int(np.prod(self.shape))
+
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=frame_bytes * slots)
+            self._owner = True
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self._owner = False
+
+        self._frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self._shm.buf)
+        self.states = states if states is not None else mp.Array("b", slots, lock=False)
+        self.seqs   = seqs if seqs is not None else mp.Array("q", slots, lock=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def view(self, slot: int) -> np.ndarray:
+        return self._frames[slot]
+
+    def acquire(self, start: int) -> Optional[int]:
+        # Yalnızca yakalama süreci yazar → boş slot aramak için kilit gerekmez
+        for offset in range(self.slots):
+            slot = (start + offset) % self.slots
+            if self.states[slot] == SLOT_FREE:
+                return slot
+        return None
+
+    def release(self, slot: int) -> None:
+        self.states[slot] = SLOT_FREE
+
+    def pending_slot(self, seq: int) -> Optional[int]:
+        """seq numaralı görevi tutan (henüz bırakılmamış) slot; yoksa None."""
+        for slot in range(self.slots):
+            if self.states[slot] == SLOT_PENDING and self.seqs[slot] == seq:
+                return slot
+        return None
+
+    def close(self) -> None:
+        self._frames = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+@dataclass
+class FrameTask:
+    seq:         int          # Dağıtılan kareler için ardışık sıra numarası
+    frame_id:    int
+    slot:        int
+    captured_at: float
+
+
+@dataclass
+class FrameResult:
+    seq:         int
+    frame_id:    int
+    slot:        int
+    captured_at: float
+    faces:       Optional[List[FaceResult]]   # None → işçide hata
+    worker_id:   int
+    latency:     float
+
+
+# ─── Alt süreç giriş noktaları (spawn ile import edilebilir olmalı) ─────
+def _capture_main(
+    source: Union[int, str],
+    ring_name: str,
+    shape: Tuple[int, int, int],
+    slots: int,
+    states,
+    seqs,
+    tasks: "mp.Queue",
+    stop: "mp.Event",
+    dropped: "mp.Value",
+    captured: "mp.Value",
+    process_every_n: int
+) -> None:
+    ring = SharedFrameRing(shape, slots, name=ring_name, states=states, seqs=seqs)
+    cap = cv2.VideoCapture(source)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, shape[1])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, shape[0])
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    frame_id, seq, next_slot = 0, 0, 0
+    try:
+        while not stop.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                break
+            captured.value += 1
+
+            if frame_id % process_every_n == 0:
+                slot = ring.acquire(next_slot)
+                if slot is None:
+                    # Tüm slotlar işlemde → bu kare bayatlamadan atılır
+                    dropped.value += 1
+                else:
+                    view = ring.view(slot)
+                    if frame.shape != view.shape:
+                        frame = cv2.resize(frame, (shape[1], shape[0]))
+                    view[...] = frame
+                    ring.seqs[slot] = seq
+                    ring.states[slot] = SLOT_PENDING
+                    tasks.put(FrameTask(seq, frame_id, slot, time.monotonic()))
+                    seq += 1
+                    next_slot = (slot + 1) % slots
+            frame_id += 1
+    finally:
+        cap.release()
+        ring.close()
+        stop.set()
+
+
+def _worker_main(
+    worker_id: int,
+    ring_name: str,
+    shape: Tuple[int, int, int],
+    slots: int,
+    states,
+    seqs,
+    tasks: "mp.Queue",
+    results: "mp.Queue",
+    scale_factor: float
+) -> None:
+    # Her işçi tek çekirdek kullansın; paralellik süreç sayısından gelir
+    cv2.setNumThreads(1)
+
+    from face_access_system.recognition.recognizer import FaceRecognizer
+    from face_access_system.vision.embedding_extractor import EmbeddingExtractor
+    from face_access_system.vision.face_detector import FaceDetector
+
+    ring = SharedFrameRing(shape, slots, name=ring_name, states=states, seqs=seqs)
+    # İz takibi yok: kareler işçilere dağıtıldığı için tek bir işçi ardışık
+    # kareleri görmez, iz durumu süreçler arasında paylaşılmaz
+    analyzer = FaceAnalyzer(FaceDetector(), EmbeddingExtractor(), FaceRecognizer(),
+                            scale_factor=scale_factor)
+
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+
+            start = time.monotonic()
+            try:
+                faces = analyzer.analyze(ring.view(task.slot), task.captured_at)
+            except Exception as e:
+                print(f"[Worker-{worker_id}] Çıkarım hatası (kare {task.frame_id}): {e}")
+                faces = None
+
+            results.put(FrameResult(task.seq, task.frame_id, task.slot, task.captured_at,
+                                    faces, worker_id, time.monotonic() - start))
+    finally:
+        analyzer.recognizer.close()
+        ring.close()
+
+
+class MultiProcessPipeline:
+    """
+    Yakalama ayrı bir süreçte paylaşımlı halka tampona yazar; N işçi süreci
+    (her biri kendi FaceDetector / EmbeddingExtractor / FaceRecognizer örneğiyle)
+    kareleri halkadan kopyasız okur. Sonuçlar ana süreçte kare sırasına göre
+    yeniden dizilir, karar/log tek yerde (DecisionGate) verilir.
+
+    Arayüz ThreadedPipeline ile aynıdır; ekran yalnızca işlenmiş kareleri,
+    kendi sonuçlarıyla birlikte gösterir. Bu kipte iz takibi (TRACKING_ENABLED)
+    kullanılmaz; her analiz edilen karede tüm yüzler tanınır.
+
+    Bir işçi çökerse elindeki kare kaybolur: sıradaki kare result_timeout
+    saniyede gelmezse atlanır, slotu serbest bırakılır ve sıralama devam eder
+    (geç gelen sonuç yok sayılır). Ölen işçi aynı numarayla yeniden başlatılır.
+    """
+
+    def __init__(
+        self,
+        source: Union[int, str],
+        gate: DecisionGate,
+        workers: int,
+        frame_shape: Tuple[int, int, int],
+        scale_factor: float = 0.5,
+        process_every_n: int = 1,
+        slots_per_worker: int = 2,
+        result_timeout: float = INFERENCE_RESULT_TIMEOUT_SEC
+    ):
+        self.source          = source
+        self.gate            = gate
+        self.n_workers       = max(1, workers)
+        self.frame_shape     = tuple(frame_shape)
+        self.scale_factor    = scale_factor
+        self.process_every_n = max(1, process_every_n)
+        self.slots           = self.n_workers * slots_per_worker + 1
+        self.result_timeout  = result_timeout
+
+        self._ctx = mp.get_context("spawn")
+        self._ring: Optional[SharedFrameRing] = None
+        self._ring_args: tuple = ()
+        self._processes: List[mp.Process] = []
+        self._collector: Optional[threading.Thread] = None
+
+        self._stop     = self._ctx.Event()
+        self._tasks    = self._ctx.Queue()
+        self._results  = self._ctx.Queue()
+        self._dropped  = self._ctx.Value("q", 0, lock=False)
+        self._captured = self._ctx.Value("q", 0, lock=False)
+
+        self._latest_frame: Optional[FramePacket] = None
+        self._latest_faces: List[FaceDecision] = []
+        self._reorder: Dict[int, FrameResult] = {}
+
+        self._worker_stats   = [StageStats(f"worker-{i}") for i in range(self.n_workers)]
+        self._inference_stats = StageStats("inference")
+        self._decision_stats = StageStats("decision")
+        self._e2e_stats      = StageStats("end_to_end")
+        self._failed = 0
+        self._lost = 0          # İşçi çöktüğü / zaman aşımına uğradığı için atlanan kare
+        self._deaths = 0        # Beklenmedik şekilde kapanan işçi
+        self._dead_pids: set = set()
+
+    # ─── Yaşam döngüsü ──────────────────────────────
+    def start(self) -> None:
+        states = self._ctx.Array("b", self.slots, lock=False)
+        seqs = self._ctx.Array("q", self.slots, lock=False)
+        self._ring = SharedFrameRing(self.frame_shape, self.slots, states=states, seqs=seqs)
+        ring_args = self._ring_args = (self._ring.name, self.frame_shape, self.slots, states, seqs)
+
+        for worker_id in range(self.n_workers):
+            self._processes.append(self._worker_process(worker_id))
+        self._processes.append(self._ctx.Process(
+            target=_capture_main,
+            args=(self.source,) + ring_args + (self._tasks, self._stop, self._dropped,
+                                               self._captured, self.process_every_n),
+            name="capture", daemon=True,
+        ))
+        for process in self._processes:
+            process.start()
+
+        self._collector = threading.Thread(target=self._collect_loop, name="collector", daemon=True)
+        self._collector.start()
+
+    def _worker_process(self, worker_id: int) -> mp.Process:
+        return self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id,) + self._ring_args + (self._tasks, self._results, self.scale_factor),
+            name=f"inference-{worker_id}", daemon=True,
+        )
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        for _ in range(self.n_workers):
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+        if self._collector is not None:
+            self._collector.join(timeout=timeout)
+        self._processes = []
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+
+    @property
+    def is_running(self) -> bool:
+        # Kaynak bittiğinde bekleyen tüm sonuçlar boşaltılana kadar çalışır sayılır
+        return not self._stop.is_set() or (self._collector is not None and self._collector.is_alive())
+
+    # ─── Ekran tarafı ───────────────────────────────
+    def latest_frame(self) -> Optional[FramePacket]:
+        return self._latest_frame
+
+    def latest_faces(self) -> List[FaceDecision]:
+        return self._latest_faces
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        stats = {
+            "capture":    {"processed": self._captured.value, "dropped": self._dropped.value},
+            "inference":  self._inference_stats.as_dict(),
+            "decision":   self._decision_stats.as_dict(),
+            "end_to_end": self._e2e_stats.as_dict(),
+        }
+        stats["inference"].update(queue_depth=self._tasks.qsize(), failed=self._failed,
+                                  lost=self._lost, worker_deaths=self._deaths,
+                                  reorder_depth=len(self._reorder))
+        for s in self._worker_stats:
+            stats[s.name] = s.as_dict()
+        return stats
+
+    def format_stats(self) -> str:
+        s = self.stats()
+        workers = " ".join(f"{w.processed}" for w in self._worker_stats)
+        return (
+            f"capture: {s['capture']['processed']} kare, drop={s['capture']['dropped']} | "
+            f"inference: {s['inference']['latency_ms']:.1f}ms q={s['inference']['queue_depth']} "
+            f"reorder={s['inference']['reorder_depth']} lost={s['inference']['lost']} "
+            f"workers=[{workers}] | "
+            f"decision: {s['decision']['latency_ms']:.1f}ms | "
+            f"end_to_end: {s['end_to_end']['latency_ms']:.1f}ms"
+        )
+
+    # ─── Sonuç toplama (ana süreç) ──────────────────
+    def _collect_loop(self) -> None:
+        next_seq = 0
+        waiting_since = time.monotonic()    # Sıradaki karenin beklenmeye başlandığı an
+        while True:
+            try:
+                result: Optional[FrameResult] = self._results.get(timeout=0.1)
+            except queue.Empty:
+                result = None
+
+            if result is None:
+                self._check_workers()
+                # Kaynak bitti ve işlenmeyi bekleyen görev kalmadıysa (ya da
+                # işçiler kapandıysa) çık
+                workers = self._processes[:self.n_workers]
+                if self._stop.is_set() and (
+                    (self._tasks.empty() and self._all_slots_free())
+                    or not any(p.is_alive() for p in workers)
+                ):
+                    break
+            elif result.seq < next_seq:
+                # Zaman aşımıyla atlanmış karenin geç sonucu; slotu zaten bırakıldı
+                continue
+            else:
+                self._inference_stats.record(result.latency)
+                self._worker_stats[result.worker_id].record(result.latency)
+                self._reorder[result.seq] = result
+
+            # Sıradaki kare çok uzun süredir gelmiyorsa ve kaybolduğuna dair
+            # kanıt varsa (sonraki kareler bitti ya da bir işçi öldü) atlanır;
+            # aksi halde sonraki tüm kararlar bekler. Yalnızca yavaş başlayan
+            # işçiler (model yükleme) kareyi kayıp saydırmaz.
+            if (next_seq not in self._reorder and (self._reorder or self._deaths)
+                    and time.monotonic() - waiting_since > self.result_timeout):
+                slot = self._ring.pending_slot(next_seq)
+                if slot is not None or self._reorder:
+                    if slot is not None:
+                        self._ring.release(slot)
+                    self._lost += 1
+                    print(f"[MultiProcess] Kare #{next_seq} sonucu {self.result_timeout:.1f} sn'de "
+                          f"gelmedi, atlanıyor.")
+                    next_seq += 1
+                    waiting_since = time.monotonic()
+
+            while next_seq in self._reorder:
+                self._emit(self._reorder.pop(next_seq))
+                next_seq += 1
+                waiting_since = time.monotonic()
+
+    def _check_workers(self) -> None:
+        """Ölen işçileri sayar; kaynak sürerken aynı numarayla yeniden başlatır."""
+        for worker_id in range(self.n_workers):
+            process = self._processes[worker_id]
+            if process.is_alive() or process.exitcode in (None, 0) or process.pid in self._dead_pids:
+                continue
+            self._dead_pids.add(process.pid)
+            self._deaths += 1
+            print(f"[MultiProcess] İşçi {worker_id} beklenmedik şekilde kapandı "
+                  f"(çıkış kodu {process.exitcode}).")
+            if self._stop.is_set():
+                continue
+            process = self._worker_process(worker_id)
+            process.start()
+            self._processes[worker_id] = process
+
+    def _all_slots_free(self) -> bool:
+        return all(state == SLOT_FREE for state in self._ring.states)
+
+    def _emit(self, result: FrameResult) -> None:
+        frame = self._ring.view(result.slot).copy()
+        self._ring.release(result.slot)
+
+        if result.faces is None:
+            self._failed += 1
+            decisions: List[FaceDecision] = []
+        else:
+            start = time.monotonic()
+            decisions = self.gate.decide_all(result.faces)
+            self._decision_stats.record(time.monotonic() - start)
+
+        self._e2e_stats.record(time.monotonic() - result.captured_at)
+        self._latest_faces = decisions
+        self._latest_frame = FramePacket(result.frame_id, result.captured_at, frame)
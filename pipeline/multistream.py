@@ -0,0 +1,427 @@
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import cv2
+
+from face_access_system.app_logging.access_logger import AccessLogger
+from face_access_system.app_logging.log_writer import AccessLogWriter
+from face_access_system.config.settings import (
+    FRAME_WIDTH,
+    FRAME_HEIGHT,
+    MOTION_GATING_ENABLED,
+    TRACKING_ENABLED,
+    STREAMS,
+    STREAMS_CONFIG_PATH,
+    MULTISTREAM_DETECT_WORKERS,
+    MULTISTREAM_EMBED_BATCH,
+    MULTISTREAM_BATCH_WAIT_MS,
+)
+from face_access_system.pipeline.analyzer import (
+    AnalysisJob,
+    DecisionGate,
+    FaceAnalyzer,
+    FaceDecision,
+    recognize_faces,
+)
+from face_access_system.pipeline.scheduler import AdaptiveScheduler
+from face_access_system.pipeline.threaded import FramePacket, StageStats
+from face_access_system.recognition.recognizer import FaceRecognizer
+from face_access_system.vision.embedding_extractor import EmbeddingExtractor
+from face_access_system.vision.face_detector import FaceDetector
+from face_access_system.vision.tracker import FaceTracker
+
+
+# ─── Yapılandırma ──────────────────────────────────
+@dataclass
+class StreamConfig:
+    door:   str                     # access_logs.door; akışın adı
+    source: Union[int, str]         # Kamera indeksi, RTSP adresi ya da video dosyası
+    width:  int = FRAME_WIDTH
+    height: int = FRAME_HEIGHT
+    process_every_n: int = 3        # Hareket kapısı kapalıysa
+    scale_factor:    float = 0.5
+    motion:   bool = MOTION_GATING_ENABLED
+    tracking: bool = TRACKING_ENABLED
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StreamConfig":
+        unknown = set(data) - set(cls.__dataclass_fields__)
+        if unknown:
+            raise ValueError(f"Bilinmeyen akış ayarı: {sorted(unknown)}")
+        return cls(**data)
+
+
+def load_stream_configs(path: Optional[str] = None) -> List[StreamConfig]:
+    """
+    Öncelik: verilen dosya → STREAMS_CONFIG_PATH (varsa) → settings.STREAMS.
+    Dosya biçimi: [{"door": "lobi", "source": 0}, {"door": "otopark", "source": "rtsp://..."}]
+    """
+    path = path or (STREAMS_CONFIG_PATH if os.path.exists(STREAMS_CONFIG_PATH) else None)
+    if path is not None:
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+    else:
+        entries = STREAMS
+
+    configs = [StreamConfig.from_dict(entry) for entry in entries]
+    doors = [c.door for c in configs]
+    if len(set(doors)) != len(doors):
+        raise ValueError(f"Akış adları (door) benzersiz olmalı: {doors}")
+    return configs
+
+
+class RateMeter:
+    """Olay sayacı; rate() son çağrıdan bu yana saniye başına olay sayısını verir."""
+
+    def __init__(self):
+        self.count = 0
+        self._last_count = 0
+        self._last_time = time.monotonic()
+
+    def tick(self) -> None:
+        self.count += 1
+
+    def rate(self) -> float:
+        now = time.monotonic()
+        elapsed = now - self._last_time
+        rate = (self.count - self._last_count) / elapsed if elapsed > 0 else 0.0
+        self._last_count, self._last_time = self.count, now
+        return rate
+
+
+# ─── Akış durumu ───────────────────────────────────
+class _Stream:
+    """Bir kameranın yakalama iş parçacığı, izleyicisi, zamanlayıcısı ve kapısı."""
+
+    def __init__(self, index: int, config: StreamConfig, analyzer: FaceAnalyzer,
+                 gate: DecisionGate, scheduler: Optional[AdaptiveScheduler]):
+        self.index     = index
+        self.config    = config
+        self.analyzer  = analyzer
+        self.gate      = gate
+        self.scheduler = scheduler
+        self.cap       = None
+
+        # Analiz bekleyen en yeni kare (eskisinin üzerine yazılır) ve akışın
+        # işlemde bir karesi olup olmadığı → akış başına en fazla bir kare
+        self.pending:   Optional[FramePacket] = None
+        self.in_flight = False
+        self.ended     = False
+
+        self.latest_frame: Optional[FramePacket] = None
+        self.latest_faces: List[FaceDecision] = []
+
+        self.captured = RateMeter()
+        self.analyzed = RateMeter()
+        self.dropped  = 0
+        self.decision_stats = StageStats(f"{config.door}-decision")
+
+    def _is_file(self) -> bool:
+        return isinstance(self.config.source, str) and os.path.exists(self.config.source)
+
+
+@dataclass
+class _Work:
+    stream:   _Stream
+    packet:   FramePacket
+    job:      AnalysisJob
+    started:  float
+
+
+class MultiStreamServer:
+    """
+    N kamerayı tek süreçte, tek tanıyıcı (tek galeri) ve tek log yazıcısıyla işler.
+
+      • Her akışın kendi yakalama iş parçacığı en yeni kareyi tutar (eskisi atılır).
+      • Algılama iş parçacıkları (kendi FaceDetector'larıyla) sıradaki akışı
+        round-robin seçer; bir akışın aynı anda en fazla bir karesi işlemdedir,
+        bu yüzden kalabalık bir kapı diğerlerini aç bırakamaz.
+      • Tek embedding iş parçacığı farklı akışlardan gelen yüzleri
+        MULTISTREAM_EMBED_BATCH'e ya da MULTISTREAM_BATCH_WAIT_MS'ye kadar
+        toplayıp tek extract_batch + tek recognize_batch çağrısıyla işler;
+        sonuçlar akışların kendi izleyicisine ve DecisionGate'ine dağıtılır.
+    Akış başına yakalama / analiz FPS'i ve karar gecikmesi (yakalama → karar)
+    stats() ile raporlanır.
+    """
+
+    def __init__(
+        self,
+        configs: List[StreamConfig],
+        recognizer: Optional[FaceRecognizer] = None,
+        extractor: Optional[EmbeddingExtractor] = None,
+        detect_workers: int = MULTISTREAM_DETECT_WORKERS,
+        embed_batch: int = MULTISTREAM_EMBED_BATCH,
+        batch_wait_ms: float = MULTISTREAM_BATCH_WAIT_MS,
+        cooldown_sec: float = 3.0,
+        writer: Optional[AccessLogWriter] = None
+    ):
+        if not configs:
+            raise ValueError("En az bir akış gerekli")
+
+        self.recognizer     = recognizer if recognizer is not None else FaceRecognizer()
+        self.extractor      = extractor if extractor is not None else EmbeddingExtractor()
+        self.detect_workers = max(1, detect_workers)
+        self.embed_batch    = max(1, embed_batch)
+        self.batch_wait     = batch_wait_ms / 1e3
+        self.writer         = writer if writer is not None else AccessLogWriter()
+
+        self.streams: List[_Stream] = []
+        for i, config in enumerate(configs):
+            analyzer = FaceAnalyzer(None, self.extractor, self.recognizer,
+                                    scale_factor=config.scale_factor,
+                                    tracker=FaceTracker() if config.tracking else None)
+            gate = DecisionGate(AccessLogger(writer=self.writer, door=config.door),
+                                cooldown_sec=cooldown_sec)
+            scheduler = (AdaptiveScheduler(interval=config.process_every_n, scale=config.scale_factor)
+                         if config.motion else None)
+            self.streams.append(_Stream(i, config, analyzer, gate, scheduler))
+
+        self._cond = threading.Condition()
+        self._next = 0                       # Round-robin imleci
+        self._work: "queue.Queue[_Work]" = queue.Queue()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._detect_threads: List[threading.Thread] = []
+
+        self._detect_stats = StageStats("detect")
+        self._embed_stats  = StageStats("embed")
+        self._batch_faces  = 0
+        self._batches      = 0
+
+    # ─── Yaşam döngüsü ──────────────────────────────
+    def start(self) -> None:
+        self._stop.clear()
+        for stream in self.streams:
+            cap = cv2.VideoCapture(stream.config.source)
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, stream.config.width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, stream.config.height)
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            if not cap.isOpened():
+                print(f"[MultiStream] ⚠️  {stream.config.door}: kaynak açılamadı ({stream.config.source})")
+            stream.cap = cap
+            self._spawn(f"capture-{stream.config.door}", self._capture_loop, stream)
+
+        self._detect_threads = [self._spawn(f"detect-{i}", self._detect_loop)
+                                for i in range(self.detect_workers)]
+        self._spawn("embed", self._embed_loop)
+
+    def _spawn(self, name: str, target, *args) -> threading.Thread:
+        thread = threading.Thread(target=target, args=args, name=f"multistream-{name}", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        return thread
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        for thread in self._threads:
+            # Embedding / karar aşaması algılanmış tüm işleri karara bağlamadan
+            # çıkmaz; ortak yazıcı ancak ondan sonra kapatılır
+            thread.join(timeout=None if thread.name == "multistream-embed" else timeout)
+        self._threads = []
+        self._detect_threads = []
+        for stream in self.streams:
+            if stream.cap is not None:
+                stream.cap.release()
+        # Her akışın AccessLogger'ı kapatılır (denetim log dinleyicisi referans
+        # sayılır); ortak yazıcı ilk kapanışta boşaltılır
+        for stream in self.streams:
+            stream.gate.logger.close()
+        self.writer.close()
+        self.recognizer.close()
+
+    @property
+    def is_running(self) -> bool:
+        return not self._stop.is_set() and not all(s.ended for s in self.streams)
+
+    # ─── Yakalama ───────────────────────────────────
+    def _capture_loop(self, stream: _Stream) -> None:
+        # Video dosyaları kendi FPS'inde oynatılır; canlı kaynaklar zaten kendi hızında
+        pace = 0.0
+        if stream._is_file():
+            fps = stream.cap.get(cv2.CAP_PROP_FPS)
+            pace = 1.0 / fps if fps and fps > 0 else 0.0
+
+        frame_id, next_due = 0, time.monotonic()
+        while not self._stop.is_set():
+            ret, frame = stream.cap.read()
+            if not ret:
+                break
+            now = time.monotonic()
+            stream.captured.tick()
+            packet = FramePacket(frame_id=frame_id, captured_at=now, frame=frame)
+            stream.latest_frame = packet
+
+            if stream.scheduler is not None:
+                packet.plan = stream.scheduler.plan(frame, now)
+                wanted = packet.plan is not None
+            else:
+                wanted = frame_id % max(1, stream.config.process_every_n) == 0
+
+            if wanted:
+                with self._cond:
+                    if stream.pending is not None:
+                        stream.dropped += 1
+                    stream.pending = packet
+                    self._cond.notify()
+            frame_id += 1
+
+            if pace:
+                next_due = max(next_due + pace, now - pace)
+                time.sleep(max(0.0, next_due - time.monotonic()))
+
+        stream.ended = True
+        print(f"[MultiStream] {stream.config.door}: akış bitti.")
+
+    # ─── Algılama (adil sıra) ───────────────────────
+    def _take_next(self) -> Optional[Tuple[_Stream, FramePacket]]:
+        """Koşul kilidi altında: round-robin sırada ilk hazır akışın karesini alır."""
+        n = len(self.streams)
+        for offset in range(n):
+            stream = self.streams[(self._next + offset) % n]
+            if stream.pending is not None and not stream.in_flight:
+                self._next = (stream.index + 1) % n
+                packet, stream.pending = stream.pending, None
+                stream.in_flight = True
+                return stream, packet
+        return None
+
+    def _detect_loop(self) -> None:
+        # Her algılama iş parçacığının kendi modeli (dlib nesneleri paylaşılmaz)
+        detector = FaceDetector()
+        while not self._stop.is_set():
+            with self._cond:
+                item = self._take_next()
+                while item is None and not self._stop.is_set():
+                    self._cond.wait(timeout=0.1)
+                    item = self._take_next()
+            if item is None:
+                return
+
+            stream, packet = item
+            start = time.monotonic()
+            plan = packet.plan
+            try:
+                job = stream.analyzer.prepare(
+                    packet.frame, packet.captured_at,
+                    rois=plan.rois if plan else None, scale=plan.scale if plan else None,
+                    detector=detector,
+                )
+            except Exception as e:
+                print(f"[MultiStream] {stream.config.door}: algılama hatası (kare {packet.frame_id}): {e}")
+                self._release(stream)
+                continue
+            self._detect_stats.record(time.monotonic() - start)
+            self._work.put(_Work(stream, packet, job, start))
+
+    def _release(self, stream: _Stream) -> None:
+        with self._cond:
+            stream.in_flight = False
+            self._cond.notify()
+
+    # ─── Akışlar arası embedding + karar ────────────
+    def _collect(self) -> List[_Work]:
+        try:
+            batch = [self._work.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        faces = len(batch[0].job.pending)
+        deadline = time.monotonic() + self.batch_wait
+
+        # Diğer akışların algılaması bitmek üzereyse kısa süre beklemek, her
+        # akış için ayrı model çağrısından ucuzdur
+        while faces < self.embed_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                work = self._work.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(work)
+            faces += len(work.job.pending)
+        return batch
+
+    def _embed_loop(self) -> None:
+        # Durdurulunca da algılama iş parçacıkları bitip kuyruk boşalana kadar sürer
+        while True:
+            batch = self._collect()
+            if not batch:
+                if self._stop.is_set() and not any(t.is_alive() for t in self._detect_threads):
+                    return
+                continue
+
+            crops = [crop for work in batch for crop in work.job.crops]
+            start = time.monotonic()
+            try:
+                results = recognize_faces(self.extractor, self.recognizer, crops)
+            except Exception as e:
+                print(f"[MultiStream] Embedding hatası ({len(crops)} yüz): {e}")
+                results = [None] * len(crops)
+            if crops:
+                self._embed_stats.record(time.monotonic() - start)
+                self._batch_faces += len(crops)
+                self._batches += 1
+
+            offset = 0
+            for work in batch:
+                stream, k = work.stream, len(work.job.pending)
+                try:
+                    faces = stream.analyzer.finish(work.job, results[offset:offset + k])
+                    stream.latest_faces = stream.gate.decide_all(faces)
+                    now = time.monotonic()
+                    stream.decision_stats.record(now - work.packet.captured_at)
+                    stream.analyzed.tick()
+                    if stream.scheduler is not None:
+                        stream.scheduler.observe(now - work.started, [f.coords for f in faces],
+                                                 work.packet.captured_at)
+                except Exception as e:
+                    print(f"[MultiStream] {stream.config.door}: karar hatası: {e}")
+                finally:
+                    offset += k
+                    self._release(stream)
+
+    # ─── Raporlama ──────────────────────────────────
+    def latest(self, door: str) -> Tuple[Optional[FramePacket], List[FaceDecision]]:
+        for stream in self.streams:
+            if stream.config.door == door:
+                return stream.latest_frame, stream.latest_faces
+        raise KeyError(door)
+
+    def stats(self) -> Dict[str, Any]:
+        streams = {}
+        for stream in self.streams:
+            decision = stream.decision_stats.as_dict()
+            streams[stream.config.door] = {
+                "capture_fps":  round(stream.captured.rate(), 1),
+                "analyzed_fps": round(stream.analyzed.rate(), 1),
+                "decision_ms":  decision["latency_ms"],
+                "decision_max_ms": decision["latency_max_ms"],
+                "dropped":      stream.dropped,
+                "ended":        stream.ended,
+            }
+        return {
+            "streams": streams,
+            "detect":  self._detect_stats.as_dict(),
+            "embed":   dict(self._embed_stats.as_dict(),
+                            avg_batch=round(self._batch_faces / max(self._batches, 1), 2)),
+            "log_writer": self.writer.stats(),
+        }
+
+    def format_stats(self) -> str:
+        stats = self.stats()
+        parts = [
+            f"{door}: {s['capture_fps']:.1f}/{s['analyzed_fps']:.1f} fps "
+            f"karar {s['decision_ms']:.0f}ms (max {s['decision_max_ms']:.0f}) drop={s['dropped']}"
+            for door, s in stats["streams"].items()
+        ]
+        embed = stats["embed"]
+        parts.append(f"detect {stats['detect']['latency_ms']:.1f}ms | "
+                     f"embed {embed['latency_ms']:.1f}ms × {embed['avg_batch']} yüz/batch")
+        return " | ".join(parts)
@@ -0,0 +1,265 @@
+import json
+import multiprocessing as mp
+import os
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, IO, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from face_access_system.config.settings import TRACKING_ENABLED
+from face_access_system.pipeline.analyzer import (
+    FaceAnalyzer,
+    FaceDecision,
+    classify,
+    decision_to_dict,
+    recognize_faces,
+)
+from face_access_system.vision.tracker import FaceTracker
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+# Rapor sırası
+STAGES = ("decode", "detect", "embed", "decide")
+
+
+@dataclass
+class ReplayConfig:
+    scale_factor:  float = 0.5
+    every_n:       int = 1              # Her N karede bir analiz (1 = tüm kareler)
+    tracking:      bool = TRACKING_ENABLED
+    sequence_fps:  float = 30.0         # Görüntü dizilerinin zaman damgası için
+    faces_only:    bool = False         # Yüzsüz kareleri NDJSON'a yazma
+
+
+@dataclass
+class Segment:
+    source: str
+    start:  int                         # Dahil
+    end:    Optional[int]               # Hariç; None → kaynağın sonuna kadar
+
+
+@dataclass
+class ReplayReport:
+    frames:    int = 0                  # Okunan kare
+    analyzed:  int = 0
+    faces:     int = 0
+    stage_sec: Dict[str, float] = field(default_factory=lambda: {s: 0.0 for s in STAGES})
+    elapsed:   float = 0.0              # Duvar saati (tüm işçiler)
+    segments:  int = 0
+
+    def merge(self, other: "ReplayReport") -> None:
+        self.frames   += other.frames
+        self.analyzed += other.analyzed
+        self.faces    += other.faces
+        for stage, sec in other.stage_sec.items():
+            self.stage_sec[stage] += sec
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.elapsed if self.elapsed > 0 else 0.0
+
+    def stage_ms_per_frame(self) -> Dict[str, float]:
+        # decode tüm kareler için, diğerleri yalnızca analiz edilen kareler için
+        return {
+            stage: sec * 1e3 / max(self.frames if stage == "decode" else self.analyzed, 1)
+            for stage, sec in self.stage_sec.items()
+        }
+
+
+# ─── Kaynaklar ─────────────────────────────────────
+def _is_image(path: str) -> bool:
+    return path.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def _sequence(path: str) -> List[str]:
+    return sorted(os.path.join(path, f) for f in os.listdir(path) if _is_image(f))
+
+
+def frame_count(source: str) -> Optional[int]:
+    """Dizin → görüntü sayısı; video → başlıktaki kare sayısı (bilinmiyorsa None)."""
+    if os.path.isdir(source):
+        return len(_sequence(source))
+    cap = cv2.VideoCapture(source)
+    try:
+        n = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    finally:
+        cap.release()
+    return n if n > 0 else None
+
+
+def split_segments(sources: List[str], parts: int) -> List[Segment]:
+    """
+    Kaynakları toplamda ~parts eşit kare aralığına böler (kaynak sırası
+    korunur). Kare sayısı bilinmeyen videolar bölünmez.
+    """
+    counts = {source: frame_count(source) for source in sources}
+    total = sum(n for n in counts.values() if n)
+    target = max(1, -(-total // max(1, parts)))
+
+    segments: List[Segment] = []
+    for source in sources:
+        n = counts[source]
+        if not n:
+            segments.append(Segment(source, 0, None))
+            continue
+        for start in range(0, n, target):
+            segments.append(Segment(source, start, min(start + target, n)))
+    return segments
+
+
+def iter_frames(segment: Segment, sequence_fps: float) -> Iterator[Tuple[int, float, Optional[np.ndarray]]]:
+    """(kare no, kaynak zamanı sn, kare) — zaman damgası kaynaktan gelir, deterministiktir."""
+    if os.path.isdir(segment.source):
+        for index, path in enumerate(_sequence(segment.source)[segment.start:segment.end], segment.start):
+            yield index, index / sequence_fps, cv2.imread(path)
+        return
+
+    cap = cv2.VideoCapture(segment.source)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or sequence_fps
+        if segment.start:
+            # Konumlandırma kodeğe göre kayabilir; tutmazsa kareler atlanarak ilerlenir
+            cap.set(cv2.CAP_PROP_POS_FRAMES, segment.start)
+            if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != segment.start:
+                cap.release()
+                cap = cv2.VideoCapture(segment.source)
+                for _ in range(segment.start):
+                    cap.grab()
+
+        index = segment.start
+        while segment.end is None or index < segment.end:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield index, index / fps, frame
+            index += 1
+    finally:
+        cap.release()
+
+
+# ─── İşleme ────────────────────────────────────────
+_models = None      # (detector, extractor, recognizer) — süreç başına bir kez
+
+
+def _init_worker() -> None:
+    global _models
+    # Her işçi tek çekirdek; paralellik süreç sayısından gelir
+    cv2.setNumThreads(1)
+
+    from face_access_system.recognition.recognizer import FaceRecognizer
+    from face_access_system.vision.embedding_extractor import EmbeddingExtractor
+    from face_access_system.vision.face_detector import FaceDetector
+
+    _models = (FaceDetector(), EmbeddingExtractor(), FaceRecognizer())
+
+
+def _init_pool_worker() -> None:
+    # NDJSON stdout'a yazılıyor olabilir; işçi mesajları stderr'e
+    sys.stdout = sys.stderr
+    _init_worker()
+
+
+def process_segment(segment: Segment, config: ReplayConfig, out: IO[str]) -> ReplayReport:
+    """
+    Bir kare aralığını ekransız, bekleme olmadan işler; analiz edilen her kare
+    için bir NDJSON satırı yazar. Kararlar loglanmaz (veritabanına dokunulmaz)
+    ve zaman damgaları kaynaktan geldiği için aynı girdi aynı çıktıyı verir.
+    """
+    if _models is None:
+        _init_worker()
+    detector, extractor, recognizer = _models
+    # İz durumu segment başında sıfırdan başlar
+    analyzer = FaceAnalyzer(detector, extractor, recognizer, scale_factor=config.scale_factor,
+                            tracker=FaceTracker() if config.tracking else None)
+    report = ReplayReport(segments=1)
+    name = os.path.basename(os.path.normpath(segment.source))
+    clock = time.perf_counter
+
+    frames = iter_frames(segment, config.sequence_fps)
+    while True:
+        t0 = clock()
+        item = next(frames, None)
+        t1 = clock()
+        report.stage_sec["decode"] += t1 - t0
+        if item is None:
+            break
+        index, ts, frame = item
+        report.frames += 1
+        if frame is None or index % max(1, config.every_n):
+            continue
+
+        job = analyzer.prepare(frame, ts)
+        t2 = clock()
+        results = recognize_faces(extractor, recognizer, job.crops)
+        t3 = clock()
+        faces = analyzer.finish(job, results)
+        decisions = [
+            FaceDecision(coords=f.coords, decision=classify(f.result), track_id=f.track_id)
+            for f in faces
+        ]
+        if decisions or not config.faces_only:
+            out.write(json.dumps({
+                "source": name, "frame": index, "t": round(ts, 4),
+                "faces": [decision_to_dict(d) for d in decisions],
+            }, ensure_ascii=False) + "\n")
+        t4 = clock()
+
+        report.analyzed += 1
+        report.faces += len(faces)
+        report.stage_sec["detect"] += t2 - t1
+        report.stage_sec["embed"]  += t3 - t2
+        report.stage_sec["decide"] += t4 - t3
+
+    return report
+
+
+def _process_to_file(task: Tuple[int, Segment, ReplayConfig, str]) -> Tuple[int, str, ReplayReport]:
+    i, segment, config, tmp_dir = task
+    path = os.path.join(tmp_dir, f"{i:06d}.ndjson")
+    with open(path, "w", encoding="utf-8") as out:
+        report = process_segment(segment, config, out)
+    return i, path, report
+
+
+def run_replay(
+    sources: List[str],
+    out: IO[str],
+    config: Optional[ReplayConfig] = None,
+    workers: int = 1
+) -> ReplayReport:
+    """
+    workers > 1 → kaynaklar kare aralıklarına bölünür, her aralık ayrı bir
+    süreçte işlenir; çıktılar geçici dosyalardan kaynak / kare sırasıyla
+    birleştirilir, yani NDJSON işçi sayısından bağımsız aynı sıradadır.
+    """
+    config = config or ReplayConfig()
+    workers = workers or os.cpu_count() or 1
+    total = ReplayReport()
+    start = time.perf_counter()
+
+    if workers == 1:
+        for source in sources:
+            total.merge(process_segment(Segment(source, 0, None), config, out))
+            total.segments += 1
+    else:
+        segments = split_segments(sources, workers)
+        tmp_dir = tempfile.mkdtemp(prefix="replay-")
+        try:
+            tasks = [(i, segment, config, tmp_dir) for i, segment in enumerate(segments)]
+            with mp.get_context("spawn").Pool(workers, initializer=_init_pool_worker) as pool:
+                parts = sorted(pool.imap_unordered(_process_to_file, tasks))
+            for _, path, report in parts:
+                with open(path, encoding="utf-8") as f:
+                    shutil.copyfileobj(f, out)
+                total.merge(report)
+                total.segments += 1
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    total.elapsed = time.perf_counter() - start
+    return total
@@ -0,0 +1,165 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from face_access_system.config.settings import (
+    SCHEDULER_IDLE_HEARTBEAT_SEC,
+    SCHEDULER_ACTIVE_HOLD_SEC,
+    SCHEDULER_LATENCY_BUDGET_MS,
+    SCHEDULER_MIN_SCALE,
+    SCHEDULER_MAX_SCALE,
+    SCHEDULER_MAX_INTERVAL,
+)
+from face_access_system.vision.motion import MotionDetector, merge_boxes
+
+Box = Tuple[int, int, int, int]
+
+
+@dataclass
+class AnalysisPlan:
+    scale:  float
+    rois:   Optional[List[Box]] = None    # None → tüm kare
+    reason: str = "interval"              # wake | motion | tracking | heartbeat | interval
+
+
+class AdaptiveScheduler:
+    """
+    Hangi karenin, hangi bölgesinin, hangi ölçekte analiz edileceğine karar verir.
+
+    - Hareket yok ve yakın zamanda yüz görülmediyse algılama tamamen atlanır;
+      yalnızca heartbeat aralığında bir tam kare analiz edilir.
+    - Boşta beklerken hareket başlarsa ilk kare aralık beklenmeden işlenir
+      (yaklaşan kişi için ilk karar gecikmesin).
+    - Aktifken yalnızca hareketli bölgeler + son yüz kutuları (ROI) analiz edilir;
+      ROI'ler karenin büyük kısmını kaplıyorsa tüm kare işlenir.
+    - Ölçülen çıkarım gecikmesi bütçeyi aşarsa önce ölçek, sonra analiz sıklığı
+      düşürülür; bol pay varsa tersi yapılır.
+
+    plan() yakalama, observe() çıkarım iş parçacığından çağrılır.
+    """
+
+    ADAPT_PERIOD_SEC: float = 1.0     # Ölçek / aralık en fazla bu sıklıkla değişir
+    EMA_ALPHA: float = 0.2
+    FACE_ROI_PADDING: float = 0.5     # Son yüz kutusu, hareket payı için genişletilir
+
+    def __init__(
+        self,
+        motion: Optional[MotionDetector] = None,
+        interval: int = 1,
+        scale: float = 0.5,
+        min_scale: float = SCHEDULER_MIN_SCALE,
+        max_scale: float = SCHEDULER_MAX_SCALE,
+        max_interval: int = SCHEDULER_MAX_INTERVAL,
+        latency_budget_ms: float = SCHEDULER_LATENCY_BUDGET_MS,
+        heartbeat_sec: float = SCHEDULER_IDLE_HEARTBEAT_SEC,
+        active_hold_sec: float = SCHEDULER_ACTIVE_HOLD_SEC,
+        full_frame_fraction: float = 0.5
+    ):
+        self.motion              = motion if motion is not None else MotionDetector()
+        self.max_interval        = max(1, max_interval)
+        self.interval            = min(max(1, interval), self.max_interval)
+        self.min_scale           = min_scale
+        self.max_scale           = max_scale
+        self.scale               = float(np.clip(scale, min_scale, max_scale))
+        self.latency_budget      = latency_budget_ms / 1e3
+        self.heartbeat_sec       = heartbeat_sec
+        self.active_hold_sec     = active_hold_sec
+        self.full_frame_fraction = full_frame_fraction
+
+        self._idle = True
+        self._frames_since_plan = 0
+        self._last_plan_at  = float("-inf")
+        self._last_face_at  = float("-inf")
+        self._last_adapt_at = float("-inf")
+        self._face_boxes: List[Box] = []
+        self._latency_ema: Optional[float] = None
+
+        self.counts: Dict[str, int] = {
+            "idle_skipped": 0, "rate_skipped": 0, "analyzed": 0, "roi_analyses": 0,
+        }
+
+    # ─── Yakalama tarafı ────────────────────────────
+    def plan(self, frame: np.ndarray, now: float) -> Optional[AnalysisPlan]:
+        self._frames_since_plan += 1
+        motion_rois = self.motion.detect(frame)
+        active = now - self._last_face_at <= self.active_hold_sec
+
+        if not motion_rois and not active:
+            self._idle = True
+            if now - self._last_plan_at >= self.heartbeat_sec:
+                return self._emit(now, None, "heartbeat")
+            self.counts["idle_skipped"] += 1
+            return None
+
+        woke, self._idle = self._idle, False
+        if not woke and self._frames_since_plan < self.interval:
+            self.counts["rate_skipped"] += 1
+            return None
+
+        h, w = frame.shape[:2]
+        rois = list(motion_rois)
+        if active:
+            rois += [self._pad(box, w, h) for box in self._face_boxes]
+        rois = merge_boxes(rois)
+
+        if not rois or sum(bw * bh for _, _, bw, bh in rois) > self.full_frame_fraction * w * h:
+            rois = None
+
+        reason = "wake" if woke else ("motion" if motion_rois else "tracking")
+        return self._emit(now, rois, reason)
+
+    def _emit(self, now: float, rois: Optional[List[Box]], reason: str) -> AnalysisPlan:
+        self._frames_since_plan = 0
+        self._last_plan_at = now
+        self.counts["analyzed"] += 1
+        if rois is not None:
+            self.counts["roi_analyses"] += 1
+        return AnalysisPlan(scale=self.scale, rois=rois, reason=reason)
+
+    def _pad(self, box: Box, w: int, h: int) -> Box:
+        x, y, bw, bh = box
+        px, py = int(bw * self.FACE_ROI_PADDING), int(bh * self.FACE_ROI_PADDING)
+        x1, y1 = max(0, x - px), max(0, y - py)
+        x2, y2 = min(w, x + bw + px), min(h, y + bh + py)
+        return (x1, y1, x2 - x1, y2 - y1)
+
+    # ─── Çıkarım tarafı ─────────────────────────────
+    def observe(self, latency: float, face_boxes: Sequence[Box], now: float) -> None:
+        """Bir analizin süresini ve bulduğu yüz kutularını (tam kare koordinatı) bildirir."""
+        if face_boxes:
+            self._last_face_at = now
+            self._face_boxes = list(face_boxes)
+        elif now - self._last_face_at > self.active_hold_sec:
+            self._face_boxes = []
+
+        if self._latency_ema is None:
+            self._latency_ema = latency
+        else:
+            self._latency_ema += self.EMA_ALPHA * (latency - self._latency_ema)
+
+        if now - self._last_adapt_at >= self.ADAPT_PERIOD_SEC:
+            self._last_adapt_at = now
+            self._adapt()
+
+    def _adapt(self) -> None:
+        if self._latency_ema > self.latency_budget:
+            # Aşırı yük: önce çözünürlükten, sonra analiz sıklığından feragat et
+            if self.scale > self.min_scale:
+                self.scale = max(self.min_scale, self.scale * 0.85)
+            elif self.interval < self.max_interval:
+                self.interval += 1
+        elif self._latency_ema < 0.5 * self.latency_budget:
+            if self.interval > 1:
+                self.interval -= 1
+            elif self.scale < self.max_scale:
+                self.scale = min(self.max_scale, self.scale * 1.1)
+
+    def stats(self) -> Dict[str, float]:
+        stats = dict(self.counts)
+        stats.update(
+            interval=self.interval,
+            scale=round(self.scale, 3),
+            latency_ms=round((self._latency_ema or 0.0) * 1e3, 2),
+        )
+        return stats
@@ -0,0 +1,348 @@
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import cv2
+import numpy as np
+
+from face_access_system.app_logging.access_logger import AccessLogger
+from face_access_system.app_logging.log_writer import AccessLogWriter
+from face_access_system.config.settings import (
+    DOOR_ID,
+    SERVICE_DETECT_WORKERS,
+    SERVICE_MAX_BATCH,
+    SERVICE_BATCH_WAIT_MS,
+    SERVICE_MAX_IMAGE_SIDE,
+    SERVICE_SUBSCRIBER_QUEUE,
+)
+from face_access_system.database.crud import create_users_with_templates
+from face_access_system.pipeline.analyzer import Box, FaceDecision, decision_to_dict, recognize_faces
+from face_access_system.pipeline.multistream import load_stream_configs
+from face_access_system.pipeline.threaded import StageStats
+from face_access_system.recognition.recognizer import FaceRecognizer
+from face_access_system.vision.embedding_extractor import EmbeddingExtractor
+from face_access_system.vision.face_detector import FaceDetector
+
+
+def configured_doors() -> Set[str]:
+    """Kararların yazılabileceği kapılar: DOOR_ID + yapılandırılmış akışlar."""
+    return {DOOR_ID} | {config.door for config in load_stream_configs()}
+
+
+# ─── Micro-batch ───────────────────────────────────
+class MicroBatcher:
+    """
+    Eşzamanlı isteklerin öğelerini tek fn(items) çağrısında birleştirir.
+
+    İlk öğe geldikten sonra en fazla max_wait_ms beklenir ya da max_batch
+    öğeye ulaşılınca hemen çalıştırılır. fn tek iş parçacıklı executor'da
+    çalışır (model nesneleri paylaşılmaz); o sırada gelen istekler bir
+    sonraki batch'te toplanır. Bir isteğin öğeleri bölünmez.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[List[Any]], List[Any]],
+        executor: ThreadPoolExecutor,
+        max_batch: int = SERVICE_MAX_BATCH,
+        max_wait_ms: float = SERVICE_BATCH_WAIT_MS
+    ):
+        self.fn        = fn
+        self.executor  = executor
+        self.max_batch = max(1, max_batch)
+        self.max_wait  = max_wait_ms / 1e3
+
+        self._queue: "asyncio.Queue[Tuple[List[Any], asyncio.Future]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self.stats   = StageStats("batch")
+        self.items   = 0
+        self.batches = 0
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, items: List[Any]) -> List[Any]:
+        if not items:
+            return []
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((items, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[List[Any], asyncio.Future]]:
+        batch = [await self._queue.get()]
+        size = len(batch[0][0])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                entry = await asyncio.wait_for(self._queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            batch.append(entry)
+            size += len(entry[0])
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            flat = [item for items, _ in batch for item in items]
+            start = time.monotonic()
+            try:
+                results = await loop.run_in_executor(self.executor, self.fn, flat)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.stats.record(time.monotonic() - start)
+            self.items += len(flat)
+            self.batches += 1
+
+            offset = 0
+            for items, future in batch:
+                if not future.done():       # İstemci bağlantıyı kapatmış olabilir
+                    future.set_result(results[offset:offset + len(items)])
+                offset += len(items)
+
+
+# ─── Servis ────────────────────────────────────────
+@dataclass
+class EnrollResult:
+    user_id:     int
+    external_id: str
+    templates:   int                # Yüz bulunan görüntü sayısı
+    rejected:    List[int]          # Yüz bulunamayan / okunamayan görüntü indeksleri
+
+
+class RecognitionService:
+    """
+    Kameradan bağımsız tanıma çekirdeği: görüntü baytları → erişim kararları.
+
+      • JPEG/PNG çözme + algılama SERVICE_DETECT_WORKERS iş parçacığında
+        (her iş parçacığının kendi FaceDetector'ı).
+      • Tüm isteklerin yüzleri MicroBatcher ile tek extract_batch +
+        recognize_batch çağrısında işlenir (gecikme bütçesi SERVICE_BATCH_WAIT_MS).
+      • Her karar kapıya göre AccessLogger ile loglanır (tek ortak yazıcı) ve
+        subscribe() ile açılmış izleyici kuyruklarına yayınlanır. Kapı adı
+        istemciden gelir; yalnızca yapılandırılmış kapılar (doors) kabul edilir,
+        denetim kaydına istemcinin uydurduğu bir kapı yazılamaz.
+    Tüm async metotlar aynı event loop'tan çağrılmalıdır.
+    """
+
+    def __init__(
+        self,
+        recognizer: Optional[FaceRecognizer] = None,
+        extractor: Optional[EmbeddingExtractor] = None,
+        detect_workers: int = SERVICE_DETECT_WORKERS,
+        max_batch: int = SERVICE_MAX_BATCH,
+        batch_wait_ms: float = SERVICE_BATCH_WAIT_MS,
+        max_image_side: int = SERVICE_MAX_IMAGE_SIDE,
+        writer: Optional[AccessLogWriter] = None,
+        doors: Optional[Iterable[str]] = None
+    ):
+        self.recognizer     = recognizer if recognizer is not None else FaceRecognizer()
+        self.extractor      = extractor if extractor is not None else EmbeddingExtractor()
+        self.max_image_side = max_image_side
+        self.writer         = writer if writer is not None else AccessLogWriter()
+        self.doors          = set(doors) if doors is not None else configured_doors()
+
+        self._detect_pool = ThreadPoolExecutor(max(1, detect_workers), thread_name_prefix="service-detect")
+        # Embedding modeli + tanıyıcı yalnızca bu iş parçacığından kullanılır
+        self._infer_pool  = ThreadPoolExecutor(1, thread_name_prefix="service-infer")
+        self._local = threading.local()
+        self._batcher = MicroBatcher(self._infer, self._infer_pool, max_batch, batch_wait_ms)
+
+        self._loggers: Dict[str, AccessLogger] = {}
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._detect_stats = StageStats("detect")
+        self._request_stats = StageStats("request")
+        self.published = 0
+        self.dropped_events = 0
+
+    async def start(self) -> None:
+        self._batcher.start()
+
+    async def close(self) -> None:
+        await self._batcher.close()
+        self._detect_pool.shutdown(wait=True)
+        self._infer_pool.shutdown(wait=True)
+        for logger in self._loggers.values():
+            logger.close()
+        self._loggers.clear()
+        self.writer.close()
+        self.recognizer.close()
+
+    # ─── İş parçacığı tarafı ────────────────────────
+    def _detector(self) -> FaceDetector:
+        detector = getattr(self._local, "detector", None)
+        if detector is None:
+            detector = self._local.detector = FaceDetector()
+        return detector
+
+    def _detect(self, data: bytes) -> List[Tuple[np.ndarray, Box]]:
+        """Görüntü baytları → (yüz görüntüsü, orijinal koordinatta kutu) listesi."""
+        start = time.monotonic()
+        image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError("Görüntü çözülemedi (JPEG / PNG bekleniyor)")
+
+        s = 1.0
+        side = max(image.shape[:2])
+        if self.max_image_side and side > self.max_image_side:
+            s = self.max_image_side / side
+            image = cv2.resize(image, None, fx=s, fy=s, interpolation=cv2.INTER_AREA)
+
+        faces = [
+            (face_img, (int(x / s), int(y / s), int(w / s), int(h / s)))
+            for face_img, (x, y, w, h) in self._detector().detect_faces(image)
+        ]
+        self._detect_stats.record(time.monotonic() - start)
+        return faces
+
+    def _infer(self, crops: List[np.ndarray]) -> list:
+        return recognize_faces(self.extractor, self.recognizer, crops)
+
+    # ─── Tanıma ─────────────────────────────────────
+    def _logger(self, door: str) -> AccessLogger:
+        if not isinstance(door, str) or door not in self.doors:
+            raise ValueError(f"Bilinmeyen kapı: {door!r} (tanımlı: {sorted(self.doors)})")
+        logger = self._loggers.get(door)
+        if logger is None:
+            logger = self._loggers[door] = AccessLogger(writer=self.writer, door=door)
+        return logger
+
+    async def _detect_all(self, images: List[bytes]) -> List[Any]:
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(
+            *(loop.run_in_executor(self._detect_pool, self._detect, data) for data in images),
+            return_exceptions=True,
+        )
+
+    async def recognize_batch(
+        self,
+        images: List[bytes],
+        door: Optional[str] = None
+    ) -> List[Any]:
+        """
+        Görüntü başına List[FaceDecision]; okunamayan görüntünün yerinde
+        ValueError döner (diğerleri etkilenmez). Tüm yüzler tek batch'e girer.
+        """
+        start = time.monotonic()
+        door = door or DOOR_ID
+        logger = self._logger(door)     # Bilinmeyen kapı → ValueError (HTTP 400), işlem yapılmaz
+        detected = await self._detect_all(images)
+        crops = [face_img for faces in detected if not isinstance(faces, BaseException)
+                 for face_img, _ in faces]
+        results = iter(await self._batcher.submit(crops))
+
+        out: List[Any] = []
+        for faces in detected:
+            if isinstance(faces, BaseException):
+                out.append(faces)
+                continue
+            decisions = []
+            for _, coords in faces:
+                result = next(results)
+                if result is None:          # Embedding çıkarılamadı
+                    continue
+                decisions.append(FaceDecision(coords=coords, decision=logger.log_access(result)))
+            out.append(decisions)
+            self._publish(door, decisions)
+
+        self._request_stats.record(time.monotonic() - start)
+        return out
+
+    async def recognize(self, image: bytes, door: Optional[str] = None) -> List[FaceDecision]:
+        result = (await self.recognize_batch([image], door))[0]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    # ─── Kayıt ──────────────────────────────────────
+    async def enroll(
+        self,
+        name: str,
+        images: List[bytes],
+        authorized: bool = False,
+        external_id: Optional[str] = None
+    ) -> EnrollResult:
+        """
+        Her görüntünün en büyük yüzü bir şablon olur; yüz bulunamazsa
+        ValueError. external_id verilmezse üretilir (tekrarı IntegrityError).
+        """
+        if not name:
+            raise ValueError("name boş olamaz")
+        loop = asyncio.get_running_loop()
+        detected = await self._detect_all(images)
+
+        crops, rejected = [], []
+        for i, faces in enumerate(detected):
+            if isinstance(faces, BaseException) or not faces:
+                rejected.append(i)
+                continue
+            face_img, _ = max(faces, key=lambda f: f[1][2] * f[1][3])
+            crops.append(face_img)
+        if not crops:
+            raise ValueError("Hiçbir görüntüde yüz bulunamadı")
+
+        embeddings = await loop.run_in_executor(self._infer_pool, self.extractor.extract_batch, crops)
+        templates = embeddings[np.any(embeddings != 0, axis=1)]
+        if not len(templates):
+            raise ValueError("Embedding çıkarılamadı")
+
+        external_id = external_id or f"api-{uuid.uuid4().hex}"
+        (user_id,) = await loop.run_in_executor(
+            self._detect_pool, create_users_with_templates,
+            [(external_id, name, templates, authorized)],
+        )
+        return EnrollResult(user_id, external_id, len(templates), rejected)
+
+    # ─── Karar yayını ───────────────────────────────
+    def subscribe(self) -> asyncio.Queue:
+        q: asyncio.Queue = asyncio.Queue(SERVICE_SUBSCRIBER_QUEUE)
+        self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q: asyncio.Queue) -> None:
+        self._subscribers.discard(q)
+
+    def _publish(self, door: str, decisions: List[FaceDecision]) -> None:
+        if not decisions or not self._subscribers:
+            return
+        event = {"ts": time.time(), "door": door, "faces": [decision_to_dict(f) for f in decisions]}
+        for q in self._subscribers:
+            # Yavaş izleyici tanımayı bekletmez: en eski olay atılır
+            if q.full():
+                q.get_nowait()
+                self.dropped_events += 1
+            q.put_nowait(event)
+        self.published += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "request": self._request_stats.as_dict(),
+            "detect":  self._detect_stats.as_dict(),
+            "batch":   dict(self._batcher.stats.as_dict(),
+                            avg_faces=round(self._batcher.items / max(self._batcher.batches, 1), 2)),
+            "subscribers": len(self._subscribers),
+            "published":   self.published,
+            "dropped_events": self.dropped_events,
+            "log_writer":  self.writer.stats(),
+        }
@@ -0,0 +1,269 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from face_access_system.pipeline.analyzer import (
+    DecisionGate,
+    FaceAnalyzer,
+    FaceDecision,
+    FaceResult,
+)
+from face_access_system.pipeline.scheduler import AdaptiveScheduler, AnalysisPlan
+
+
+class DropOldestQueue:
+    """
+    Sınırlı kuyruk; doluyken put() beklemez, en eski öğeyi atar.
+    Canlı görüntüde bayat kareyi işlemek yerine en yenisine geçmek içindir.
+    """
+
+    def __init__(self, maxsize: int):
+        self._q = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def put(self, item: Any) -> None:
+        while True:
+            try:
+                self._q.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._q.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: float) -> Optional[Any]:
+        try:
+            return self._q.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def qsize(self) -> int:
+        return self._q.qsize()
+
+
+class StageStats:
+    """Aşama başına işlenen öğe sayısı ve gecikme (EMA + en kötü)."""
+
+    EMA_ALPHA: float = 0.1
+
+    def __init__(self, name: str):
+        self.name = name
+        self.processed   = 0
+        self.latency_ema = 0.0
+        self.latency_max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.processed += 1
+        if self.processed == 1:
+            self.latency_ema = seconds
+        else:
+            self.latency_ema += self.EMA_ALPHA * (seconds - self.latency_ema)
+        self.latency_max = max(self.latency_max, seconds)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "processed":      self.processed,
+            "latency_ms":     round(self.latency_ema * 1e3, 2),
+            "latency_max_ms": round(self.latency_max * 1e3, 2),
+        }
+
+
+@dataclass
+class FramePacket:
+    frame_id:    int
+    captured_at: float            # time.monotonic()
+    frame:       np.ndarray
+    plan:        Optional[AnalysisPlan] = None   # Zamanlayıcı varsa: ölçek + ROI
+
+
+@dataclass
+class ResultPacket:
+    frame_id:    int
+    captured_at: float
+    faces:       List[FaceResult] = field(default_factory=list)
+
+
+class ThreadedPipeline:
+    """
+    Yakalama → çıkarım → karar/log aşamaları ayrı iş parçacıklarında çalışır.
+    Kareler en eskiyi atan sınırlı bir kuyrukla aktarılır: yavaş bir aşama
+    kamerayı bekletmez, çıkarım her zaman elindeki en yeni kareyi işler.
+    Tanıma sonuçları ise sınırsız kuyruktan geçer ve hiçbiri atılmaz; her
+    sonuç bir erişim kararı ve denetim kaydı olabilir. Ekran (ana iş
+    parçacığı) latest_frame() + latest_faces() ile en yeni kareyi son kararlarla
+    çizer.
+
+    scheduler verilirse sabit "her N karede bir" yerine hangi karenin, hangi
+    bölgede ve ölçekte analiz edileceğine AdaptiveScheduler karar verir.
+    """
+
+    def __init__(
+        self,
+        cap,
+        analyzer: FaceAnalyzer,
+        gate: DecisionGate,
+        process_every_n: int = 1,
+        queue_size: int = 2,
+        scheduler: Optional[AdaptiveScheduler] = None
+    ):
+        self.cap             = cap
+        self.analyzer        = analyzer
+        self.gate            = gate
+        self.process_every_n = max(1, process_every_n)
+        self.scheduler       = scheduler
+
+        self._frames_q  = DropOldestQueue(queue_size)
+        self._results_q: "queue.Queue[ResultPacket]" = queue.Queue()
+        self._stop      = threading.Event()
+        self._inference_done = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+        self._latest_frame: Optional[FramePacket] = None
+        self._latest_faces: List[FaceDecision] = []
+
+        self._capture_stats   = StageStats("capture")
+        self._inference_stats = StageStats("inference")
+        self._decision_stats  = StageStats("decision")
+        self._e2e_stats       = StageStats("end_to_end")
+
+    # ─── Yaşam döngüsü ──────────────────────────────
+    def start(self) -> None:
+        self._stop.clear()
+        self._inference_done.clear()
+        for name, target in (
+            ("capture",   self._capture_loop),
+            ("inference", self._inference_loop),
+            ("decision",  self._decision_loop),
+        ):
+            thread = threading.Thread(target=target, name=f"pipeline-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            # Karar aşaması kuyruktaki sonuçların hepsini işlemeden çıkmaz
+            thread.join(timeout=None if thread.name == "pipeline-decision" else timeout)
+        self._threads = []
+
+    @property
+    def is_running(self) -> bool:
+        return not self._stop.is_set()
+
+    # ─── Ekran tarafı ───────────────────────────────
+    def latest_frame(self) -> Optional[FramePacket]:
+        return self._latest_frame
+
+    def latest_faces(self) -> List[FaceDecision]:
+        return self._latest_faces
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        stats = {
+            "capture":    self._capture_stats.as_dict(),
+            "inference":  self._inference_stats.as_dict(),
+            "decision":   self._decision_stats.as_dict(),
+            "end_to_end": self._e2e_stats.as_dict(),
+        }
+        stats["inference"].update(queue_depth=self._frames_q.qsize(),
+                                  dropped=self._frames_q.dropped)
+        stats["decision"].update(queue_depth=self._results_q.qsize())
+        stats["inference"].update(faces=self.analyzer.faces_seen,
+                                  recognitions=self.analyzer.recognitions_run)
+        if self.scheduler is not None:
+            stats["scheduler"] = self.scheduler.stats()
+        return stats
+
+    def format_stats(self) -> str:
+        parts = []
+        for name, s in self.stats().items():
+            if name == "scheduler":
+                parts.append(
+                    f"scheduler: 1/{s['interval']} @{s['scale']:.2f} "
+                    f"analiz={s['analyzed']} (roi={s['roi_analyses']}) "
+                    f"boşta={s['idle_skipped']} atlanan={s['rate_skipped']}"
+                )
+                continue
+            text = f"{name}: {s['latency_ms']:.1f}ms (max {s['latency_max_ms']:.1f})"
+            if "queue_depth" in s:
+                text += f" q={s['queue_depth']}"
+            if "dropped" in s:
+                text += f" drop={s['dropped']}"
+            parts.append(text)
+        return " | ".join(parts)
+
+    # ─── Aşamalar ───────────────────────────────────
+    def _capture_loop(self) -> None:
+        frame_id = 0
+        while not self._stop.is_set():
+            start = time.monotonic()
+            ret, frame = self.cap.read()
+            if not ret:
+                self._stop.set()
+                break
+
+            now = time.monotonic()
+            self._capture_stats.record(now - start)
+            packet = FramePacket(frame_id=frame_id, captured_at=now, frame=frame)
+            self._latest_frame = packet
+
+            if self.scheduler is not None:
+                packet.plan = self.scheduler.plan(frame, now)
+                if packet.plan is not None:
+                    self._frames_q.put(packet)
+            elif frame_id % self.process_every_n == 0:
+                self._frames_q.put(packet)
+            frame_id += 1
+
+    def _inference_loop(self) -> None:
+        try:
+            self._infer_frames()
+        finally:
+            self._inference_done.set()
+
+    def _infer_frames(self) -> None:
+        while not self._stop.is_set():
+            packet = self._frames_q.get(timeout=0.1)
+            if packet is None:
+                continue
+
+            plan = packet.plan
+            start = time.monotonic()
+            try:
+                if plan is None:
+                    faces = self.analyzer.analyze(packet.frame, packet.captured_at)
+                else:
+                    faces = self.analyzer.analyze(packet.frame, packet.captured_at,
+                                                  rois=plan.rois, scale=plan.scale)
+            except Exception as e:
+                print(f"[Pipeline] Çıkarım hatası (kare {packet.frame_id}): {e}")
+                continue
+            latency = time.monotonic() - start
+            self._inference_stats.record(latency)
+            if self.scheduler is not None:
+                self.scheduler.observe(latency, [f.coords for f in faces], packet.captured_at)
+
+            self._results_q.put(ResultPacket(packet.frame_id, packet.captured_at, faces))
+
+    def _decision_loop(self) -> None:
+        # Durdurulunca da çıkarımın ürettiği son sonuca kadar işlenir
+        while True:
+            try:
+                packet = self._results_q.get(timeout=0.1)
+            except queue.Empty:
+                if self._inference_done.is_set():
+                    return
+                continue
+
+            start = time.monotonic()
+            decisions = self.gate.decide_all(packet.faces)
+            now = time.monotonic()
+            self._decision_stats.record(now - start)
+            self._e2e_stats.record(now - packet.captured_at)
+
+            self._latest_faces = decisions
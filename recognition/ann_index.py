@@ -0,0 +1,286 @@
+import os
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from face_access_system.config.settings import (
+    ANN_INDEX_PATH,
+    ANN_NLIST,
+    ANN_NPROBE,
+    ANN_TRAIN_ITERATIONS,
+)
+from face_access_system.recognition.gallery import GallerySnapshot
+from face_access_system.recognition.quantization import GalleryMatrix, as_float32
+
+
+class IVFIndex:
+    """
+    Saf NumPy IVF (inverted file) yaklaşık en yakın komşu indeksi.
+
+    Normalize embedding'ler sferik k-means ile nlist kümeye ayrılır; bir sorgu
+    yalnızca kendisine en yakın nprobe kümenin üyeleriyle karşılaştırılır.
+    İndeks vektörleri değil yalnızca (user_id → küme) atamasını saklar; aday
+    satırlar GallerySnapshot matrisi üzerinde tam puanlanır. Böylece diske
+    yazılan dosya küçüktür ve galeriyle aynı veriyi kopyalamaz.
+
+    nprobe büyüdükçe recall artar, hız düşer; nprobe = nlist tam taramadır.
+
+    search() indeksi hiçbir zaman kendi iş parçacığında eğitmez / kaydetmez:
+    snapshot'a henüz bağlanmamışsa eşitleme arka plan iş parçacığına verilir
+    ve indeks hazır olana kadar None döner (çağıran tam taramayla devam eder).
+    Çevrimdışı araçlar sync()'i doğrudan (eşzamanlı) çağırabilir.
+    """
+
+    # Eğitim sırasında her küme başına kullanılacak en fazla örnek
+    SAMPLES_PER_LIST: int = 64
+    # Galeri eğitildiği boyutun bu katına ulaşınca kümeler yeniden eğitilir
+    RETRAIN_GROWTH: float = 4.0
+
+    def __init__(
+        self,
+        nlist: int = ANN_NLIST,
+        nprobe: int = ANN_NPROBE,
+        path: Optional[str] = ANN_INDEX_PATH
+    ):
+        self.nlist  = nlist
+        self.nprobe = nprobe
+        self.path   = path
+
+        self._lock = threading.Lock()
+
+        # Arka plan eşitleme: en son istenen snapshot ve onu işleyen iş parçacığı
+        self._pending_lock = threading.Lock()
+        self._pending: Optional[GallerySnapshot] = None
+        self._builder: Optional[threading.Thread] = None
+
+        self.centroids: Optional[np.ndarray] = None    # (nlist×D) birim satırlar
+        self.ids    = np.zeros(0, dtype=np.int64)      # (N,) user id
+        self.assign = np.zeros(0, dtype=np.int32)      # (N,) küme numarası
+        self.trained_size = 0
+
+        # Son senkronize edilen snapshot, ona göre küme → galeri satırları ve
+        # o anki merkezler; tek bir tuple olarak değiştirilir ki okuyucular
+        # yeniden eğitim sırasında da tutarlı üçlü görsün
+        self._bound: Tuple[Optional[GallerySnapshot], List[np.ndarray], Optional[np.ndarray]] = \
+            (None, [], None)
+
+    # ─── Eğitim ─────────────────────────────────────
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def _resolve_nlist(self, n: int) -> int:
+        if self.nlist > 0:
+            return max(1, min(self.nlist, n))
+        # Otomatik: ~√N küme (faiss'in önerdiği aralığın alt ucu)
+        return int(np.clip(np.sqrt(n), 1, 4096))
+
+    def train(self, matrix: GalleryMatrix, seed: int = 0) -> None:
+        n = len(matrix)
+        if n == 0:
+            raise ValueError("Boş galeri ile IVF eğitilemez.")
+
+        nlist = self._resolve_nlist(n)
+        rng = np.random.default_rng(seed)
+
+        sample_size = min(n, nlist * self.SAMPLES_PER_LIST)
+        sample = as_float32(matrix[np.sort(rng.choice(n, sample_size, replace=False))])
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+        for _ in range(ANN_TRAIN_ITERATIONS):
+            labels = self._nearest_centroid(sample, centroids)
+            sums = self._cluster_sums(sample, labels, nlist)
+
+            norms = np.linalg.norm(sums, axis=1)
+            empty = norms == 0
+            # Boş kalan kümeler rastgele bir örnekle yeniden başlatılır
+            if empty.any():
+                sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+                norms[empty] = np.linalg.norm(sums[empty], axis=1)
+            centroids = (sums / np.maximum(norms, 1e-12)[:, None]).astype(np.float32)
+
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.trained_size = n
+
+    @staticmethod
+    def _cluster_sums(vectors: np.ndarray, labels: np.ndarray, nlist: int) -> np.ndarray:
+        # np.add.at yerine sıralama + reduceat (çok daha hızlı)
+        order = np.argsort(labels, kind="stable")
+        sorted_labels = labels[order]
+        present, starts = np.unique(sorted_labels, return_index=True)
+
+        sums = np.zeros((nlist, vectors.shape[1]), dtype=np.float32)
+        sums[present] = np.add.reduceat(vectors[order], starts, axis=0)
+        return sums
+
+    @staticmethod
+    def _nearest_centroid(
+        vectors: GalleryMatrix,
+        centroids: np.ndarray,
+        chunk: int = 65536
+    ) -> np.ndarray:
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), chunk):
+            block = as_float32(vectors[start:start + chunk]) @ centroids.T
+            labels[start:start + chunk] = np.argmax(block, axis=1)
+        return labels
+
+    # ─── Galeri ile senkronizasyon ──────────────────
+    def sync(self, snapshot: GallerySnapshot) -> None:
+        """
+        İndeksi snapshot'taki kullanıcılarla eşitler. Yeni kayıtlar en yakın
+        kümeye eklenir, silinenler çıkarılır; yalnızca galeri çok büyüdüyse
+        kümeler yeniden eğitilir.
+        """
+        if snapshot is self._bound[0]:
+            return
+
+        with self._lock:
+            if snapshot is self._bound[0]:
+                return
+
+            snap_ids = np.ascontiguousarray(snapshot.ids)
+            changed = False
+
+            if len(snap_ids) and (
+                not self.is_trained
+                or self.centroids.shape[1] != snapshot.matrix.shape[1]
+                or len(snap_ids) >= self.RETRAIN_GROWTH * max(self.trained_size, 1)
+            ):
+                self.train(snapshot.matrix)
+                self.ids = snap_ids
+                self.assign = self._nearest_centroid(snapshot.matrix, self.centroids)
+                changed = True
+            else:
+                removed = ~np.isin(self.ids, snap_ids)
+                if removed.any():
+                    self.ids = self.ids[~removed]
+                    self.assign = self.assign[~removed]
+                    changed = True
+
+                added_rows = np.flatnonzero(~np.isin(snap_ids, self.ids))
+                if len(added_rows):
+                    self.ids = np.concatenate([self.ids, snap_ids[added_rows]])
+                    self.assign = np.concatenate([
+                        self.assign,
+                        self._nearest_centroid(snapshot.matrix[added_rows], self.centroids),
+                    ])
+                    changed = True
+
+            if not self.is_trained:
+                self._bound = (snapshot, [], None)
+                return
+
+            self._bind(snapshot, snap_ids)
+
+            if changed and self.path:
+                self.save(self.path)
+
+    def _bind(self, snapshot: GallerySnapshot, snap_ids: np.ndarray) -> None:
+        # id → snapshot satırı, sonra küme bazında gruplama
+        order = np.argsort(snap_ids, kind="stable")
+        pos = np.searchsorted(snap_ids[order], self.ids)
+        rows = order[np.minimum(pos, len(order) - 1)] if len(order) else pos
+
+        by_list = np.argsort(self.assign, kind="stable")
+        bounds = np.searchsorted(self.assign[by_list], np.arange(len(self.centroids) + 1))
+        sorted_rows = rows[by_list]
+        list_rows = [
+            sorted_rows[bounds[c]:bounds[c + 1]] for c in range(len(self.centroids))
+        ]
+        self._bound = (snapshot, list_rows, self.centroids)
+
+    def sync_async(self, snapshot: GallerySnapshot) -> None:
+        """sync(snapshot)'u arka planda çalıştırır; sürerken gelen istekler birleştirilir."""
+        with self._pending_lock:
+            self._pending = snapshot
+            if self._builder is not None:
+                return
+            self._builder = threading.Thread(target=self._build_loop, name="ivf-build", daemon=True)
+            self._builder.start()
+
+    def _build_loop(self) -> None:
+        while True:
+            with self._pending_lock:
+                snapshot, self._pending = self._pending, None
+                if snapshot is None:
+                    self._builder = None
+                    return
+            try:
+                self.sync(snapshot)
+            except Exception as e:
+                # Tam tarama sürer; bir sonraki snapshot'ta yeniden denenir
+                print(f"[IVFIndex] Arka plan eşitlemesi başarısız: {e}")
+
+    # ─── Arama ──────────────────────────────────────
+    def search(
+        self,
+        queries: np.ndarray,
+        snapshot: GallerySnapshot,
+        nprobe: Optional[int] = None
+    ) -> Optional[List[np.ndarray]]:
+        """
+        Birim uzunluklu (M×D) sorgular için snapshot'taki aday satırları
+        döndürür. İndeks bu snapshot'a henüz bağlanmamışsa eşitleme arka
+        planda başlatılır ve None döner (çağıran tam taramaya düşer).
+        """
+        bound_snapshot, list_rows, centroids = self._bound
+        if bound_snapshot is not snapshot:
+            if self._pending is not snapshot:
+                self.sync_async(snapshot)
+            return None
+        if not list_rows:
+            return None
+
+        nprobe = min(nprobe or self.nprobe, len(list_rows))
+        coarse = np.atleast_2d(queries) @ centroids.T
+
+        if nprobe < coarse.shape[1]:
+            probes = np.argpartition(-coarse, nprobe - 1, axis=1)[:, :nprobe]
+        else:
+            probes = np.tile(np.arange(coarse.shape[1]), (len(coarse), 1))
+
+        return [
+            np.concatenate([list_rows[c] for c in probe])
+            for probe in probes
+        ]
+
+    # ─── Kalıcılık ──────────────────────────────────
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                centroids=self.centroids,
+                ids=self.ids,
+                assign=self.assign,
+                trained_size=np.int64(self.trained_size),
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(
+        cls,
+        path: str = ANN_INDEX_PATH,
+        nlist: int = ANN_NLIST,
+        nprobe: int = ANN_NPROBE
+    ) -> "IVFIndex":
+        index = cls(nlist=nlist, nprobe=nprobe, path=path)
+        if not os.path.exists(path):
+            return index
+
+        try:
+            with np.load(path) as data:
+                index.centroids = data["centroids"].astype(np.float32)
+                index.ids = data["ids"].astype(np.int64)
+                index.assign = data["assign"].astype(np.int32)
+                index.trained_size = int(data["trained_size"])
+            print(f"[IVFIndex] {path} yüklendi ({len(index.ids)} kayıt, "
+                  f"{len(index.centroids)} küme).")
+        except Exception as e:
+            print(f"[IVFIndex] İndeks okunamadı, yeniden oluşturulacak: {e}")
+            index = cls(nlist=nlist, nprobe=nprobe, path=path)
+
+        return index
@@ -0,0 +1,591 @@
+import os
+from collections.abc import Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:     # Windows: süreçler arası kilit yok (tek yazıcı varsayılır)
+    fcntl = None
+
+from face_access_system.config.settings import (
+    EMBEDDING_DIM,
+    EMBEDDING_STORE_PATH,
+    TEMPLATE_STORE_PATH,
+)
+from face_access_system.database.crud import (
+    add_users_listener,
+    remove_users_listener,
+    get_all_users,
+    get_db_uuid,
+    get_templates_since,
+    get_user_by_id,
+    get_user_ids,
+    get_users_version,
+)
+from face_access_system.database.models import User
+from face_access_system.database.timeutil import from_epoch_us, to_epoch_us
+from face_access_system.recognition.similarity import normalize_rows
+
+# ─── Dosya düzeni ──────────────────────────────────
+# [başlık 64 B][matris: kapasite × D float32, birim satırlar][meta: kapasite × META]
+# Yalnızca ilk `count` satır geçerlidir; kapasite dolunca dosya iki katı
+# kapasiteyle yeniden yazılır (os.replace). Sayılar little-endian.
+# db_uuid dosyayı üretildiği veritabanına bağlar: sıfırlanan ya da geri
+# yüklenen veritabanında sürüm sayacı geriye gidebilir, kimlik değişir.
+STORE_MAGIC   = b"FASEMB\x00\x00"
+STORE_VERSION = 2
+HEADER_DTYPE = np.dtype([
+    ("magic",      "S8"),
+    ("version",    "<u4"),
+    ("dim",        "<u4"),
+    ("count",      "<u8"),
+    ("capacity",   "<u8"),
+    ("db_version", "<i8"),     # Dosyanın yansıttığı gallery_version
+    ("generation", "<u8"),     # Her değişiklikte artar
+    ("db_uuid",    "S16"),     # gallery_version.db_uuid (16 bayt; eski şemada sıfır)
+])
+HEADER_SIZE = HEADER_DTYPE.itemsize
+
+NAME_BYTES = 64
+META_DTYPE = np.dtype([
+    ("id",         "<i8"),
+    ("created_ts", "<i8"),
+    ("norm",       "<f4"),     # Orijinal embedding normu
+    ("authorized", "u1"),
+    ("reserved",   "S3"),
+    ("name",       f"S{NAME_BYTES}"),   # UTF-8, sığmazsa kesilir
+])
+
+MIN_CAPACITY = 64
+
+
+def _encode_name(name: str) -> bytes:
+    raw = name.encode("utf-8")[:NAME_BYTES]
+    # Çok baytlı bir karakterin ortasından kesilmesin
+    return raw.decode("utf-8", errors="ignore").encode("utf-8")
+
+
+def _uuid_bytes(db_uuid: Optional[str]) -> bytes:
+    return bytes.fromhex(db_uuid) if db_uuid else bytes(16)
+
+
+def _is_current(header, db_version: int, db_uuid: bytes) -> bool:
+    """Başlık tam olarak bu veritabanının bu sürümünü mü yansıtıyor?"""
+    return (db_version != -1 and int(header["db_version"]) == db_version
+            and header["db_uuid"].tobytes() == db_uuid)
+
+
+@contextmanager
+def _file_lock(lock_path: str):
+    """Süreçler arası yazma kilidi (dosya yeniden kurulurken okuyucular eski eşlemeyi görür)."""
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    with open(lock_path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _meta_rows(users: List[User], norms: np.ndarray) -> np.ndarray:
+    meta = np.zeros(len(users), dtype=META_DTYPE)
+    meta["id"]         = [u.id for u in users]
+    meta["created_ts"] = [to_epoch_us(u.created_at) for u in users]
+    meta["norm"]       = norms
+    meta["authorized"] = [int(u.is_authorized) for u in users]
+    meta["name"]       = [_encode_name(u.name) for u in users]
+    return meta
+
+
+class StoredUsers(Sequence):
+    """
+    Eşlemeli dosyadaki kullanıcılara tembel erişim: User nesnesi yalnızca
+    istenen satır için (ör. eşleşen kişi) oluşturulur, açılış O(1) kalır.
+    """
+
+    def __init__(self, matrix: np.ndarray, meta: np.ndarray):
+        self._matrix = matrix
+        self._meta = meta
+
+    def __len__(self) -> int:
+        return len(self._meta)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        row = self._meta[index]
+        return User(
+            id=int(row["id"]),
+            name=row["name"].decode("utf-8"),
+            embedding=self._matrix[index] * row["norm"],
+            is_authorized=bool(row["authorized"]),
+            created_at=from_epoch_us(row["created_ts"]),
+        )
+
+
+class EmbeddingStore:
+    """
+    users tablosunun bellek eşlemeli kopyası.
+
+    Okuyucular dosyayı np.memmap ile açar; matris ve meta dizileri doğrudan
+    dosya sayfalarına bakan görünümlerdir, işçi sayısı ne olursa olsun işletim
+    sistemi sayfa önbelleğinde tek kopya bulunur.
+
+    Senkronizasyon gallery_version sayacıyla yapılır: dosya başlığı hangi
+    sürümü yansıttığını tutar. Bu süreçteki crud yazmaları (attach() ile)
+    dosyaya artımlı uygulanır — ekleme sona yazılır; güncelleme ve silme,
+    okuyucuların eşlediği satırlara dokunmamak için dosyayı yeniden yazar
+    (os.replace). Sürüm tek adımdan fazla
+    gerideyse (başka bir süreç yazdıysa), ileride ya da db_uuid farklıysa
+    (veritabanı sıfırlanmış / geri yüklenmiş) dosya veritabanından yeniden
+    kurulur.
+    Yazmalar süreçler arası dosya kilidiyle sıralanır.
+    """
+
+    def __init__(self, path: str = EMBEDDING_STORE_PATH, dim: int = EMBEDDING_DIM):
+        self.path = path
+        self.dim  = dim
+        self._lock_path = path + ".lock"
+
+        self._map: Optional[np.memmap] = None
+        self._map_key: Optional[Tuple[int, int]] = None     # (inode, boyut)
+
+    # ─── Düşük seviye ───────────────────────────────
+    def _meta_offset(self, capacity: int) -> int:
+        return HEADER_SIZE + capacity * self.dim * 4
+
+    def _file_size(self, capacity: int) -> int:
+        return self._meta_offset(capacity) + capacity * META_DTYPE.itemsize
+
+    def _exclusive(self):
+        return _file_lock(self._lock_path)
+
+    def _views(self, mm: np.memmap):
+        header = np.ndarray((), HEADER_DTYPE, buffer=mm, offset=0)
+        if header["magic"] != STORE_MAGIC or header["version"] != STORE_VERSION \
+                or header["dim"] != self.dim:
+            raise ValueError(f"Geçersiz embedding dosyası: {self.path}")
+        capacity = int(header["capacity"])
+        matrix = np.ndarray((capacity, self.dim), np.float32, buffer=mm, offset=HEADER_SIZE)
+        meta = np.ndarray((capacity,), META_DTYPE, buffer=mm, offset=self._meta_offset(capacity))
+        return header, matrix, meta
+
+    def _open_header(self, mode: str = "r"):
+        """(memmap, başlık, matris, meta); dosya yok ya da bozuksa None."""
+        try:
+            mm = np.memmap(self.path, dtype=np.uint8, mode=mode)
+            return (mm,) + self._views(mm)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_file(
+        self,
+        matrix: np.ndarray,
+        meta: np.ndarray,
+        db_version: int,
+        generation: int,
+        db_uuid: bytes
+    ) -> None:
+        """Tüm içeriği geçici dosyaya yazıp atomik olarak yerine koyar."""
+        n = len(meta)
+        capacity = max(MIN_CAPACITY, 1 << int(np.ceil(np.log2(max(n, 1) * 1.25 + 1))))
+        tmp = self.path + ".tmp"
+
+        mm = np.memmap(tmp, dtype=np.uint8, mode="w+", shape=(self._file_size(capacity),))
+        header = np.ndarray((), HEADER_DTYPE, buffer=mm, offset=0)
+        header["magic"], header["version"], header["dim"] = STORE_MAGIC, STORE_VERSION, self.dim
+        header["capacity"], header["db_version"], header["generation"] = capacity, db_version, generation
+        header["db_uuid"] = db_uuid
+        _, out_matrix, out_meta = self._views(mm)
+        out_matrix[:n] = matrix
+        out_meta[:n] = meta
+        header["count"] = n
+        mm.flush()
+        del mm, header, out_matrix, out_meta
+
+        os.replace(tmp, self.path)
+
+    # ─── Yazma ──────────────────────────────────────
+    def rebuild(self) -> int:
+        """Dosyayı users tablosundan baştan kurar (BLOB'lar bir kez çözülür)."""
+        with self._exclusive():
+            return self._rebuild_locked()
+
+    def _rebuild_locked(self) -> int:
+        # Sayaç kullanıcılardan önce okunur (GalleryCache ile aynı gerekçe)
+        db_uuid = _uuid_bytes(get_db_uuid())
+        version = get_users_version()
+        users = get_all_users()
+        raw = (np.stack([np.asarray(u.embedding, dtype=np.float32) for u in users])
+               if users else np.zeros((0, self.dim), dtype=np.float32))
+        matrix, norms = normalize_rows(raw)
+
+        current = self._open_header()
+        generation = int(current[1]["generation"]) + 1 if current else 1
+        del current
+        self._write_file(matrix, _meta_rows(users, norms), version, generation, db_uuid)
+        return len(users)
+
+    def attach(self) -> "EmbeddingStore":
+        """Bu süreçteki crud yazmalarını dosyaya artımlı uygula."""
+        add_users_listener(self._on_users_changed)
+        return self
+
+    def close(self) -> None:
+        """attach() dinleyicisini kaldırır; tekrar çağrılabilir."""
+        remove_users_listener(self._on_users_changed)
+
+    def _on_users_changed(self, event: str, user_id: int, version: int) -> None:
+        try:
+            self.apply(event, user_id, version)
+        except Exception as e:
+            # Dosya tutarsız kalmaz: başlık sürümü geride kalır, okuyucular yeniden kurar
+            print(f"[EmbeddingStore] Artımlı güncelleme başarısız ({event} {user_id}): {e}")
+
+    def apply(self, event: str, user_id: int, version: int) -> None:
+        """
+        `version` sürümünü üreten tek değişikliği dosyaya uygular. Dosya tam
+        olarak bu sürümdeyse bir şey yapılmaz; başka bir veritabanına aitse ya
+        da sürümü bir önceki değilse (kaçırılan yazma, geri yüklenen yedek)
+        dosya yeniden kurulur.
+        """
+        db_uuid = _uuid_bytes(get_db_uuid())
+        with self._exclusive():
+            opened = self._open_header("r+")
+            if opened is not None and _is_current(opened[1], version, db_uuid):
+                return
+            if version == -1 or opened is None or opened[1]["db_uuid"].tobytes() != db_uuid \
+                    or int(opened[1]["db_version"]) != version - 1:
+                del opened
+                self._rebuild_locked()
+                return
+
+            mm, header, matrix, meta = opened
+            del opened
+            n = int(header["count"])
+            generation = int(header["generation"]) + 1
+            rows = np.flatnonzero(meta["id"][:n] == user_id)
+
+            # Satırın güncel hali okunur; sonradan gelen bir yazma da yansımışsa
+            # dosya sürümünden ileride olur, geride değil — o yazmanın kendi
+            # uygulaması aynı sonucu tekrar yazar
+            user = get_user_by_id(user_id) if event != "delete" else None
+
+            if user is None:
+                keep = np.ones(n, dtype=bool)
+                keep[rows] = False
+                kept_matrix, kept_meta = matrix[:n][keep], meta[:n][keep]
+                del mm, header, matrix, meta
+                self._write_file(kept_matrix, kept_meta, version, generation, db_uuid)
+                return
+
+            unit, norms = normalize_rows(np.asarray(user.embedding, dtype=np.float32)[None, :])
+            row_meta = _meta_rows([user], norms)
+
+            if len(rows):
+                # Güncelleme: snapshot'lar (bu ve diğer süreçlerde) dosya
+                # sayfalarını kopyasız puanlar → satır yerinde değiştirilmez;
+                # kopya yeni dosyaya yazılıp os.replace ile değiştirilir
+                updated_matrix, updated_meta = matrix[:n].copy(), meta[:n].copy()
+                updated_matrix[rows[0]] = unit[0]
+                updated_meta[rows[0]] = row_meta[0]
+                del mm, header, matrix, meta
+                self._write_file(updated_matrix, updated_meta, version, generation, db_uuid)
+                return
+            elif n < int(header["capacity"]):
+                # Ekleme: yalnızca okuyucuların count'u dışındaki satır yazılır;
+                # önce veri, sonra sayaç (okuyucu yarım satır görmesin)
+                matrix[n] = unit[0]
+                meta[n] = row_meta[0]
+                mm.flush()
+                header["count"] = n + 1
+            else:
+                grown_matrix = np.concatenate([matrix[:n], unit])
+                grown_meta = np.concatenate([meta[:n], row_meta])
+                del mm, header, matrix, meta
+                self._write_file(grown_matrix, grown_meta, version, generation, db_uuid)
+                return
+
+            header["db_version"] = version
+            header["generation"] = generation
+            mm.flush()
+
+    # ─── Okuma ──────────────────────────────────────
+    def ensure_synced(self, db_version: int) -> None:
+        """
+        Dosya yoksa, başka bir veritabanına aitse ya da sürümü db_version'dan
+        farklıysa (ileride de olsa: sıfırlanmış / geri yüklenmiş veritabanı)
+        yeniden kur.
+        """
+        db_uuid = _uuid_bytes(get_db_uuid())
+        current = self._open_header()
+        if current is not None and _is_current(current[1], db_version, db_uuid):
+            return
+        del current
+        with self._exclusive():
+            # Kilidi beklerken başka bir süreç kurmuş olabilir
+            current = self._open_header()
+            if current is not None and _is_current(current[1], db_version, db_uuid):
+                return
+            del current
+            self._rebuild_locked()
+
+    def load(self, db_version: Optional[int] = None):
+        """
+        (users, matris, normlar, id'ler) görünümlerini döndürür; hiçbiri kopya
+        değildir. db_version verilirse önce dosyanın güncelliği kontrol edilir.
+        """
+        if db_version is not None:
+            self.ensure_synced(db_version)
+
+        stat = os.stat(self.path)
+        key = (stat.st_ino, stat.st_size)
+        if self._map is None or self._map_key != key:
+            # Dosya değiştirildiyse (büyüme / silme) yeniden eşle; eski eşlemeyi
+            # kullanan snapshot'lar eski dosyayı görmeye devam eder
+            self._map = np.memmap(self.path, dtype=np.uint8, mode="r")
+            self._map_key = key
+
+        header, matrix, meta = self._views(self._map)
+        n = int(header["count"])
+        matrix, meta = matrix[:n], meta[:n]
+        return StoredUsers(matrix, meta), matrix, meta["norm"], meta["id"]
+
+    def header(self) -> Optional[dict]:
+        opened = self._open_header()
+        if opened is None:
+            return None
+        header = opened[1]
+        info = {name: header[name].item() for name in ("count", "capacity", "db_version", "generation")}
+        info["db_uuid"] = header["db_uuid"].tobytes().hex()
+        return info
+
+
+# ─── Şablon dosyası ────────────────────────────────
+# [başlık 80 B][matris: kapasite × D float32, birim şablonlar][meta: kapasite × TEMPLATE_META]
+# Satırlar sahip kullanıcı id'sine göre sıralıdır → her kullanıcının şablonları
+# bitişik bir bölümdür. user_embeddings yalnızca eklenir (kullanıcıyla birlikte
+# silinir); son görülen şablon id'si başlıkta tutulur.
+TEMPLATE_MAGIC   = b"FASTPL\x00\x00"
+TEMPLATE_VERSION = 1
+TEMPLATE_HEADER_DTYPE = np.dtype([
+    ("magic",      "S8"),
+    ("version",    "<u4"),
+    ("dim",        "<u4"),
+    ("count",      "<u8"),
+    ("capacity",   "<u8"),
+    ("db_version", "<i8"),     # Dosyanın yansıttığı gallery_version
+    ("last_id",    "<i8"),     # Dosyadaki en büyük user_embeddings.id
+    ("generation", "<u8"),
+    ("db_uuid",    "S16"),
+    ("reserved",   "S8"),
+])
+TEMPLATE_HEADER_SIZE = TEMPLATE_HEADER_DTYPE.itemsize
+
+TEMPLATE_META_DTYPE = np.dtype([
+    ("owner",    "<i8"),       # users.id
+    ("norm",     "<f4"),       # Orijinal şablon normu
+    ("reserved", "S4"),
+])
+
+
+def _template_meta(owners: np.ndarray, norms: np.ndarray) -> np.ndarray:
+    meta = np.zeros(len(owners), dtype=TEMPLATE_META_DTYPE)
+    meta["owner"] = owners
+    meta["norm"]  = norms
+    return meta
+
+
+@dataclass(frozen=True)
+class TemplateRows:
+    """TemplateStore.load() görünümleri; hiçbiri kopya değildir."""
+    owners:   np.ndarray            # (T,) sahip id'leri, artan
+    matrix:   np.ndarray            # (T×D) birim şablonlar (dosya sayfaları)
+    norms:    np.ndarray            # (T,)
+    file_key: Tuple[int, int]       # (inode, boyut): aynı kaldıkça ilk satırlar değişmez
+    capacity: int
+
+
+class TemplateStore:
+    """
+    user_embeddings tablosunun bellek eşlemeli kopyası (EmbeddingStore'un kardeşi).
+
+    Tüm süreçler aynı dosya sayfalarını okur; şablon matrisi süreç başına
+    kurulmaz. sync() dosyayı gallery_version + db_uuid'e göre günceller:
+    yalnızca son görülen id'den sonraki şablonlar okunur. Yeni kullanıcıların
+    şablonları (en büyük sahip id'sinden sonra) sona yerinde eklenir; silinen
+    kullanıcı ya da mevcut bir kullanıcıya eklenen şablon bölümleri
+    kaydırdığından dosya sıralı olarak yeniden yazılır (os.replace, okuyucular
+    eski eşlemeyi görmeye devam eder).
+    """
+
+    def __init__(self, path: str = TEMPLATE_STORE_PATH, dim: int = EMBEDDING_DIM):
+        self.path = path
+        self.dim  = dim
+        self._lock_path = path + ".lock"
+
+        self._map: Optional[np.memmap] = None
+        self._map_key: Optional[Tuple[int, int]] = None
+
+    # ─── Düşük seviye ───────────────────────────────
+    def _meta_offset(self, capacity: int) -> int:
+        return TEMPLATE_HEADER_SIZE + capacity * self.dim * 4
+
+    def _file_size(self, capacity: int) -> int:
+        return self._meta_offset(capacity) + capacity * TEMPLATE_META_DTYPE.itemsize
+
+    def _views(self, mm: np.memmap):
+        header = np.ndarray((), TEMPLATE_HEADER_DTYPE, buffer=mm, offset=0)
+        if header["magic"] != TEMPLATE_MAGIC or header["version"] != TEMPLATE_VERSION \
+                or header["dim"] != self.dim:
+            raise ValueError(f"Geçersiz şablon dosyası: {self.path}")
+        capacity = int(header["capacity"])
+        matrix = np.ndarray((capacity, self.dim), np.float32, buffer=mm, offset=TEMPLATE_HEADER_SIZE)
+        meta = np.ndarray((capacity,), TEMPLATE_META_DTYPE, buffer=mm,
+                          offset=self._meta_offset(capacity))
+        return header, matrix, meta
+
+    def _open_header(self, mode: str = "r"):
+        try:
+            mm = np.memmap(self.path, dtype=np.uint8, mode=mode)
+            return (mm,) + self._views(mm)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_file(
+        self,
+        matrix: np.ndarray,
+        meta: np.ndarray,
+        db_version: int,
+        last_id: int,
+        generation: int,
+        db_uuid: bytes
+    ) -> None:
+        n = len(meta)
+        capacity = max(MIN_CAPACITY, 1 << int(np.ceil(np.log2(max(n, 1) * 1.25 + 1))))
+        tmp = self.path + ".tmp"
+
+        mm = np.memmap(tmp, dtype=np.uint8, mode="w+", shape=(self._file_size(capacity),))
+        header = np.ndarray((), TEMPLATE_HEADER_DTYPE, buffer=mm, offset=0)
+        header["magic"], header["version"], header["dim"] = TEMPLATE_MAGIC, TEMPLATE_VERSION, self.dim
+        header["capacity"], header["db_version"], header["generation"] = capacity, db_version, generation
+        header["last_id"], header["db_uuid"] = last_id, db_uuid
+        _, out_matrix, out_meta = self._views(mm)
+        out_matrix[:n] = matrix
+        out_meta[:n] = meta
+        header["count"] = n
+        mm.flush()
+        del mm, header, out_matrix, out_meta
+
+        os.replace(tmp, self.path)
+
+    # ─── Yazma ──────────────────────────────────────
+    def sync(self, db_version: int) -> None:
+        """
+        Dosyayı db_version'a getirir. db_version şablonlardan önce okunmuş
+        olmalıdır: arada bir yazma olursa sayaç yine ilerler ve bir sonraki
+        senkronda yakalanır.
+        """
+        db_uuid = _uuid_bytes(get_db_uuid())
+        current = self._open_header()
+        if current is not None and _is_current(current[1], db_version, db_uuid):
+            return
+        del current
+        with _file_lock(self._lock_path):
+            opened = self._open_header("r+")
+            if opened is not None and _is_current(opened[1], db_version, db_uuid):
+                return
+            if db_version == -1 or opened is None or opened[1]["db_uuid"].tobytes() != db_uuid \
+                    or int(opened[1]["db_version"]) > db_version:
+                generation = int(opened[1]["generation"]) + 1 if opened is not None else 1
+                del opened
+                self._rebuild_locked(db_version, generation, db_uuid)
+                return
+            self._update_locked(opened, db_version, db_uuid)
+
+    def _rebuild_locked(self, db_version: int, generation: int, db_uuid: bytes) -> None:
+        ids, owners, raw = get_templates_since(0)
+        if not len(ids):
+            raw = np.zeros((0, self.dim), dtype=np.float32)
+        order = np.argsort(owners, kind="stable")
+        unit, norms = normalize_rows(raw[order])
+        last_id = int(ids.max()) if len(ids) else 0
+        self._write_file(unit, _template_meta(owners[order], norms), db_version, last_id,
+                         generation, db_uuid)
+
+    def _update_locked(self, opened, db_version: int, db_uuid: bytes) -> None:
+        mm, header, matrix, meta = opened
+        del opened
+        n = int(header["count"])
+        generation = int(header["generation"]) + 1
+        owners = meta["owner"][:n]
+
+        # Önce yeni şablonlar, sonra yaşayan kullanıcılar okunur: arada silinen
+        # bir kullanıcının az önce okunan şablonları da ayıklanır
+        ids, new_owners, raw = get_templates_since(int(header["last_id"]))
+        live = get_user_ids()
+        last_id = max(int(header["last_id"]), int(ids.max()) if len(ids) else 0)
+
+        alive = np.isin(new_owners, live)
+        order = np.argsort(new_owners[alive], kind="stable")
+        new_owners = new_owners[alive][order]
+        unit, norms = normalize_rows(raw[alive][order] if len(ids)
+                                     else np.zeros((0, self.dim), dtype=np.float32))
+        new_meta = _template_meta(new_owners, norms)
+        k = len(new_owners)
+
+        gone = ~np.isin(owners, live)
+        appendable = not gone.any() and (k == 0 or n == 0 or new_owners[0] >= owners[-1])
+        if appendable and n + k <= int(header["capacity"]):
+            if k:
+                # Önce veri, sonra sayaç (okuyucu yarım satır görmesin)
+                matrix[n:n + k] = unit
+                meta[n:n + k] = new_meta
+                mm.flush()
+                header["count"] = n + k
+            header["db_version"], header["last_id"], header["generation"] = db_version, last_id, generation
+            mm.flush()
+            return
+
+        # Silinen sahipler çıkar, yeni şablonlar sahip sırasına birleştirilir
+        keep = ~gone
+        merged_owners = np.concatenate([owners[keep], new_owners])
+        order = np.argsort(merged_owners, kind="stable")
+        merged_matrix = np.concatenate([matrix[:n][keep], unit])[order]
+        merged_meta = np.concatenate([meta[:n][keep], new_meta])[order]
+        del mm, header, matrix, meta, owners
+        self._write_file(merged_matrix, merged_meta, db_version, last_id, generation, db_uuid)
+
+    # ─── Okuma ──────────────────────────────────────
+    def load(self) -> TemplateRows:
+        stat = os.stat(self.path)
+        key = (stat.st_ino, stat.st_size)
+        if self._map is None or self._map_key != key:
+            self._map = np.memmap(self.path, dtype=np.uint8, mode="r")
+            self._map_key = key
+
+        header, matrix, meta = self._views(self._map)
+        n = int(header["count"])
+        return TemplateRows(
+            owners=meta["owner"][:n],
+            matrix=matrix[:n],
+            norms=meta["norm"][:n],
+            file_key=key,
+            capacity=int(header["capacity"]),
+        )
+
+    def header(self) -> Optional[dict]:
+        opened = self._open_header()
+        if opened is None:
+            return None
+        header = opened[1]
+        info = {name: header[name].item()
+                for name in ("count", "capacity", "db_version", "last_id", "generation")}
+        info["db_uuid"] = header["db_uuid"].tobytes().hex()
+        return info
@@ -0,0 +1,226 @@
+import threading
+import time
+from collections.abc import Sequence as SequenceABC
+from dataclasses import dataclass, replace
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from face_access_system.config.settings import (
+    EMBEDDING_DIM,
+    EMBEDDING_STORE_ENABLED,
+    GALLERY_MATRIX_DTYPE,
+    GALLERY_POLL_INTERVAL,
+    TEMPLATE_MATCH,
+)
+from face_access_system.database.crud import (
+    add_users_listener,
+    remove_users_listener,
+    get_all_users,
+    get_users_version,
+)
+from face_access_system.database.models import User
+from face_access_system.recognition.embedding_store import EmbeddingStore, TemplateStore
+from face_access_system.recognition.similarity import normalize_rows
+from face_access_system.recognition.quantization import GalleryMatrix, as_float32, quantize_matrix
+from face_access_system.recognition.templates import (
+    TEMPLATE_REDUCERS,
+    TemplateCache,
+    TemplateGallery,
+)
+
+
+def row_embedding(matrix: GalleryMatrix, norms: np.ndarray, row: int) -> np.ndarray:
+    """Galeri satırının orijinal ölçekli float32 embedding'i (nicemliyse açılmış)."""
+    row = int(row)
+    return as_float32(matrix[row:row + 1])[0] * norms[row]
+
+
+class SnapshotUsers(SequenceABC):
+    """
+    GallerySnapshot.build'in kullanıcı listesi. Embedding'ler yalnızca
+    (nicemli) galeri matrisinde durur; User istenen satır için kurulur ve
+    embedding'i matris satırından açılır (StoredUsers ile aynı yaklaşım).
+    """
+
+    def __init__(self, users: List[User], matrix: GalleryMatrix, norms: np.ndarray):
+        self._users  = [replace(u, embedding=None) for u in users]
+        self._matrix = matrix
+        self._norms  = norms
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return replace(self._users[index], embedding=row_embedding(self._matrix, self._norms, index))
+
+
+@dataclass(frozen=True)
+class GallerySnapshot:
+    users:  Sequence[User]  # Tembel SnapshotUsers ya da EmbeddingStore'dan StoredUsers
+    matrix: GalleryMatrix   # (N×D) birim satırlar; float32 ya da float16/int8 nicemli
+    norms:  np.ndarray      # (N,) orijinal embedding normları (her zaman float32)
+    ids:    np.ndarray      # (N,) int64 kullanıcı id'leri, satır sırasıyla
+    templates: Optional[TemplateGallery] = None   # Çok şablonlu eşleştirme açıksa
+
+    @classmethod
+    def build(
+        cls,
+        users: List[User],
+        matrix_dtype: str = GALLERY_MATRIX_DTYPE
+    ) -> "GallerySnapshot":
+        if not users:
+            return cls(
+                users=[],
+                matrix=quantize_matrix(np.zeros((0, EMBEDDING_DIM), dtype=np.float32),
+                                       matrix_dtype),
+                norms=np.zeros(0, dtype=np.float32),
+                ids=np.zeros(0, dtype=np.int64),
+            )
+
+        # float32 embedding'ler yalnızca matris kurulurken tutulur; snapshot
+        # kullanıcıları embedding'i matristen okur (kopya yok)
+        raw = np.stack([np.asarray(u.embedding, dtype=np.float32) for u in users])
+        unit, norms = normalize_rows(raw)
+        matrix = quantize_matrix(unit, matrix_dtype)
+        ids = np.fromiter((u.id for u in users), dtype=np.int64, count=len(users))
+        return cls(users=SnapshotUsers(users, matrix, norms), matrix=matrix, norms=norms, ids=ids)
+
+    @classmethod
+    def from_store(
+        cls,
+        store: EmbeddingStore,
+        db_version: Optional[int] = None,
+        matrix_dtype: str = GALLERY_MATRIX_DTYPE
+    ) -> "GallerySnapshot":
+        """
+        Bellek eşlemeli dosyadan kopyasız snapshot. float32'de matris dosya
+        sayfalarının kendisidir; nicemli tiplerde süreç başına bir kez
+        sıkıştırılır (kaynak yine paylaşılan sayfalardır).
+        """
+        users, matrix, norms, ids = store.load(db_version)
+        return cls(users=users, matrix=quantize_matrix(matrix, matrix_dtype), norms=norms, ids=ids)
+
+    def embedding(self, row: int) -> np.ndarray:
+        return row_embedding(self.matrix, self.norms, row)
+
+
+class GalleryCache:
+    """
+    Kayıtlı kullanıcıların bellekte tutulan kopyası.
+
+    Galeri bir kez yüklenir ve yalnızca users tablosu değiştiğinde yenilenir:
+      • Aynı süreçteki create/update/delete çağrıları crud dinleyicisiyle anında,
+      • Başka süreçlerin yazmaları gallery_version sayacıyla (poll_interval
+        saniyede en fazla bir kez) yakalanır.
+    Sorgular veritabanına dokunmaz.
+
+    store verilirse (varsayılan: EMBEDDING_STORE_ENABLED) kullanıcılar
+    BLOB'lardan değil bellek eşlemeli embedding dosyasından okunur.
+    template_match "max" / "mean" ise her snapshot'a kullanıcıların tüm
+    şablonları (TemplateGallery) eklenir; şablonlar süreçlerin paylaştığı
+    bellek eşlemeli TemplateStore dosyasından okunur.
+    """
+
+    def __init__(
+        self,
+        poll_interval: float = GALLERY_POLL_INTERVAL,
+        matrix_dtype: str = GALLERY_MATRIX_DTYPE,
+        store: Optional[EmbeddingStore] = None,
+        template_match: str = TEMPLATE_MATCH,
+        template_store: Optional[TemplateStore] = None
+    ):
+        self.poll_interval = poll_interval
+        self.matrix_dtype  = matrix_dtype
+        self._templates = (TemplateCache(template_match, matrix_dtype, template_store)
+                           if template_match in TEMPLATE_REDUCERS else None)
+
+        if store is None and EMBEDDING_STORE_ENABLED:
+            store = EmbeddingStore()
+        # Dosyanın dinleyicisi galerininkinden önce kaydedilir: yenileme
+        # tetiklendiğinde bu süreçteki değişiklik dosyaya yazılmış olur
+        self.store = store.attach() if store is not None else None
+
+        self._lock       = threading.Lock()
+        self._snapshot   = GallerySnapshot.build([], matrix_dtype)
+        self._stale      = True
+        self._db_version = None
+        self._last_poll  = 0.0
+
+        add_users_listener(self._on_users_changed)
+
+    def close(self) -> None:
+        """
+        crud dinleyicilerini (galeri + attach edilen dosya) kaldırır; aksi halde
+        modül düzeyindeki liste örneği canlı tutar ve her yazmada tetikler.
+        Tekrar çağrılabilir.
+        """
+        remove_users_listener(self._on_users_changed)
+        if self.store is not None:
+            self.store.close()
+
+    def _on_users_changed(self, event: str, user_id: int, version: int) -> None:
+        self._stale = True
+
+    def invalidate(self) -> None:
+        self._stale = True
+
+    def get_snapshot(self) -> GallerySnapshot:
+        if self._stale or self._poll_due():
+            self._refresh()
+        return self._snapshot
+
+    def get_users(self) -> List[User]:
+        return self.get_snapshot().users
+
+    def __len__(self) -> int:
+        return len(self.get_users())
+
+    def _poll_due(self) -> bool:
+        if self.poll_interval <= 0:
+            return False
+        return time.monotonic() - self._last_poll >= self.poll_interval
+
+    def _refresh(self) -> None:
+        with self._lock:
+            self._last_poll = time.monotonic()
+
+            # Sayaç kullanıcılardan önce okunur: arada bir yazma olursa bir
+            # sonraki kontrolde tekrar yüklenir, değişiklik kaçmaz.
+            version = get_users_version()
+            if not self._stale and version != -1 and version == self._db_version:
+                return
+
+            self._stale = False
+            if self.store is not None:
+                self._snapshot = GallerySnapshot.from_store(self.store, version, self.matrix_dtype)
+            else:
+                self._snapshot = GallerySnapshot.build(get_all_users(), self.matrix_dtype)
+            if self._templates is not None:
+                self._snapshot = replace(self._snapshot,
+                                         templates=self._templates.sync(self._snapshot, version))
+            self._db_version = version
+
+
+class StaticGallery:
+    """Veritabanından bağımsız, sabit kullanıcı listesiyle galeri (rapor/araçlar için)."""
+
+    def __init__(self, users: List[User], matrix_dtype: str = GALLERY_MATRIX_DTYPE):
+        self._snapshot = GallerySnapshot.build(users, matrix_dtype)
+
+    def close(self) -> None:
+        pass
+
+    def invalidate(self) -> None:
+        pass
+
+    def get_snapshot(self) -> GallerySnapshot:
+        return self._snapshot
+
+    def get_users(self) -> List[User]:
+        return self._snapshot.users
+
+    def __len__(self) -> int:
+        return len(self._snapshot.users)
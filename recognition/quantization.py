@@ -0,0 +1,115 @@
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from face_access_system.database.embedding_codec import (
+    QUANT_DTYPES,
+    INT8_MAX,
+    quantize_int8,
+    dequantize_int8,
+)
+
+
+# Satırlar bu boyutta parçalar halinde float32'ye açılıp BLAS ile çarpılır;
+# böylece bellekte yalnızca sıkıştırılmış matris kalıcı olarak durur.
+DOT_CHUNK_ROWS: int = 16384
+
+
+def int8_dot(q_a: np.ndarray, q_b: np.ndarray) -> np.ndarray:
+    """
+    (M×D)·(N×D)ᵀ tam sayı iç çarpımı, int32 biriktirme.
+
+    Referans gerçekleme; QuantizedMatrix.dot aynı sonucu float32 BLAS ile
+    verir: |Σ qa·qb| ≤ D·127² (D=128 için ~2.1M) < 2²⁴ olduğundan her ara
+    toplam float32'de tam olarak temsil edilir.
+    """
+    return np.matmul(q_a.astype(np.int32), q_b.astype(np.int32).T)
+
+
+class QuantizedMatrix:
+    """
+    Galeri eşleştirme matrisinin sıkıştırılmış hali (float16 veya int8).
+
+    data   : (N×D) float16 / int8
+    scales : (N,) float32 — yalnızca int8 için satır ölçekleri
+    """
+
+    def __init__(self, data: np.ndarray, scales: Optional[np.ndarray] = None):
+        self.data   = np.ascontiguousarray(data)
+        self.scales = scales
+
+    @classmethod
+    def from_float(cls, matrix: np.ndarray, dtype: str) -> "QuantizedMatrix":
+        if dtype == "int8":
+            q, scales = quantize_int8(matrix)
+            return cls(q, scales)
+        if dtype == "float16":
+            return cls(np.asarray(matrix, dtype=np.float16))
+        raise ValueError(f"Desteklenmeyen nicemleme tipi: {dtype}")
+
+    @property
+    def dtype(self) -> str:
+        return "int8" if self.scales is not None else "float16"
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.data.shape
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, rows) -> "QuantizedMatrix":
+        scales = self.scales[rows] if self.scales is not None else None
+        return QuantizedMatrix(self.data[rows], scales)
+
+    def to_float32(self) -> np.ndarray:
+        if self.scales is not None:
+            return dequantize_int8(self.data, self.scales)
+        return self.data.astype(np.float32)
+
+    def dot(self, queries: np.ndarray) -> np.ndarray:
+        """queries (M×D) float32 → (M×N) ≈ queries @ gallery.T"""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        out = np.empty((len(queries), len(self.data)), dtype=np.float32)
+
+        if self.scales is not None:
+            # Sorgu da int8'e indirgenir → tam sayı iç çarpımı × iki ölçek
+            q_int, q_scales = quantize_int8(queries)
+            q_vals = q_int.astype(np.float32)
+            for start in range(0, len(self.data), DOT_CHUNK_ROWS):
+                stop  = start + DOT_CHUNK_ROWS
+                block = self.data[start:stop].astype(np.float32)
+                out[:, start:stop] = (q_vals @ block.T) * self.scales[start:stop][None, :]
+            out *= q_scales[:, None]
+        else:
+            for start in range(0, len(self.data), DOT_CHUNK_ROWS):
+                stop  = start + DOT_CHUNK_ROWS
+                block = self.data[start:stop].astype(np.float32)
+                out[:, start:stop] = queries @ block.T
+
+        return out
+
+
+GalleryMatrix = Union[np.ndarray, QuantizedMatrix]
+
+
+def quantize_matrix(matrix: np.ndarray, dtype: str) -> GalleryMatrix:
+    if dtype == "float32":
+        return np.ascontiguousarray(matrix, dtype=np.float32)
+    return QuantizedMatrix.from_float(matrix, dtype)
+
+
+def as_float32(matrix: GalleryMatrix) -> np.ndarray:
+    if isinstance(matrix, QuantizedMatrix):
+        return matrix.to_float32()
+    return np.asarray(matrix, dtype=np.float32)
+
+
+def gallery_dot(queries: np.ndarray, matrix: GalleryMatrix) -> np.ndarray:
+    if isinstance(matrix, QuantizedMatrix):
+        return matrix.dot(queries)
+    return queries @ matrix.T
@@ -1,13 +1,22 @@
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Optional, List, Tuple, Union
 import numpy as np
 
-from face_access_system.config.settings import SIMILARITY_THRESHOLD
+from face_access_system.app_logging.metrics import metrics
+from face_access_system.config.settings import (
+    SIMILARITY_THRESHOLD,
+    RECOGNITION_TOP_K,
+    RECOGNITION_DEBUG_SCORES,
+    ANN_ENABLED,
+    ANN_MIN_GALLERY_SIZE,
+)
 from face_access_system.recognition.similarity import (
     compute_similarity,
+    similarity_matrix,
     SimilarityMethod,
 )
-from face_access_system.database.crud import get_all_users
+from face_access_system.recognition.gallery import GalleryCache, GallerySnapshot
+from face_access_system.recognition.ann_index import IVFIndex
 from face_access_system.database.models import User
 
 
@@ -16,42 +25,137 @@ class RecognitionResult:
     matched_user:  Optional[User]
     confidence:    float
     is_recognized: bool
-    all_scores:    List[tuple]
+    all_scores:    List[tuple]      # En iyi top_k (User, score); debug modda tüm galeri
 
 
 class FaceRecognizer:
     def __init__(
         self,
         threshold: float = SIMILARITY_THRESHOLD,
-        method: SimilarityMethod = SimilarityMethod.COSINE
+        method: SimilarityMethod = SimilarityMethod.COSINE,
+        gallery: Optional[GalleryCache] = None,
+        top_k: int = RECOGNITION_TOP_K,
+        debug_scores: bool = RECOGNITION_DEBUG_SCORES,
+        ann_index: Optional[IVFIndex] = None,
+        ann_min_gallery_size: int = ANN_MIN_GALLERY_SIZE
     ):
-        self.threshold = threshold
-        self.method    = method
-        print(f"[Recognizer] Threshold={threshold}, Method={method.value}")
+        if top_k < 1:
+            raise ValueError(f"top_k en az 1 olmalı: {top_k}")
+
+        self.threshold    = threshold
+        self.method       = method
+        self.gallery      = gallery if gallery is not None else GalleryCache()
+        self.top_k        = top_k
+        self.debug_scores = debug_scores
+        self.ann_min_gallery_size = ann_min_gallery_size
+
+        if ann_index is None and ANN_ENABLED:
+            ann_index = IVFIndex.load()
+        self.ann_index = ann_index
 
+        print(f"[Recognizer] Threshold={threshold}, Method={method.value}, TopK={top_k}")
+
+    def close(self) -> None:
+        self.gallery.close()
+
+    @metrics.timed("recognize_seconds", {"call": "single"})
     def recognize(self, query_embedding: np.ndarray) -> RecognitionResult:
-        all_users = get_all_users()
+        return self.recognize_batch([query_embedding])[0]
+
+    @metrics.timed("recognize_seconds", {"call": "batch"})
+    def recognize_batch(
+        self,
+        embeddings: Union[List[np.ndarray], np.ndarray]
+    ) -> List[RecognitionResult]:
+        if len(embeddings) == 0:
+            return []
 
-        if not all_users:
-            return RecognitionResult(
-                matched_user=None,
-                confidence=0.0,
-                is_recognized=False,
-                all_scores=[]
-            )
+        snapshot = self.gallery.get_snapshot()
 
-        scores: List[tuple] = []
+        if not snapshot.users:
+            return [
+                RecognitionResult(
+                    matched_user=None,
+                    confidence=0.0,
+                    is_recognized=False,
+                    all_scores=[]
+                )
+                for _ in range(len(embeddings))
+            ]
 
-        for user in all_users:
-            score = compute_similarity(
-                query_embedding,
-                user.embedding,
-                method=self.method
-            )
-            scores.append((user, score))
+        queries = np.asarray(embeddings, dtype=np.float32).reshape(len(embeddings), -1)
+        candidates = self._ann_candidates(queries, snapshot)
 
-        scores.sort(key=lambda x: x[1], reverse=True)
-        best_user, best_score = scores[0]
+        if candidates is None:
+            scores, rows = self._score_all(queries, snapshot)
+            return [
+                self._build_result(queries[i], scores[i], rows, snapshot)
+                for i in range(len(queries))
+            ]
+
+        results: List[RecognitionResult] = []
+        for query, rows in zip(queries, candidates):
+            if len(rows) == 0:
+                scores, rows = self._score_all(query, snapshot)
+                scores = scores[0]
+            elif snapshot.templates is not None:
+                scores = snapshot.templates.score(query, self.method, rows)[0]
+            else:
+                scores = similarity_matrix(
+                    query, snapshot.matrix[rows], snapshot.norms[rows], self.method
+                )[0]
+            results.append(self._build_result(query, scores, rows, snapshot))
+
+        return results
+
+    def _score_all(
+        self,
+        queries: np.ndarray,
+        snapshot: GallerySnapshot
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Tüm galeri → (puanlar, sütun → snapshot satırı eşlemesi | None).
+        Şablon modunda tüm şablonlar tek çarpımla puanlanır ve kimlik başına
+        segment-max / mean ile indirgenir.
+        """
+        if snapshot.templates is not None:
+            return snapshot.templates.score(queries, self.method), snapshot.templates.owner_rows
+        return similarity_matrix(queries, snapshot.matrix, snapshot.norms, self.method), None
+
+    def _ann_candidates(
+        self,
+        queries: np.ndarray,
+        snapshot: GallerySnapshot
+    ) -> Optional[List[np.ndarray]]:
+        if self.ann_index is None or len(snapshot.users) < self.ann_min_gallery_size:
+            return None
+
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        normed = queries / np.where(norms == 0, 1.0, norms)
+        return self.ann_index.search(normed, snapshot)
+
+    def _build_result(
+        self,
+        query: np.ndarray,
+        scores: np.ndarray,
+        rows: Optional[np.ndarray],
+        snapshot: GallerySnapshot
+    ) -> RecognitionResult:
+        order = self._top_indices(scores)
+        scores = scores[order]
+        if rows is not None:
+            order = rows[order]
+        ranked = [(snapshot.users[j], float(sc)) for j, sc in zip(order, scores)]
+
+        # En iyi aday skaler fonksiyonla, galeri matrisinin (nicemliyse
+        # açılmış) satırı üzerinden yeniden puanlanır → raporlanan güven değeri
+        # puanlanan veriyle compute_similarity'nin birebir aynısıdır.
+        best_user = ranked[0][0]
+        if snapshot.templates is not None:
+            best_score = snapshot.templates.rescore(query, order[0], self.method)
+        else:
+            best_score = compute_similarity(query, snapshot.embedding(order[0]), method=self.method)
+        ranked[0] = (best_user, best_score)
 
         lower_threshold = 0.9
         upper_threshold = 1.0
@@ -61,11 +165,16 @@ class FaceRecognizer:
             matched_user=best_user if is_recognized else None,
             confidence=best_score,
             is_recognized=is_recognized,
-            all_scores=scores
+            all_scores=ranked
         )
 
-    def recognize_batch(
-        self,
-        embeddings: List[np.ndarray]
-    ) -> List[RecognitionResult]:
-        return [self.recognize(emb) for emb in embeddings]
\ No newline at end of file
+    def _top_indices(self, scores: np.ndarray) -> np.ndarray:
+        # Tam sıralama yalnızca debug modda; aksi halde O(N) kısmi seçim
+        # (argpartition) ve yalnızca k aday sıralanır.
+        n = len(scores)
+        if self.debug_scores or self.top_k >= n:
+            order = np.argsort(-scores, kind="stable")
+            return order if self.debug_scores else order[:self.top_k]
+
+        candidates = np.argpartition(-scores, self.top_k - 1)[:self.top_k]
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
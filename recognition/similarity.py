@@ -1,6 +1,8 @@
 import numpy as np
 from enum import Enum
 
+from face_access_system.recognition.quantization import GalleryMatrix, gallery_dot
+
 
 class SimilarityMethod(Enum):
     COSINE = "cosine"
@@ -33,4 +35,52 @@ def compute_similarity(
         dist = l2_distance(a, b)
         return max(0.0, 1.0 - dist / 2.0)
     else:
-        raise ValueError(f"Bilinmeyen metot: {method}")
\ No newline at end of file
+        raise ValueError(f"Bilinmeyen metot: {method}")
+
+# ─── Vektörize galeri eşleştirme ───────────────────
+# Galeri, satırları birim uzunluğa normalize edilmiş (N×D) float32 matris ve
+# orijinal satır normlarıyla tutulur; bir sorgu tek bir matris-vektör,
+# M sorgu ise tek bir matris-matris çarpımıyla puanlanır.
+
+def normalize_rows(matrix: np.ndarray):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms  = np.linalg.norm(matrix, axis=1).astype(np.float32)
+
+    safe = np.where(norms == 0, 1.0, norms).astype(np.float32)
+    normalized = matrix / safe[:, None]
+    normalized[norms == 0] = 0.0
+
+    return np.ascontiguousarray(normalized, dtype=np.float32), norms
+
+
+def similarity_matrix(
+    queries: np.ndarray,
+    gallery: GalleryMatrix,
+    gallery_norms: np.ndarray,
+    method: SimilarityMethod = SimilarityMethod.COSINE
+) -> np.ndarray:
+    """
+    (M×D) sorgu ile normalize galeri (N×D) arasındaki (M×N) puan matrisi.
+    Puanlar compute_similarity ile aynı ölçektedir (float hassasiyetinde).
+    Galeri float16/int8 QuantizedMatrix olabilir; o durumda puanlar yaklaşıktır.
+    """
+    queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+    q_norms = np.linalg.norm(queries, axis=1).astype(np.float32)
+
+    if method == SimilarityMethod.COSINE:
+        safe = np.where(q_norms == 0, 1.0, q_norms).astype(np.float32)
+        scores = gallery_dot(queries / safe[:, None], gallery)
+        scores[q_norms == 0] = 0.0
+        return np.clip(scores, -1.0, 1.0)
+
+    elif method == SimilarityMethod.L2:
+        # ‖a − b‖² = ‖a‖² + ‖b‖² − 2‖b‖(b̂·a)
+        dots = gallery_dot(queries, gallery).astype(np.float64)
+        sq   = (q_norms.astype(np.float64) ** 2)[:, None] \
+             + (gallery_norms.astype(np.float64) ** 2)[None, :] \
+             - 2.0 * gallery_norms.astype(np.float64)[None, :] * dots
+        dist = np.sqrt(np.maximum(sq, 0.0))
+        return np.maximum(0.0, 1.0 - dist / 2.0).astype(np.float32)
+
+    else:
+        raise ValueError(f"Bilinmeyen metot: {method}")
@@ -0,0 +1,220 @@
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from face_access_system.config.settings import GALLERY_MATRIX_DTYPE
+from face_access_system.recognition.embedding_store import TemplateRows, TemplateStore
+from face_access_system.recognition.quantization import (
+    GalleryMatrix,
+    QuantizedMatrix,
+    as_float32,
+)
+from face_access_system.recognition.similarity import (
+    SimilarityMethod,
+    compute_similarity,
+    similarity_matrix,
+)
+
+# Kimlik başına şablon puanlarının birleştirilmesi
+TEMPLATE_REDUCERS = ("max", "mean")
+
+
+def segment_reduce(scores: np.ndarray, starts: np.ndarray, counts: np.ndarray, reduce: str) -> np.ndarray:
+    """
+    (M×T) şablon puanlarını kimliğe göre sıralı bitişik bölümler üzerinden
+    (M×U) kimlik puanına indirger. Bölümler boş olamaz (her kimliğin ≥1 şablonu var).
+    """
+    if reduce == "max":
+        return np.maximum.reduceat(scores, starts, axis=1)
+    if reduce == "mean":
+        return np.add.reduceat(scores, starts, axis=1) / counts[None, :]
+    raise ValueError(f"Bilinmeyen birleştirme: {reduce} (seçenekler: {TEMPLATE_REDUCERS})")
+
+
+@dataclass(frozen=True)
+class TemplateGallery:
+    """
+    Bir GallerySnapshot'a ait şablonlar; kimliğe göre sıralı ve bitişik.
+
+    matrix / norms : (T×D) birim şablonlar ve orijinal normları (TemplateStore
+                     dosya sayfaları; nicemli tiplerde süreç tamponu)
+    starts / counts: (S,) dosyadaki kimlik bölümlerinin başlangıcı ve uzunluğu
+    keep           : snapshot'ta bulunan bölümler (None → hepsi)
+    row_segment    : (N,) snapshot satırı → bölüm; -1 → şablonu yok
+    implicit_rows  : şablonu olmayan snapshot satırları; snapshot matrisindeki
+                     kendi satırlarıyla (kopyalanmadan) puanlanır
+    owner_rows     : puan sütunu → snapshot satırı (önce bölümler, sonra implicit_rows)
+    base_matrix / base_norms: snapshot.matrix / snapshot.norms
+    """
+    matrix:        GalleryMatrix
+    norms:         np.ndarray
+    starts:        np.ndarray
+    counts:        np.ndarray
+    keep:          Optional[np.ndarray]
+    row_segment:   np.ndarray
+    implicit_rows: np.ndarray
+    owner_rows:    np.ndarray
+    base_matrix:   GalleryMatrix
+    base_norms:    np.ndarray
+    reduce:        str = "max"
+
+    def __len__(self) -> int:
+        return len(self.norms)
+
+    def score(
+        self,
+        queries: np.ndarray,
+        method: SimilarityMethod,
+        rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        (M×D) sorgu → kimlik puanları. rows verilmezse (M×U), sütunlar
+        owner_rows sırasında; verilirse yalnızca o snapshot satırları
+        puanlanır ve (M×len(rows)) döner, sütunlar rows sırasında.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if rows is None:
+            parts = []
+            if len(self.norms):
+                scores = similarity_matrix(queries, self.matrix, self.norms, method)
+                reduced = segment_reduce(scores, self.starts, self.counts, self.reduce)
+                parts.append(reduced if self.keep is None else reduced[:, self.keep])
+            if len(self.implicit_rows):
+                # Galerinin tamamı tek çarpımla puanlanır (satır kopyası yok)
+                base = similarity_matrix(queries, self.base_matrix, self.base_norms, method)
+                parts.append(base[:, self.implicit_rows])
+            if not parts:
+                return np.zeros((len(queries), 0), dtype=np.float32)
+            return parts[0] if len(parts) == 1 else np.concatenate(parts, axis=1)
+
+        rows = np.asarray(rows, dtype=np.int64)
+        out = np.empty((len(queries), len(rows)), dtype=np.float32)
+        segments = self.row_segment[rows]
+        has = segments >= 0
+
+        if has.any():
+            # Aday kimliklerin bölümleri yan yana toplanır; yeni bölüm
+            # başlangıçları uzunlukların birikimli toplamıdır
+            owners = segments[has]
+            counts = self.counts[owners]
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+            picked = np.repeat(self.starts[owners] - starts, counts) + np.arange(counts.sum())
+            scores = similarity_matrix(queries, self.matrix[picked], self.norms[picked], method)
+            out[:, has] = segment_reduce(scores, starts, counts, self.reduce)
+        if not has.all():
+            plain = rows[~has]
+            out[:, ~has] = similarity_matrix(
+                queries, self.base_matrix[plain], self.base_norms[plain], method
+            )
+        return out
+
+    def rescore(self, query: np.ndarray, row: int, method: SimilarityMethod) -> float:
+        """Snapshot satırının şablonlarını skaler compute_similarity ile puanlar."""
+        row = int(row)
+        segment = self.row_segment[row]
+        if segment < 0:
+            embedding = as_float32(self.base_matrix[row:row + 1])[0] * self.base_norms[row]
+            return compute_similarity(query, embedding, method=method)
+
+        seg = slice(self.starts[segment], self.starts[segment] + self.counts[segment])
+        templates = as_float32(self.matrix[seg]) * self.norms[seg][:, None]
+        scores = [compute_similarity(query, t, method=method) for t in templates]
+        return float(max(scores) if self.reduce == "max" else np.mean(scores))
+
+
+class TemplateCache:
+    """
+    Snapshot'lara TemplateStore dosyasından TemplateGallery kurar.
+
+    Şablonlar tüm süreçlerin paylaştığı bellek eşlemeli dosyadadır; sync()
+    dosyayı yalnızca yeni / silinen şablonlar için günceller ve bölüm
+    sınırlarını sahip sütunundan çıkarır (şablon verisi kopyalanmaz). Nicemli
+    tiplerde süreç başına bir tampon tutulur: dosya değişmedikçe yalnızca sona
+    eklenen satırlar sıkıştırılır. Şablonu olmayan kullanıcılar snapshot
+    matrisindeki kendi satırlarıyla puanlanır.
+    """
+
+    def __init__(
+        self,
+        reduce: str = "max",
+        matrix_dtype: str = GALLERY_MATRIX_DTYPE,
+        store: Optional[TemplateStore] = None
+    ):
+        if reduce not in TEMPLATE_REDUCERS:
+            raise ValueError(f"Bilinmeyen birleştirme: {reduce} (seçenekler: {TEMPLATE_REDUCERS})")
+        self.reduce       = reduce
+        self.matrix_dtype = matrix_dtype
+        self.store        = store if store is not None else TemplateStore()
+
+        self._lock = threading.Lock()
+        self._quant: Optional[QuantizedMatrix] = None
+        self._quant_key: Optional[tuple] = None
+        self._quant_rows = 0
+
+    def _matrix(self, rows: TemplateRows) -> GalleryMatrix:
+        if self.matrix_dtype == "float32":
+            return rows.matrix
+
+        n = len(rows.matrix)
+        if self._quant is None or self._quant_key != rows.file_key or n < self._quant_rows:
+            # Dosya yeniden yazıldı → tampon dosya kapasitesiyle baştan kurulur
+            dim = rows.matrix.shape[1]
+            if self.matrix_dtype == "int8":
+                self._quant = QuantizedMatrix(np.zeros((rows.capacity, dim), dtype=np.int8),
+                                              np.zeros(rows.capacity, dtype=np.float32))
+            else:
+                self._quant = QuantizedMatrix(np.zeros((rows.capacity, dim), dtype=np.float16))
+            self._quant_key  = rows.file_key
+            self._quant_rows = 0
+
+        if n > self._quant_rows:
+            block = QuantizedMatrix.from_float(rows.matrix[self._quant_rows:n], self.matrix_dtype)
+            self._quant.data[self._quant_rows:n] = block.data
+            if block.scales is not None:
+                self._quant.scales[self._quant_rows:n] = block.scales
+            self._quant_rows = n
+        return self._quant[:n]
+
+    def sync(self, snapshot, db_version: int) -> TemplateGallery:
+        with self._lock:
+            self.store.sync(db_version)
+            rows = self.store.load()
+
+            owners = rows.owners
+            if len(owners):
+                boundary = np.flatnonzero(np.diff(owners)) + 1
+                starts = np.concatenate([[0], boundary]).astype(np.int64)
+            else:
+                starts = np.zeros(0, dtype=np.int64)
+            counts = np.diff(np.append(starts, len(owners))).astype(np.int64)
+
+            # Bölüm ↔ snapshot satırı eşlemesi; snapshot'ta olmayan sahipler
+            # (snapshot'tan sonra kaydedilmiş) puanlanır ama sütun almaz
+            snap_ids = np.asarray(snapshot.ids, dtype=np.int64)
+            sorter = np.argsort(snap_ids, kind="stable")
+            sorted_ids = snap_ids[sorter]
+            segment_ids = owners[starts]
+            pos = np.minimum(np.searchsorted(sorted_ids, segment_ids), max(len(sorted_ids) - 1, 0))
+            found = (sorted_ids[pos] == segment_ids) if len(sorted_ids) else np.zeros(len(starts), bool)
+            kept = np.flatnonzero(found)
+            segment_rows = sorter[pos[kept]] if len(sorted_ids) else np.zeros(0, dtype=np.int64)
+
+            row_segment = np.full(len(snap_ids), -1, dtype=np.int64)
+            row_segment[segment_rows] = kept
+            implicit_rows = np.flatnonzero(row_segment < 0)
+
+            return TemplateGallery(
+                matrix=self._matrix(rows),
+                norms=rows.norms,
+                starts=starts,
+                counts=counts,
+                keep=None if len(kept) == len(starts) else kept,
+                row_segment=row_segment,
+                implicit_rows=implicit_rows,
+                owner_rows=np.concatenate([segment_rows, implicit_rows]).astype(np.int64),
+                base_matrix=snapshot.matrix,
+                base_norms=snapshot.norms,
+                reduce=self.reduce,
+            )
@@ -0,0 +1,178 @@
+import sys
+import os
+import argparse
+import base64
+import http.client
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# face_access_system paketinin bulunduğu dizini path'a ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from face_access_system.config.settings import SERVICE_HOST, SERVICE_PORT, SERVICE_ENROLL_TOKEN
+
+# Servisi kamera olmadan örnek görüntülerle denemek için küçük istemci:
+#   python scripts/api_client.py recognize foto.jpg
+#   FAS_ENROLL_TOKEN=... python scripts/api_client.py enroll --name "Ayşe" a1.jpg a2.jpg
+#   python scripts/api_client.py bench --concurrency 16 --requests 500 foto.jpg
+#   python scripts/api_client.py watch
+
+
+class ServiceClient:
+    def __init__(
+        self,
+        host: str = SERVICE_HOST,
+        port: int = SERVICE_PORT,
+        timeout: float = 30.0,
+        token: str = SERVICE_ENROLL_TOKEN
+    ):
+        self.host, self.port, self.timeout = host, port, timeout
+        self.token = token
+        self._conn = None
+
+    def _request(self, method: str, path: str, body: bytes = b"", content_type: str = "application/json"):
+        # Bağlantı (keep-alive) yeniden kullanılır; koparsa bir kez yeniden açılır
+        headers = {"Content-Type": content_type}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        for attempt in range(2):
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self._conn.request(method, path, body=body, headers=headers)
+                response = self._conn.getresponse()
+                payload = json.loads(response.read() or b"{}")
+                if response.getheader("Connection", "").lower() == "close":
+                    self.close()
+                return response.status, payload
+            except (ConnectionError, http.client.HTTPException):
+                self.close()
+                if attempt:
+                    raise
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def health(self):
+        return self._request("GET", "/health")
+
+    def recognize(self, image: bytes, door: str = ""):
+        path = f"/recognize?door={door}" if door else "/recognize"
+        return self._request("POST", path, image, "image/jpeg")
+
+    def recognize_batch(self, images: list, door: str = ""):
+        body = {"images": [base64.b64encode(img).decode("ascii") for img in images]}
+        if door:
+            body["door"] = door
+        return self._request("POST", "/recognize/batch", json.dumps(body).encode("utf-8"))
+
+    def enroll(self, name: str, images: list, authorized: bool = True, external_id: str = ""):
+        body = {"name": name, "authorized": authorized,
+                "images": [base64.b64encode(img).decode("ascii") for img in images]}
+        if external_id:
+            body["external_id"] = external_id
+        return self._request("POST", "/enroll", json.dumps(body).encode("utf-8"))
+
+    def watch(self):
+        """/decisions NDJSON akışından kararları sırayla üretir."""
+        conn = http.client.HTTPConnection(self.host, self.port)
+        conn.request("GET", "/decisions")
+        response = conn.getresponse()
+        try:
+            while True:
+                line = response.readline()
+                if not line:
+                    break
+                yield json.loads(line)
+        finally:
+            conn.close()
+
+
+def _read(paths: list) -> list:
+    images = []
+    for path in paths:
+        with open(path, "rb") as f:
+            images.append(f.read())
+    return images
+
+
+def bench(args: argparse.Namespace) -> None:
+    images = _read(args.images)
+
+    def worker(n: int) -> list:
+        client, latencies = ServiceClient(args.host, args.port), []
+        for i in range(n):
+            start = time.perf_counter()
+            status, _ = client.recognize(images[i % len(images)], args.door)
+            if status != 200:
+                raise RuntimeError(f"HTTP {status}")
+            latencies.append(time.perf_counter() - start)
+        client.close()
+        return latencies
+
+    per_worker = max(1, args.requests // args.concurrency)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        latencies = sorted(l for ls in pool.map(worker, [per_worker] * args.concurrency) for l in ls)
+    elapsed = time.perf_counter() - start
+
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1e3
+    print(f"📊 {len(latencies)} istek, {args.concurrency} eşzamanlı: {len(latencies) / elapsed:.1f} istek/sn")
+    print(f"   gecikme p50={pct(0.50):.1f}ms p95={pct(0.95):.1f}ms p99={pct(0.99):.1f}ms")
+    _, health = ServiceClient(args.host, args.port).health()
+    print(f"   sunucu batch: {health['stats']['batch']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tanıma servisi için yerel istemci")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--door", default="")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("health")
+    p = sub.add_parser("recognize", help="Görüntü(ler)i tanı; birden çok görüntü tek batch isteğidir")
+    p.add_argument("images", nargs="+")
+    p = sub.add_parser("enroll", help="Görüntülerden tek kişi kaydet (görüntü başına bir şablon)")
+    p.add_argument("--name", required=True)
+    p.add_argument("--external-id", default="")
+    p.add_argument("--unauthorized", action="store_true")
+    p.add_argument("images", nargs="+")
+    sub.add_parser("watch", help="Kararları canlı izle")
+    p = sub.add_parser("bench", help="Eşzamanlı /recognize yükü; micro-batch etkisini ölçer")
+    p.add_argument("--concurrency", type=int, default=8)
+    p.add_argument("--requests", type=int, default=200)
+    p.add_argument("images", nargs="+")
+    args = parser.parse_args()
+
+    client = ServiceClient(args.host, args.port)
+    if args.command == "health":
+        result = client.health()
+    elif args.command == "recognize":
+        images = _read(args.images)
+        result = (client.recognize(images[0], args.door) if len(images) == 1
+                  else client.recognize_batch(images, args.door))
+    elif args.command == "enroll":
+        result = client.enroll(args.name, _read(args.images), not args.unauthorized, args.external_id)
+    elif args.command == "watch":
+        try:
+            for event in client.watch():
+                print(json.dumps(event, ensure_ascii=False))
+        except KeyboardInterrupt:
+            pass
+        return
+    else:
+        bench(args)
+        return
+
+    status, payload = result
+    print(f"HTTP {status}")
+    print(json.dumps(payload, ensure_ascii=False, indent=2))
+    sys.exit(0 if status == 200 else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import sys
+import os
+import time
+import argparse
+
+# face_access_system paketinin bulunduğu dizini path'a ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import cv2
+import numpy as np
+
+from face_access_system.vision.face_detector import FaceDetector
+
+RESOLUTIONS = {
+    "480p":  (640, 480),
+    "720p":  (1280, 720),
+    "1080p": (1920, 1080),
+    "4K":    (3840, 2160),
+}
+
+
+class _Point:
+    def __init__(self, x: int, y: int):
+        self.x, self.y = x, y
+
+
+class SyntheticShape:
+    """dlib.full_object_detection yerine geçen 68 noktalı sahte landmark seti."""
+
+    def __init__(self, cx: float, cy: float, size: float, angle_deg: float, rng):
+        # Kabaca yüz yerleşimi: çene çevresi, kaşlar, burun, gözler, ağız
+        base = np.zeros((68, 2))
+        t = np.linspace(-0.9, 0.9, 17)
+        base[0:17]  = np.c_[0.5 * np.sin(t * 1.6), 0.1 + 0.4 * np.cos(t * 1.6)]
+        base[17:27] = np.c_[np.linspace(-0.35, 0.35, 10), np.full(10, -0.3)]
+        base[27:36] = np.c_[np.r_[np.zeros(4), np.linspace(-0.1, 0.1, 5)],
+                            np.r_[np.linspace(-0.2, 0.05, 4), np.full(5, 0.1)]]
+        base[36:42] = np.c_[np.linspace(-0.3, -0.1, 6), np.full(6, -0.18)]
+        base[42:48] = np.c_[np.linspace(0.1, 0.3, 6), np.full(6, -0.18)]
+        base[48:68] = np.c_[0.2 * np.cos(np.linspace(0, 2 * np.pi, 20)),
+                            0.3 + 0.07 * np.sin(np.linspace(0, 2 * np.pi, 20))]
+
+        a = np.radians(angle_deg)
+        rot = np.array([[np.cos(a), -np.sin(a)], [np.sin(a), np.cos(a)]])
+        pts = (base @ rot.T) * size + [cx, cy] + rng.normal(0, 1.0, (68, 2))
+        self._points = [_Point(int(x), int(y)) for x, y in pts]
+
+    def part(self, i: int) -> _Point:
+        return self._points[i]
+
+
+def legacy_align(rgb: np.ndarray, shape, target: int = FaceDetector.TARGET_SIZE):
+    """Önceki gerçekleme: tüm kare döndürülür, sonra kırpılır (referans)."""
+    points = np.array([(shape.part(i).x, shape.part(i).y) for i in range(68)])
+    left_eye, right_eye = points[36:42].mean(axis=0), points[42:48].mean(axis=0)
+    angle = np.degrees(np.arctan2(right_eye[1] - left_eye[1], right_eye[0] - left_eye[0]))
+    center = points.mean(axis=0)
+
+    M = cv2.getRotationMatrix2D((int(center[0]), int(center[1])), angle, 1.0)
+    rotated = cv2.warpAffine(rgb, M, (rgb.shape[1], rgb.shape[0]))
+
+    new_pts = (M @ np.hstack([points, np.ones((68, 1))]).T).T
+    x_min = max(0, int(new_pts[:, 0].min()) - 30)
+    x_max = min(rotated.shape[1], int(new_pts[:, 0].max()) + 30)
+    y_min = max(0, int(new_pts[:, 1].min()) - 30)
+    y_max = min(rotated.shape[0], int(new_pts[:, 1].max()) + 30)
+    if x_max - x_min < 10 or y_max - y_min < 10:
+        return None
+    return cv2.resize(rotated[y_min:y_max, x_min:x_max], (target, target))
+
+
+def time_per_call(fn, repeats: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Yüz hizalama maliyeti: tüm kare ↔ yerel kırpma")
+    parser.add_argument("--faces", type=int, default=4, help="Kare başına yüz")
+    parser.add_argument("--face-size", type=int, default=120, help="Yüz genişliği (piksel)")
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    detector = FaceDetector()
+
+    print("\n" + "=" * 82)
+    print(f"  Hizalama maliyeti — yüz başına, {args.faces} yüz × {args.face_size}px")
+    print("=" * 82)
+    print(f"  {'çözünürlük':>10} | {'eski ms/yüz':>11} | {'yeni ms/yüz':>11} | "
+          f"{'hızlanma':>8} | {'max |Δpiksel|':>13} | {'ort |Δpiksel|':>13}")
+    print("-" * 82)
+
+    for name, (w, h) in RESOLUTIONS.items():
+        rgb = rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+        rgb = cv2.GaussianBlur(rgb, (7, 7), 0)
+        shapes = [
+            SyntheticShape(
+                cx=rng.uniform(args.face_size, w - args.face_size),
+                cy=rng.uniform(args.face_size, h - args.face_size),
+                size=args.face_size, angle_deg=rng.uniform(-20, 20), rng=rng,
+            )
+            for _ in range(args.faces)
+        ]
+
+        old = time_per_call(lambda: [legacy_align(rgb, s) for s in shapes], args.repeats)
+        new = time_per_call(lambda: [detector._align_face(rgb, s) for s in shapes], args.repeats)
+
+        diffs = [
+            np.abs(legacy_align(rgb, s).astype(np.int16)
+                   - detector._align_face(rgb, s).astype(np.int16))
+            for s in shapes
+        ]
+        max_diff  = max(int(d.max()) for d in diffs)
+        mean_diff = float(np.mean([d.mean() for d in diffs]))
+
+        print(f"  {name:>10} | {old / args.faces * 1e3:11.3f} | {new / args.faces * 1e3:11.3f} | "
+              f"{old / new:7.1f}x | {max_diff:13d} | {mean_diff:13.4f}")
+
+    print("=" * 82 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import sys
+import os
+import time
+import shutil
+import sqlite3
+import argparse
+import tempfile
+from contextlib import contextmanager
+
+# face_access_system paketinin bulunduğu dizini path'a ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+from face_access_system.config.settings import EMBEDDING_DIM
+from face_access_system.database import crud
+from face_access_system.database.db import ConnectionManager
+from face_access_system.scripts import init_db
+
+
+class LegacyConnectionManager:
+    """Önceki gerçekleme: her işlemde yeni bağlantı, varsayılan PRAGMA'lar (referans)."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @contextmanager
+    def get_connection(self, readonly: bool = False):
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def close_all(self) -> None:
+        pass
+
+
+def percentile_ms(samples, q: float) -> float:
+    return float(np.percentile(samples, q)) * 1e3
+
+
+def time_ops(fn, n: int):
+    samples = np.empty(n)
+    for i in range(n):
+        start = time.perf_counter()
+        fn(i)
+        samples[i] = time.perf_counter() - start
+    return samples
+
+
+def run(manager, users: int, ops: int, rng) -> dict:
+    # crud ve init_db modül düzeyindeki db_manager'ı kullanır → geçici olarak değiştir
+    saved = crud.db_manager, init_db.db_manager
+    crud.db_manager = init_db.db_manager = manager
+    try:
+        init_db.create_tables()
+        ids = [
+            crud.create_user(f"user_{i}", rng.normal(size=EMBEDDING_DIM).astype(np.float32)).id
+            for i in range(users)
+        ]
+        write = time_ops(lambda i: crud.create_access_log(ids[i % users], 0.95, True), ops)
+        read = time_ops(lambda i: crud.get_user_by_id(ids[(i * 7919) % users]), ops)
+    finally:
+        manager.close_all()
+        crud.db_manager, init_db.db_manager = saved
+    return {"create_access_log": write, "get_user_by_id": read}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite işlem başına gecikme: eski ↔ havuzlu bağlantı")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_db_")
+    try:
+        results = {}
+        for name, manager in (
+            ("eski",    LegacyConnectionManager(os.path.join(workdir, "legacy.db"))),
+            ("havuzlu", ConnectionManager(os.path.join(workdir, "pooled.db"))),
+        ):
+            results[name] = run(manager, args.users, args.ops, np.random.default_rng(args.seed))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n" + "=" * 78)
+    print(f"  SQLite işlem gecikmesi — {args.users} kullanıcı, işlem başına {args.ops} ölçüm")
+    print("=" * 78)
+    print(f"  {'işlem':>18} | {'bağlantı':>8} | {'ort ms':>8} | {'p50 ms':>8} | {'p99 ms':>8} | {'hızlanma':>8}")
+    print("-" * 78)
+    for op in ("create_access_log", "get_user_by_id"):
+        base = results["eski"][op].mean()
+        for name in ("eski", "havuzlu"):
+            s = results[name][op]
+            print(f"  {op:>18} | {name:>8} | {s.mean() * 1e3:8.3f} | {percentile_ms(s, 50):8.3f} | "
+                  f"{percentile_ms(s, 99):8.3f} | {base / s.mean():7.1f}x")
+    print("=" * 78 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+import sys
+import os
+import re
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+from datetime import datetime
+
+# face_access_system paketinin bulunduğu dizini path'a ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# Tekrarlanabilirlik: BLAS varsayılan olarak tek iş parçacığı (numpy içe
+# aktarılmadan önce ayarlanmalı); ortamda açıkça verilmişse ona dokunulmaz
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+import cv2
+import numpy as np
+
+from face_access_system.config.settings import GALLERY_MATRIX_DTYPE
+from face_access_system.database import crud
+from face_access_system.database.db import ConnectionManager
+from face_access_system.database.models import User
+from face_access_system.recognition.ann_index import IVFIndex
+from face_access_system.recognition.gallery import StaticGallery
+from face_access_system.recognition.quantization import quantize_matrix
+from face_access_system.recognition.recognizer import FaceRecognizer
+from face_access_system.recognition.similarity import SimilarityMethod, normalize_rows, similarity_matrix
+from face_access_system.scripts import init_db
+from face_access_system.scripts.ann_recall_report import make_gallery
+from face_access_system.scripts.bench_alignment import SyntheticShape
+from face_access_system.vision.embedding_extractor import EmbeddingExtractor
+from face_access_system.vision.face_detector import DLIB_AVAILABLE, FaceDetector
+
+# Sıcak yol ölçüm takımı. Her durum sabit tohumlu sentetik veriyle kurulur,
+# ısındırılır ve en az --min-time saniye tekrar edilir; çağrı başına süreler
+# medyan / p95 / MAD olarak JSON'a yazılır. --baseline ile önceki bir JSON'a
+# göre karşılaştırılır: medyan hem 1 + tolerans oranını hem de tabanın gürültü
+# bandını (p95, medyan + NOISE_MADS × MAD) aşarsa gerileme, çıkış kodu 1.
+
+RESOLUTIONS = {"480p": (640, 480), "720p": (1280, 720)}
+QUERY_BATCH = 16        # Kare başına yüz (recognize_batch / extract_batch)
+LOG_BATCH = 64          # AccessLogWriter varsayılan batch'i
+
+
+# ─── Ölçüm ─────────────────────────────────────────
+# Tek örnek en az bu kadar sürsün; µs düzeyindeki çağrılar döngüyle ölçülür
+# (zamanlayıcı çözünürlüğü ve önbellek dalgalanması ortalanır)
+MIN_SAMPLE_SEC = 1e-3
+
+
+def measure(fn, min_time: float, max_reps: int, warmup: int = 2) -> np.ndarray:
+    """Çağrı başına süre örnekleri (sn)."""
+    for _ in range(warmup):
+        fn()
+
+    # timeit.autorange gibi: örnek başına çağrı sayısı 1, 2, 4, ... ile ayarlanır
+    inner = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(inner):
+            fn()
+        if time.perf_counter() - start >= MIN_SAMPLE_SEC or inner >= 1024:
+            break
+        inner *= 2
+
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < max_reps and (len(samples) < 5 or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        for _ in range(inner):
+            fn()
+        samples.append((time.perf_counter() - start) / inner)
+    return np.asarray(samples)
+
+
+def summarize(samples: np.ndarray, items: int) -> dict:
+    median = float(np.median(samples))
+    return {
+        "median_ms": round(median * 1e3, 4),
+        "p95_ms":    round(float(np.percentile(samples, 95)) * 1e3, 4),
+        # Ortanca mutlak sapma: tek tük uç örneklerden etkilenmeyen yayılım
+        "mad_ms":    round(float(np.median(np.abs(samples - median))) * 1e3, 4),
+        "mean_ms":   round(float(samples.mean()) * 1e3, 4),
+        "reps":      int(len(samples)),
+        "items":     items,
+        "items_per_sec": round(items / median, 1) if median > 0 else 0.0,
+    }
+
+
+# ─── Sentetik veri ─────────────────────────────────
+def synthetic_frame(w: int, h: int, faces: int, rng: np.random.Generator) -> np.ndarray:
+    """Bulanık gürültü üzerine kaba yüz çizimleri (oval, gözler, ağız)."""
+    frame = cv2.GaussianBlur(rng.integers(0, 256, (h, w, 3), dtype=np.uint8), (9, 9), 0)
+    size = h // 5
+    for _ in range(faces):
+        cx, cy = int(rng.uniform(size, w - size)), int(rng.uniform(size, h - size))
+        cv2.ellipse(frame, (cx, cy), (size // 2, int(size * 0.65)), 0, 0, 360, (150, 180, 220), -1)
+        for dx in (-size // 5, size // 5):
+            cv2.circle(frame, (cx + dx, cy - size // 8), size // 14, (30, 30, 30), -1)
+        cv2.ellipse(frame, (cx, cy + size // 4), (size // 5, size // 14), 0, 0, 360, (60, 60, 140), -1)
+    return frame
+
+
+def synthetic_users(size: int, rng: np.random.Generator):
+    gallery = make_gallery(size, rng)
+    created = datetime(2024, 1, 1)
+    users = [User(id=i + 1, name=f"user_{i}", embedding=gallery[i], is_authorized=True,
+                  created_at=created) for i in range(size)]
+    return gallery, users
+
+
+def synthetic_queries(gallery: np.ndarray, n: int, rng: np.random.Generator) -> np.ndarray:
+    picks = gallery[rng.integers(0, len(gallery), n)]
+    return (picks + 0.05 * rng.standard_normal(picks.shape)).astype(np.float32)
+
+
+# ─── Durumlar ──────────────────────────────────────
+def vision_cases(rng: np.random.Generator):
+    """(ad, çağrı başına öğe, fonksiyon, ek bilgi) üretir."""
+    detector = FaceDetector()
+    for name, (w, h) in RESOLUTIONS.items():
+        frame = synthetic_frame(w, h, faces=3, rng=rng)
+        found = len(detector.detect_faces(frame))
+        yield f"detect/{name}", 1, lambda f=frame: detector.detect_faces(f), {"faces_found": found}
+
+    rgb = cv2.GaussianBlur(rng.integers(0, 256, (720, 1280, 3), dtype=np.uint8), (7, 7), 0)
+    shape = SyntheticShape(cx=640, cy=360, size=120, angle_deg=12.0, rng=rng)
+    yield "align/720p", 1, lambda: detector._align_face(rgb, shape), {}
+
+    # Ölçüm depoya dosya bırakmaz: projeksiyon yalnızca bellekte kurulur
+    extractor = EmbeddingExtractor(fallback_cache_path=None)
+    crops = [cv2.GaussianBlur(rng.integers(0, 256, (150, 150, 3), dtype=np.uint8), (5, 5), 0)
+             for _ in range(QUERY_BATCH)]
+    yield "extract/single", 1, lambda: extractor.extract(crops[0]), {}
+    yield f"extract/batch{QUERY_BATCH}", QUERY_BATCH, lambda: extractor.extract_batch(crops), {}
+
+
+def matching_cases(sizes, seed: int, ann_min: int, wanted=lambda name: True):
+    for size in sizes:
+        # Büyük galeriyi kurmak ölçümden uzun sürer; filtre hiçbir durumu seçmiyorsa atla
+        names = [f"similarity/{size}/q1", f"similarity/{size}/q{QUERY_BATCH}",
+                 f"recognize_batch/{size}/exact", f"recognize_batch/{size}/ivf"]
+        if not any(wanted(name) for name in names):
+            continue
+        # Boyut başına ayrı tohum: atlanan boyutlar diğerlerinin verisini değiştirmez
+        rng = np.random.default_rng([seed, size])
+        gallery, users = synthetic_users(size, rng)
+        queries = synthetic_queries(gallery, QUERY_BATCH, rng)
+
+        unit, norms = normalize_rows(gallery)
+        matrix = quantize_matrix(unit, GALLERY_MATRIX_DTYPE)
+        yield (f"similarity/{size}/q1", 1,
+               lambda m=matrix, n=norms, q=queries[:1]: similarity_matrix(q, m, n, SimilarityMethod.COSINE), {})
+        yield (f"similarity/{size}/q{QUERY_BATCH}", QUERY_BATCH,
+               lambda m=matrix, n=norms, q=queries: similarity_matrix(q, m, n, SimilarityMethod.COSINE), {})
+
+        static = StaticGallery(users)
+        brute = FaceRecognizer(gallery=static, ann_index=IVFIndex(path=None), ann_min_gallery_size=sys.maxsize)
+        batch = list(queries)
+        yield (f"recognize_batch/{size}/exact", QUERY_BATCH,
+               lambda r=brute, b=batch: r.recognize_batch(b), {})
+
+        if size >= ann_min:
+            # search() eşitlemeyi arka plana verir → ölçümden önce eşzamanlı kur
+            index = IVFIndex(path=None)
+            index.sync(static.get_snapshot())
+            ivf = FaceRecognizer(gallery=static, ann_index=index, ann_min_gallery_size=0)
+            yield (f"recognize_batch/{size}/ivf", QUERY_BATCH,
+                   lambda r=ivf, b=batch: r.recognize_batch(b), {"nlist": index.nlist or len(index.centroids)})
+        del gallery, users, static
+
+
+def log_write_cases(workdir: str, rng: np.random.Generator):
+    # crud / init_db modül düzeyindeki db_manager'ı kullanır → geçici veritabanına yönlendir
+    manager = ConnectionManager(os.path.join(workdir, "bench.db"))
+    saved = crud.db_manager, init_db.db_manager
+    crud.db_manager = init_db.db_manager = manager
+    try:
+        init_db.create_tables()
+        now = datetime.now()
+        rows = [(int(u), 0.95, bool(u % 2), now, "bench") for u in rng.integers(1, 1000, LOG_BATCH)]
+        yield "log_write/single", 1, lambda: crud.create_access_log(1, 0.95, True, door="bench"), {}
+        yield f"log_write/batch{LOG_BATCH}", LOG_BATCH, lambda: crud.create_access_logs(rows), {}
+    finally:
+        manager.close_all()
+        crud.db_manager, init_db.db_manager = saved
+
+
+# ─── Ortam / karşılaştırma ─────────────────────────
+def environment() -> dict:
+    return {
+        "python":   platform.python_version(),
+        "numpy":    np.__version__,
+        "opencv":   cv2.__version__,
+        "machine":  platform.machine(),
+        "system":   platform.system(),
+        "cpu_count": os.cpu_count(),
+        "cv2_threads": cv2.getNumThreads(),
+        "dlib":     DLIB_AVAILABLE,
+        "gallery_matrix_dtype": GALLERY_MATRIX_DTYPE,
+        "blas_threads": {k: os.environ.get(k) for k in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")},
+    }
+
+
+# Karşılaştırmayı anlamsızlaştıran ortam farkları
+COMPARABLE_KEYS = ("machine", "cpu_count", "dlib", "gallery_matrix_dtype", "cv2_threads")
+
+# Gürültü bandı: taban medyanı + bu kadar ölçekli MAD (normal dağılımda ~3σ)
+NOISE_MADS = 3 * 1.4826
+
+
+def noise_limit_ms(base: dict) -> float:
+    """Tabanın kendi ölçümünde görülen üst sınır; bunun altındaki medyan gürültüdür."""
+    limit = base.get("p95_ms", base["median_ms"])
+    if "mad_ms" in base:   # Eski taban dosyalarında yok
+        limit = max(limit, base["median_ms"] + NOISE_MADS * base["mad_ms"])
+    return limit
+
+
+def compare(current: dict, baseline: dict, tolerance: float):
+    """
+    (ad, taban ms, şimdiki ms, oran, gürültü sınırı ms, durum) listesi; yalnızca
+    iki tarafta da olan durumlar. Disk / fsync gibi dalgalı durumlarda oran tek
+    başına toleransı aşabilir; gerileme sayılması için şimdiki medyanın tabanın
+    gürültü bandının da dışında kalması gerekir.
+    """
+    rows = []
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or base["median_ms"] <= 0:
+            continue
+        ratio = cur["median_ms"] / base["median_ms"]
+        limit = noise_limit_ms(base)
+        if ratio > 1 + tolerance:
+            status = "YAVAŞ" if cur["median_ms"] > limit else "gürültü"
+        else:
+            status = "hızlı" if ratio < 1 - tolerance else "ok"
+        rows.append((name, base["median_ms"], cur["median_ms"], ratio, limit, status))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Tanıma sıcak yolu ölçüm takımı (sentetik veri, kamera / dlib modeli gerekmez)"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="Sentetik galeri boyutları (1_000_000 ~1 GB bellek ister)")
+    parser.add_argument("--ann-min", type=int, default=100_000, help="Bu boyuttan itibaren IVF durumu da ölçülür")
+    parser.add_argument("--filter", default="", help="Yalnızca adı bu regex'e uyan durumlar")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Durum başına en az ölçüm süresi (sn)")
+    parser.add_argument("--max-reps", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=1,
+                        help="OpenCV iş parçacığı (BLAS: OMP/OPENBLAS_NUM_THREADS, varsayılan 1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Sonuç JSON dosyası")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki sonuç JSON'u")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Gerileme eşiği (0.15 = %%15)")
+    args = parser.parse_args()
+
+    cv2.setNumThreads(args.threads)
+    pattern = re.compile(args.filter) if args.filter else None
+    wanted = (lambda name: bool(pattern.search(name))) if pattern else (lambda name: True)
+    workdir = tempfile.mkdtemp(prefix="bench_suite_")
+
+    report = {"created": datetime.now().isoformat(timespec="seconds"), "env": environment(),
+              "args": {"sizes": args.sizes, "seed": args.seed, "min_time": args.min_time,
+                       "threads": args.threads},
+              "results": {}}
+    try:
+        # Her grup kendi tohumundan: bir grubu filtrelemek diğerlerinin verisini değiştirmez
+        groups = [
+            vision_cases(np.random.default_rng(args.seed)),
+            matching_cases(args.sizes, args.seed + 1, args.ann_min, wanted),
+            log_write_cases(workdir, np.random.default_rng(args.seed + 2)),
+        ]
+        for group in groups:
+            for name, items, fn, extra in group:
+                if not wanted(name):
+                    continue
+                result = summarize(measure(fn, args.min_time, args.max_reps), items)
+                result.update(extra)
+                report["results"][name] = result
+                print(f"  {name:32s} {result['median_ms']:10.4f} ms  (p95 {result['p95_ms']:.4f}, "
+                      f"{result['items_per_sec']:,.0f}/sn, n={result['reps']})")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Sonuçlar: {args.output}")
+
+    if not args.baseline:
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    diff = {k: (baseline["env"].get(k), report["env"].get(k)) for k in COMPARABLE_KEYS
+            if baseline["env"].get(k) != report["env"].get(k)}
+    rows = compare(report, baseline, args.tolerance)
+
+    print("\n" + "=" * 92)
+    print(f"  Taban: {args.baseline} ({baseline.get('created', '?')}), tolerans %{args.tolerance * 100:.0f}")
+    if diff:
+        print(f"  ⚠️  Ortam farklı, oranlar karşılaştırılamayabilir: {diff}")
+    print("=" * 92)
+    print(f"  {'durum':32s} | {'taban ms':>10} | {'şimdi ms':>10} | {'oran':>6} | {'gürültü ms':>10} |")
+    print("-" * 92)
+    for name, base, cur, ratio, limit, status in rows:
+        print(f"  {name:32s} | {base:10.4f} | {cur:10.4f} | {ratio:5.2f}x | {limit:10.4f} | {status}")
+    print("=" * 92)
+
+    regressions = [r for r in rows if r[5] == "YAVAŞ"]
+    if regressions:
+        print(f"❌ {len(regressions)} durumda gerileme.")
+        sys.exit(1)
+    print("✅ Gerileme yok.")
+
+
+if __name__ == "__main__":
+    main()
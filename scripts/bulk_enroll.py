@@ -0,0 +1,66 @@
+import sys
+import os
+import argparse
+
+# face_access_system paketinin bulunduğu dizini path'a ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from face_access_system.config.settings import (
+    ENROLL_WORKERS,
+    ENROLL_BATCH_SIZE,
+    ENROLL_MAX_TEMPLATES,
+    ENROLL_MIN_TEMPLATES,
+)
+from face_access_system.pipeline.enrollment import read_manifest, run_bulk_enrollment, scan_directory
+from face_access_system.scripts.init_db import create_tables
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Görüntü dizininden ya da manifest'ten toplu yüz kaydı (yarıda kalırsa kaldığı yerden devam eder)"
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--dir", help="<kişi>/*.jpg alt dizinleri ya da <kişi>.jpg dosyaları")
+    source.add_argument("--manifest", help="CSV: external_id,name,image[,authorized]")
+    parser.add_argument("--workers", type=int, default=ENROLL_WORKERS, help="0 = CPU çekirdek sayısı")
+    parser.add_argument("--batch-size", type=int, default=ENROLL_BATCH_SIZE, help="Transaction başına kişi")
+    parser.add_argument("--max-templates", type=int, default=ENROLL_MAX_TEMPLATES)
+    parser.add_argument("--min-templates", type=int, default=ENROLL_MIN_TEMPLATES)
+    parser.add_argument("--unauthorized", action="store_true",
+                        help="Kişileri yetkisiz kaydet (manifest'teki authorized sütunu önceliklidir)")
+    args = parser.parse_args()
+
+    create_tables()
+
+    authorized = not args.unauthorized
+    if args.dir:
+        items = scan_directory(args.dir, authorized)
+    else:
+        items = read_manifest(args.manifest, authorized)
+    print(f"📂 {len(items)} kişi, {sum(len(i.images) for i in items)} görüntü bulundu.")
+
+    report = run_bulk_enrollment(
+        items,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        max_templates=args.max_templates,
+        min_templates=args.min_templates,
+    )
+
+    print("\n" + "=" * 50)
+    print(f"  {'⚠️  YARIDA KESİLDİ' if report.interrupted else '✅ TOPLU KAYIT TAMAMLANDI'}")
+    print(f"     Kaydedilen kişi:   {report.enrolled} ({report.templates} şablon)")
+    print(f"     Atlanan (önceden): {report.skipped}")
+    print(f"     Başarısız kişi:    {len(report.failed)}")
+    print(f"     Görüntü:           {report.images} "
+          f"(yüz yok: {report.no_face}, okunamadı: {report.unreadable}, "
+          f"hata: {report.errors}, çoklu yüz: {report.multi_face})")
+    print(f"     Süre:              {report.elapsed:.1f} sn — {report.images_per_sec:.1f} görüntü/sn")
+    print("=" * 50)
+    if report.failed:
+        print("Yüz bulunamayan kişiler: " + ", ".join(report.failed[:20])
+              + (" ..." if len(report.failed) > 20 else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import sys
+import os
+import argparse
+from datetime import datetime
+
+# face_access_system paketinin bulunduğu dizini path'a ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from face_access_system.database.export import EXPORT_FORMATS, export_logs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="access_logs'u CSV / NDJSON olarak dışa aktar (sabit bellek)")
+    parser.add_argument("--out", default="-", help="Çıktı dosyası ('-' = stdout, .gz → sıkıştırılmış)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    parser.add_argument("--gzip", action="store_true", help="Uzantıdan bağımsız gzip ile yaz")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Başlangıç (ISO, dahil)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Bitiş (ISO, hariç)")
+    parser.add_argument("--door")
+    parser.add_argument("--user-id", type=int)
+    parser.add_argument("--denied-only", action="store_true")
+    args = parser.parse_args()
+
+    filters = dict(door=args.door, user_id=args.user_id,
+                   granted=False if args.denied_only else None)
+    target = sys.stdout if args.out == "-" else args.out
+    rows = export_logs(target, args.format, args.since, args.until,
+                       compress=True if args.gzip else None, **filters)
+    print(f"✅ {rows} kayıt aktarıldı.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
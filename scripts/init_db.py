@@ -1,47 +1,186 @@
 import sys
 import os
+import uuid
 
-# Proje kök dizinini path'a ekle
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# face_access_system paketinin bulunduğu dizini path'a ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from database.db import db_manager
+from face_access_system.database.db import db_manager
+from face_access_system.database.timeutil import iso_to_epoch_us
 
+# PRAGMA user_version ile tutulur
+#   0 → ISO TEXT zaman damgaları (eski şema)
+#   1 → epoch mikrosaniye INTEGER (ts / created_ts) + kapsayan index'ler
+#   2 → access_logs.door (kapı / kamera) + toplama index'i
+#   3 → user_embeddings (kullanıcı başına birden çok şablon) + enrollments
+#   4 → gallery_version.db_uuid (embedding dosyasını veritabanına bağlar)
+SCHEMA_VERSION = 4
 
-
-
-def create_tables() -> None:
-    create_users = """
+CREATE_USERS = """
     CREATE TABLE IF NOT EXISTS users (
         id            INTEGER PRIMARY KEY AUTOINCREMENT,
         name          TEXT NOT NULL,
         embedding     BLOB NOT NULL,
         is_authorized INTEGER NOT NULL DEFAULT 1,
-        created_at    TEXT NOT NULL
+        created_ts    INTEGER NOT NULL          -- epoch mikrosaniye
     );
     """
 
-    create_logs = """
+CREATE_LOGS = """
     CREATE TABLE IF NOT EXISTS access_logs (
         id             INTEGER PRIMARY KEY AUTOINCREMENT,
         user_id        INTEGER,
         confidence     REAL NOT NULL,
         access_granted INTEGER NOT NULL,
-        timestamp      TEXT NOT NULL,
+        ts             INTEGER NOT NULL,        -- epoch mikrosaniye
+        door           TEXT,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+    );
+    """
+
+# Kullanıcının tüm örnek embedding'leri; users.embedding bunların ortalamasıdır
+CREATE_USER_EMBEDDINGS = """
+    CREATE TABLE IF NOT EXISTS user_embeddings (
+        id         INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id    INTEGER NOT NULL,
+        embedding  BLOB NOT NULL,
+        created_ts INTEGER NOT NULL,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+    );
+    """
+
+# Toplu kayıtta dış kimlik (personel no / dizin adı) → kullanıcı; yarıda kalan
+# bir içe aktarma buradan devam eder
+CREATE_ENROLLMENTS = """
+    CREATE TABLE IF NOT EXISTS enrollments (
+        external_id TEXT PRIMARY KEY,
+        user_id     INTEGER NOT NULL,
+        images      INTEGER NOT NULL,
+        created_ts  INTEGER NOT NULL,
         FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
     );
     """
 
+
+def _columns(conn, table: str) -> set:
+    return {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _migrate_text_timestamps(conn) -> bool:
+    """
+    ISO TEXT zaman damgalı eski tabloları yerinde (tek transaction'da) yeniden
+    kurar: veri yeni tabloya dönüştürülerek kopyalanır, eski tablo silinir ve
+    yeni tablo eski adı alır. id'ler korunur.
+    """
+    migrated = False
+    conn.create_function("iso_to_us", 1, iso_to_epoch_us, deterministic=True)
+
+    if "created_at" in _columns(conn, "users"):
+        conn.execute(CREATE_USERS.replace("users (", "users_new (", 1))
+        conn.execute("""
+            INSERT INTO users_new (id, name, embedding, is_authorized, created_ts)
+            SELECT id, name, embedding, is_authorized, iso_to_us(created_at) FROM users
+        """)
+        conn.execute("DROP TABLE users")
+        conn.execute("ALTER TABLE users_new RENAME TO users")
+        # Tablo değişti → galeri önbellekleri yeniden yüklensin
+        conn.execute("UPDATE gallery_version SET version = version + 1 WHERE id = 1")
+        migrated = True
+
+    if "timestamp" in _columns(conn, "access_logs"):
+        conn.execute(CREATE_LOGS.replace("access_logs (", "access_logs_new (", 1))
+        conn.execute("""
+            INSERT INTO access_logs_new (id, user_id, confidence, access_granted, ts)
+            SELECT id, user_id, confidence, access_granted, iso_to_us(timestamp) FROM access_logs
+        """)
+        conn.execute("DROP TABLE access_logs")
+        conn.execute("ALTER TABLE access_logs_new RENAME TO access_logs")
+        migrated = True
+
+    return migrated
+
+
+def _migrate_add_door(conn) -> bool:
+    # Yalnızca sütun eklenir (tablo yeniden yazılmaz); eski kayıtlarda door NULL
+    if "door" in _columns(conn, "access_logs"):
+        return False
+    conn.execute("ALTER TABLE access_logs ADD COLUMN door TEXT")
+    return True
+
+
+def _migrate_add_db_uuid(conn) -> bool:
+    # Her veritabanı dosyasına bir kez rastgele kimlik verilir; embedding dosyası
+    # başlığında saklanır → sıfırlanan / geri yüklenen veritabanı fark edilir
+    migrated = False
+    if "db_uuid" not in _columns(conn, "gallery_version"):
+        conn.execute("ALTER TABLE gallery_version ADD COLUMN db_uuid TEXT")
+        migrated = True
+    conn.execute(
+        "UPDATE gallery_version SET db_uuid = ? WHERE id = 1 AND db_uuid IS NULL",
+        (uuid.uuid4().hex,)
+    )
+    return migrated
+
+
+def create_tables() -> None:
+    # users tablosundaki her yazma işlemi sayacı artırır → galeri önbelleği
+    # yalnızca gerçekten değişiklik olduğunda yeniden yüklenir
+    create_gallery_version = """
+    CREATE TABLE IF NOT EXISTS gallery_version (
+        id      INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL,
+        db_uuid TEXT
+    );
+    """
+
+    create_triggers = [
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_users_insert AFTER INSERT ON users
+        BEGIN UPDATE gallery_version SET version = version + 1 WHERE id = 1; END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_users_update AFTER UPDATE ON users
+        BEGIN UPDATE gallery_version SET version = version + 1 WHERE id = 1; END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_users_delete AFTER DELETE ON users
+        BEGIN UPDATE gallery_version SET version = version + 1 WHERE id = 1; END;
+        """,
+    ]
+
+    # Kullanıcıya göre son kayıtlar (user_id, ts DESC) index'inden, tabloya
+    # dokunmadan okunur (rowid = id index'te zaten var). Zaman aralığı
+    # toplamaları (kapı / durum / kullanıcı bazında) ve (ts, id) keyset
+    # sayfalaması idx_logs_ts_agg'den okunur (ts önde → sıralama index'ten gelir,
+    # yalnızca eşit ts'li satırlar id'ye göre dizilir). Ayrı bir ts index'i
+    # her INSERT'e gereksiz yazma maliyeti ekler; eski veritabanlarında silinir.
     create_indexes = [
-        "CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON access_logs(timestamp DESC);",
-        "CREATE INDEX IF NOT EXISTS idx_logs_user_id   ON access_logs(user_id);",
+        "DROP INDEX IF EXISTS idx_logs_ts;",
+        "CREATE INDEX IF NOT EXISTS idx_logs_ts_agg    ON access_logs(ts, access_granted, door, user_id);",
+        "CREATE INDEX IF NOT EXISTS idx_logs_user_ts   ON access_logs(user_id, ts DESC, access_granted, confidence);",
         "CREATE INDEX IF NOT EXISTS idx_users_name     ON users(name);",
+        "CREATE INDEX IF NOT EXISTS idx_user_emb_user  ON user_embeddings(user_id);",
+        "CREATE INDEX IF NOT EXISTS idx_enroll_user    ON enrollments(user_id);",
     ]
 
     with db_manager.get_connection() as conn:
-        conn.execute(create_users)
-        conn.execute(create_logs)
+        conn.execute(CREATE_USERS)
+        conn.execute(CREATE_LOGS)
+        conn.execute(CREATE_USER_EMBEDDINGS)
+        conn.execute(CREATE_ENROLLMENTS)
+        conn.execute(create_gallery_version)
+        conn.execute("INSERT OR IGNORE INTO gallery_version (id, version) VALUES (1, 0)")
+        if _migrate_text_timestamps(conn):
+            print("🔁 Zaman damgaları INTEGER (epoch µs) şemaya taşındı.")
+        if _migrate_add_door(conn):
+            print("🔁 access_logs tablosuna door sütunu eklendi.")
+        if _migrate_add_db_uuid(conn):
+            print("🔁 gallery_version tablosuna db_uuid sütunu eklendi.")
+        for trigger_sql in create_triggers:
+            conn.execute(trigger_sql)
         for idx_sql in create_indexes:
             conn.execute(idx_sql)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
     print("✅ Tüm tablo ve index'ler oluşturuldu.")
 
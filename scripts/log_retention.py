@@ -0,0 +1,39 @@
+import sys
+import os
+import argparse
+
+# face_access_system paketinin bulunduğu dizini path'a ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from face_access_system.config.settings import (
+    RETENTION_DAYS,
+    ARCHIVE_DIR,
+    ARCHIVE_FORMAT,
+    RETENTION_CHUNK_SIZE,
+)
+from face_access_system.database.export import EXPORT_FORMATS
+from face_access_system.database.retention import run_retention
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Eski access_logs kayıtlarını günlük dosyalara arşivle, sil ve alanı geri ver"
+    )
+    parser.add_argument("--days", type=int, default=RETENTION_DAYS, help="Bundan eski kayıtlar arşivlenir")
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR)
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default=ARCHIVE_FORMAT)
+    parser.add_argument("--chunk-size", type=int, default=RETENTION_CHUNK_SIZE)
+    parser.add_argument("--vacuum-pages", type=int, default=0, help="0 = tüm boş sayfalar")
+    parser.add_argument("--full-vacuum", action="store_true",
+                        help="Eski veritabanını bir kez auto_vacuum=INCREMENTAL'a çevir (uzun sürer)")
+    args = parser.parse_args()
+
+    report = run_retention(args.days, args.archive_dir, args.format, args.chunk_size,
+                           vacuum_pages=args.vacuum_pages, full_vacuum=args.full_vacuum)
+    print(f"✅ Kesim: {report.cutoff:%Y-%m-%d} | arşivlenen: {report.archived} | "
+          f"silinen: {report.deleted} | dosya: {len(report.files)} | "
+          f"geri verilen sayfa: {report.freed_pages}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import sys
+import os
+import time
+import argparse
+from datetime import datetime
+
+# face_access_system paketinin bulunduğu dizini path'a ekle (kütüphane
+# modülleriyle aynı modül nesneleri kullanılsın diye tam paket adıyla import)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+from face_access_system.database.embedding_codec import blob_to_embedding, embedding_to_blob
+from face_access_system.database.models import User
+from face_access_system.recognition.gallery import StaticGallery
+from face_access_system.recognition.quantization import QuantizedMatrix, int8_dot, quantize_int8
+from face_access_system.recognition.recognizer import FaceRecognizer
+from face_access_system.recognition.similarity import SimilarityMethod, cosine_similarity, similarity_matrix
+from face_access_system.scripts.ann_recall_report import make_gallery, make_queries
+
+DTYPES = ["float32", "float16", "int8"]
+
+
+def blob_report(embeddings: np.ndarray) -> None:
+    print("\n📦 SQLite BLOB formatı (kayıt başına)")
+    print("-" * 70)
+    print(f"  {'tip':>8} | {'bayt':>5} | {'max |Δx|':>10} | {'min cos(orij, geri)':>20}")
+    for dtype in DTYPES:
+        blobs = [embedding_to_blob(e, dtype) for e in embeddings]
+        back  = np.stack([blob_to_embedding(b) for b in blobs])
+        cos   = min(cosine_similarity(a, b) for a, b in zip(embeddings, back))
+        print(f"  {dtype:>8} | {len(blobs[0]):5d} | {np.abs(back - embeddings).max():10.2e} | "
+              f"{cos:20.8f}")
+
+
+def matching_report(
+    users, queries: np.ndarray, method: SimilarityMethod, batch: int
+) -> None:
+    print(f"\n🎯 Eşleştirme matrisi — {method.value}")
+    print("-" * 96)
+    print(f"  {'tip':>8} | {'matris MB':>9} | {'ms/kare':>8} | {'max |Δskor|':>11} | "
+          f"{'ort |Δskor|':>11} | {'top-1 uyumu':>11} | {'karar uyumu':>11}")
+
+    reference = None
+    for dtype in DTYPES:
+        gallery = StaticGallery(users, matrix_dtype=dtype)
+        recognizer = FaceRecognizer(gallery=gallery, method=method, top_k=1,
+                                    ann_index=None, ann_min_gallery_size=sys.maxsize)
+        snapshot = gallery.get_snapshot()
+        matrix_mb = (snapshot.matrix.nbytes + snapshot.norms.nbytes) / 2**20
+
+        start = time.perf_counter()
+        results = []
+        for i in range(0, len(queries), batch):
+            results.extend(recognizer.recognize_batch(list(queries[i:i + batch])))
+        per_frame = (time.perf_counter() - start) / max(1, len(queries) // batch)
+
+        # Kaba puanlar (yeniden puanlama öncesi) → nicemlemenin doğrudan etkisi
+        raw = similarity_matrix(queries, snapshot.matrix, snapshot.norms, method)
+
+        if reference is None:
+            reference = (raw, results)
+        ref_raw, ref_results = reference
+
+        delta = np.abs(raw - ref_raw)
+        top1 = np.mean([
+            r.all_scores[0][0].id == e.all_scores[0][0].id
+            for r, e in zip(results, ref_results)
+        ])
+        decision = np.mean([
+            r.is_recognized == e.is_recognized
+            and (r.matched_user.id if r.matched_user else None)
+            == (e.matched_user.id if e.matched_user else None)
+            for r, e in zip(results, ref_results)
+        ])
+        print(f"  {dtype:>8} | {matrix_mb:9.2f} | {per_frame * 1e3:8.2f} | {delta.max():11.2e} | "
+              f"{delta.mean():11.2e} | {top1:11.4f} | {decision:11.4f}")
+
+
+def int8_exactness(embeddings: np.ndarray, queries: np.ndarray) -> None:
+    # BLAS yolundaki float32 birikiminin int32 referansla birebir aynı olduğu
+    g = QuantizedMatrix.from_float(embeddings, "int8")
+    q_int, q_scales = quantize_int8(queries)
+    ref = int8_dot(q_int, g.data).astype(np.float64) * q_scales[:, None] * g.scales[None, :]
+    got = g.dot(queries)
+    print(f"\n🔢 int8 iç çarpım: BLAS ↔ int32 referans max fark = "
+          f"{np.abs(got - ref).max():.2e} (yalnızca ölçek çarpımı yuvarlaması)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="float16 / int8 nicemlemenin float32'ye göre doğruluk raporu")
+    parser.add_argument("--size", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--noise", type=float, default=0.02)
+    parser.add_argument("--batch", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    embeddings = make_gallery(args.size, rng)
+    queries, _ = make_queries(embeddings, args.queries, args.noise, rng)
+    now = datetime.now()
+    users = [User(i + 1, f"user_{i + 1}", embeddings[i], True, now) for i in range(args.size)]
+
+    print("\n" + "=" * 96)
+    print(f"  Nicemleme doğruluk raporu — galeri={args.size}, sorgu={args.queries}")
+    print("=" * 96)
+
+    blob_report(embeddings[:1000])
+    for method in SimilarityMethod:
+        matching_report(users, queries, method, args.batch)
+    int8_exactness(embeddings[:2000], queries[:64])
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import sys
+import os
+import argparse
+import contextlib
+
+# face_access_system paketinin bulunduğu dizini path'a ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from face_access_system.config.settings import TRACKING_ENABLED
+from face_access_system.pipeline.replay import STAGES, ReplayConfig, run_replay
+from face_access_system.scripts.init_db import create_tables
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Kayıtlı video / görüntü dizilerini ekransız, en yüksek hızda işler; "
+                    "kare başına kararları NDJSON olarak yazar"
+    )
+    parser.add_argument("sources", nargs="+", help="Video dosyaları ya da görüntü dizini (sıralı kareler)")
+    parser.add_argument("-o", "--output", default="-", help="NDJSON çıktı dosyası (- = stdout)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Kare aralıklarını işleyen süreç sayısı (0 = CPU çekirdek sayısı)")
+    parser.add_argument("--every-n", type=int, default=1, help="Her N karede bir analiz")
+    parser.add_argument("--scale", type=float, default=0.5, help="Algılama ölçeği")
+    parser.add_argument("--fps", type=float, default=30.0, help="Görüntü dizileri için kare hızı")
+    parser.add_argument("--no-tracking", action="store_true", default=not TRACKING_ENABLED)
+    parser.add_argument("--faces-only", action="store_true", help="Yüz bulunmayan kareleri yazma")
+    args = parser.parse_args()
+
+    for source in args.sources:
+        if not os.path.exists(source):
+            parser.error(f"Kaynak bulunamadı: {source}")
+
+    # Model / veritabanı mesajları stderr'e; stdout yalnızca NDJSON
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    config = ReplayConfig(
+        scale_factor=args.scale,
+        every_n=args.every_n,
+        tracking=not args.no_tracking,
+        sequence_fps=args.fps,
+        faces_only=args.faces_only,
+    )
+
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            create_tables()
+            report = run_replay(args.sources, out, config, workers=args.workers)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    # Özet stderr'e: stdout'taki NDJSON temiz kalsın
+    per_frame = report.stage_ms_per_frame()
+    stage_total = sum(report.stage_sec.values()) or 1.0
+    lines = [
+        "=" * 50,
+        f"  ✅ {report.frames} kare ({report.analyzed} analiz, {report.faces} yüz), "
+        f"{report.segments} segment",
+        f"     Süre: {report.elapsed:.2f} sn — {report.fps:.1f} kare/sn",
+    ]
+    for stage in STAGES:
+        lines.append(f"     {stage:8s} {report.stage_sec[stage]:8.2f} sn "
+                     f"({per_frame[stage]:6.2f} ms/kare, %{100 * report.stage_sec[stage] / stage_total:4.1f})")
+    lines.append("=" * 50)
+    print("\n".join(lines), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import sys
+import os
+import argparse
+import asyncio
+
+# face_access_system paketinin bulunduğu dizini path'a ekle
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from face_access_system.app_logging.access_logger import _stop_listener
+from face_access_system.config.settings import (
+    SERVICE_HOST,
+    SERVICE_PORT,
+    SERVICE_DETECT_WORKERS,
+    SERVICE_MAX_BATCH,
+    SERVICE_BATCH_WAIT_MS,
+)
+from face_access_system.pipeline.http_server import RecognitionHTTPServer
+from face_access_system.pipeline.service import RecognitionService
+from face_access_system.scripts.init_db import create_tables
+
+
+async def run(args: argparse.Namespace) -> None:
+    service = RecognitionService(
+        detect_workers=args.detect_workers,
+        max_batch=args.max_batch,
+        batch_wait_ms=args.batch_wait_ms,
+    )
+    server = RecognitionHTTPServer(service, host=args.host, port=args.port)
+    await server.start()
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()   # Kuyrukta bekleyen erişim kayıtlarını yazar
+        print(f"[Service] Kapandı. {service.stats()['batch']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Ekransız tanıma servisi (HTTP): /recognize, /recognize/batch, /enroll, /decisions, /health"
+    )
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--detect-workers", type=int, default=SERVICE_DETECT_WORKERS)
+    parser.add_argument("--max-batch", type=int, default=SERVICE_MAX_BATCH, help="Micro-batch başına en fazla yüz")
+    parser.add_argument("--batch-wait-ms", type=float, default=SERVICE_BATCH_WAIT_MS,
+                        help="Batch dolması için en fazla bekleme (gecikme bütçesi)")
+    args = parser.parse_args()
+
+    create_tables()
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        _stop_listener()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+import sys
+import os
+import shutil
+import argparse
+import tempfile
+
+# face_access_system paketinin bulunduğu dizini path'a ekle (kütüphane
+# modülleriyle aynı modül nesneleri kullanılsın diye tam paket adıyla import)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+from face_access_system.database import crud
+from face_access_system.database.db import ConnectionManager
+from face_access_system.recognition.ann_index import IVFIndex
+from face_access_system.recognition.embedding_store import EmbeddingStore, TemplateStore
+from face_access_system.recognition.gallery import GalleryCache
+from face_access_system.recognition.recognizer import FaceRecognizer
+from face_access_system.recognition.similarity import SimilarityMethod, compute_similarity
+from face_access_system.recognition.templates import TEMPLATE_REDUCERS, segment_reduce
+from face_access_system.scripts import init_db
+from face_access_system.scripts.ann_recall_report import make_gallery, make_queries
+
+# Çok şablonlu eşleştirmenin kaba kuvvet eşdeğerlik kontrolü. Geçici bir
+# veritabanına şablonlu, şablonsuz ve sonradan şablon eklenmiş kullanıcılar
+# yazılır; vektörel yollar (segment_reduce, TemplateGallery.score tüm galeri
+# ve rows= aday alt kümesi, IVF üzerinden recognize_batch, rescore) kullanıcı
+# başına skaler compute_similarity döngüsüyle karşılaştırılır. Fark
+# toleransı aşarsa çıkış kodu 1.
+
+
+def populate(size: int, max_templates: int, rng: np.random.Generator) -> None:
+    """Bölüm sınırlarını zorlayan karışık galeri (şablonsuz, eklemeli, silinmiş)."""
+    base = make_gallery(size, rng)
+    counts = rng.integers(0, max_templates + 1, size)
+    rows = []
+    for i in range(size):
+        if counts[i] == 0:
+            # Eski kayıt: yalnızca users.embedding (şablonsuz)
+            crud.create_user(f"plain_{i}", base[i])
+            continue
+        templates = base[i] + 0.3 * rng.standard_normal((counts[i], base.shape[1])).astype(np.float32)
+        rows.append((f"ext_{i}", f"user_{i}", templates, True))
+    crud.create_users_with_templates(rows)
+
+    ids = crud.get_user_ids()
+    # Sonradan şablon eklenen kullanıcılar (şablonsuz olanlarda embedding ilk şablon olur)
+    for user_id in rng.choice(ids, max(1, size // 10), replace=False):
+        crud.add_user_templates(int(user_id), rng.standard_normal((2, base.shape[1])).astype(np.float32))
+    # Silinen kullanıcılar dosyada boşluk bırakır (keep ≠ None)
+    for user_id in rng.choice(ids, max(1, size // 20), replace=False):
+        crud.delete_user(int(user_id))
+
+
+def reference_templates() -> dict:
+    """user_id → (T×D) şablonlar; şablonu olmayan kullanıcıda kendi embedding'i."""
+    _, owners, matrix = crud.get_templates_since(0)
+    templates = {user.id: user.embedding[None, :] for user in crud.get_all_users()}
+    for user_id in np.unique(owners):
+        templates[int(user_id)] = matrix[owners == user_id]
+    return templates
+
+
+def brute_force(queries: np.ndarray, user_ids, templates: dict, method: SimilarityMethod, reduce: str) -> np.ndarray:
+    out = np.empty((len(queries), len(user_ids)), dtype=np.float64)
+    for j, user_id in enumerate(user_ids):
+        for i, query in enumerate(queries):
+            scores = [compute_similarity(query, t, method=method) for t in templates[user_id]]
+            out[i, j] = max(scores) if reduce == "max" else np.mean(scores)
+    return out
+
+
+def check(label: str, got: np.ndarray, expected: np.ndarray, atol: float, failures: list) -> None:
+    got, expected = np.asarray(got, dtype=np.float64), np.asarray(expected, dtype=np.float64)
+    error = float(np.abs(got - expected).max()) if got.size else 0.0
+    ok = got.shape == expected.shape and error <= atol
+    print(f"  {label:44s} | {str(got.shape):>12} | {error:10.2e} | {'ok' if ok else 'FARKLI'}")
+    if not ok:
+        failures.append(label)
+
+
+def segment_check(reduce: str, rng: np.random.Generator, atol: float, failures: list) -> None:
+    counts = rng.integers(1, 6, 40)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    scores = rng.standard_normal((8, int(counts.sum()))).astype(np.float32)
+    pick = np.max if reduce == "max" else np.mean
+    expected = np.stack([pick(scores[:, s:s + c], axis=1) for s, c in zip(starts, counts)], axis=1)
+    check("segment_reduce", segment_reduce(scores, starts, counts, reduce), expected, atol, failures)
+
+
+def gallery_checks(
+    workdir: str, reduce: str, method: SimilarityMethod, queries: np.ndarray,
+    templates: dict, rng: np.random.Generator, atol: float, failures: list
+) -> None:
+    gallery = GalleryCache(poll_interval=0, matrix_dtype="float32",
+                           store=EmbeddingStore(os.path.join(workdir, "embeddings.bin")),
+                           template_match=reduce,
+                           template_store=TemplateStore(os.path.join(workdir, "templates.bin")))
+    try:
+        snapshot = gallery.get_snapshot()
+        tg = snapshot.templates
+        user_ids = [snapshot.users[row].id for row in range(len(snapshot.users))]
+        expected = brute_force(queries, user_ids, templates, method, reduce)
+
+        # Tüm galeri: sütunlar owner_rows sırasında
+        check("score (tüm galeri)", tg.score(queries, method), expected[:, tg.owner_rows], atol, failures)
+
+        # rows=: karışık sıralı aday alt kümesi (şablonlu + şablonsuz satırlar)
+        rows = rng.permutation(len(user_ids))[:max(1, len(user_ids) // 3)]
+        check("score (rows= aday alt kümesi)", tg.score(queries, method, rows), expected[:, rows], atol, failures)
+        if len(tg.implicit_rows):
+            rows = tg.implicit_rows[::-1]
+            check("score (rows= yalnızca şablonsuz)", tg.score(queries, method, rows),
+                  expected[:, rows], atol, failures)
+
+        rescored = [[tg.rescore(query, row, method) for row in range(len(user_ids))] for query in queries[:4]]
+        check("rescore", rescored, expected[:4], atol, failures)
+
+        # IVF aday yolu: recognize_batch → score(rows=adaylar) + rescore
+        index = IVFIndex(nlist=8, nprobe=2, path=None)
+        index.sync(snapshot)
+        recognizer = FaceRecognizer(gallery=gallery, method=method, top_k=5,
+                                    ann_index=index, ann_min_gallery_size=0)
+        if gallery.get_snapshot() is not snapshot or index.search(queries[:1], snapshot) is None:
+            # Aday yoksa tanıyıcı tam taramaya düşer; kontrol IVF yolunu sınamamış olur
+            print("  recognize_batch: IVF indeksi snapshot'a bağlanmadı")
+            failures.append("recognize_batch (IVF adayları)")
+            return
+        column = {user_id: j for j, user_id in enumerate(user_ids)}
+        got, want = [], []
+        for i, result in enumerate(recognizer.recognize_batch(list(queries))):
+            for user, score in result.all_scores:
+                got.append(score)
+                want.append(expected[i, column[user.id]])
+        check("recognize_batch (IVF adayları)", got, want, atol, failures)
+    finally:
+        gallery.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Çok şablonlu eşleştirmenin kaba kuvvet eşdeğerlik kontrolü")
+    parser.add_argument("--size", type=int, default=300)
+    parser.add_argument("--max-templates", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=16)
+    parser.add_argument("--atol", type=float, default=1e-4, help="float32 birikim farkı toleransı")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    workdir = tempfile.mkdtemp(prefix="template_match_")
+    # crud / init_db modül düzeyindeki db_manager'ı kullanır → geçici veritabanına yönlendir
+    manager = ConnectionManager(os.path.join(workdir, "templates.db"))
+    saved = crud.db_manager, init_db.db_manager
+    crud.db_manager = init_db.db_manager = manager
+    failures: list = []
+    try:
+        init_db.create_tables()
+        populate(args.size, args.max_templates, rng)
+        templates = reference_templates()
+        plain = len(templates) - len(np.unique(crud.get_templates_since(0)[1]))
+        queries, _ = make_queries(np.vstack([t.mean(axis=0) for t in templates.values()]),
+                                  args.queries, 0.05, rng)
+
+        print("\n" + "=" * 84)
+        print(f"  Şablon eşleştirme eşdeğerliği — kullanıcı={len(templates)}, "
+              f"şablonsuz={plain}, sorgu={args.queries}")
+        print("=" * 84)
+        for reduce in TEMPLATE_REDUCERS:
+            for method in SimilarityMethod:
+                print(f"\n🎯 {reduce} / {method.value}")
+                print("-" * 84)
+                segment_check(reduce, rng, args.atol, failures)
+                gallery_checks(workdir, reduce, method, queries, templates, rng, args.atol, failures)
+    finally:
+        manager.close_all()
+        crud.db_manager, init_db.db_manager = saved
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print()
+    if failures:
+        print(f"❌ {len(failures)} kontrolde fark var.")
+        sys.exit(1)
+    print("✅ Tüm yollar kaba kuvvetle aynı.")
+
+
+if __name__ == "__main__":
+    main()
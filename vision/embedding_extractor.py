@@ -1,5 +1,7 @@
+import os
 import numpy as np
-from typing import Optional
+import cv2
+from typing import List, Optional
 
 try:
     import dlib
@@ -7,35 +9,174 @@ try:
 except ImportError:
     DLIB_AVAILABLE = False
 
+from face_access_system.app_logging.metrics import metrics
 from face_access_system.config.settings import (
     DLIB_RECOGNITION_MODEL_PATH,
     EMBEDDING_DIM,
+    FALLBACK_PROJECTION_PATH,
+    FALLBACK_EXACT_BATCH,
 )
 
 
+class FallbackEmbedder:
+    """
+    Dlib yokken kullanılan rastgele izdüşüm embedding'i.
+
+    32×32 gri yüz (1024 boyut) sabit tohumlu Gauss matrisiyle 128 boyuta
+    indirgenir. Matris bir kez üretilir (ya da .npy önbelleğinden okunur);
+    çıktı, her çağrıda matrisi yeniden üreten eski gerçeklemeyle bit düzeyinde
+    aynıdır, bu yüzden mevcut kayıtlar eşleşmeye devam eder.
+    """
+
+    INPUT_SIZE: int = 32
+    SEED: int = 42
+
+    def __init__(
+        self,
+        cache_path: Optional[str] = FALLBACK_PROJECTION_PATH,
+        exact_batch: bool = FALLBACK_EXACT_BATCH
+    ):
+        self.exact_batch = exact_batch
+        self.projection  = self._load_projection(cache_path)
+
+    def _build_projection(self) -> np.ndarray:
+        rng = np.random.RandomState(self.SEED)
+        projection = rng.randn(self.INPUT_SIZE * self.INPUT_SIZE, EMBEDDING_DIM).astype(np.float32)
+        projection /= np.linalg.norm(projection, axis=0)
+        return projection
+
+    def _load_projection(self, cache_path: Optional[str]) -> np.ndarray:
+        shape = (self.INPUT_SIZE * self.INPUT_SIZE, EMBEDDING_DIM)
+
+        if cache_path and os.path.exists(cache_path):
+            try:
+                cached = np.load(cache_path)
+                if cached.shape == shape and cached.dtype == np.float32:
+                    return cached
+            except Exception as e:
+                print(f"[FallbackEmbedder] Projeksiyon önbelleği okunamadı: {e}")
+
+        projection = self._build_projection()
+
+        if cache_path:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                np.save(cache_path, projection)
+            except OSError as e:
+                print(f"[FallbackEmbedder] Projeksiyon önbelleği yazılamadı: {e}")
+
+        return projection
+
+    def _preprocess(self, face_image: np.ndarray) -> np.ndarray:
+        if len(face_image.shape) == 3:
+            gray = cv2.cvtColor(face_image, cv2.COLOR_RGB2GRAY)
+        else:
+            gray = face_image
+
+        resized = cv2.resize(gray, (self.INPUT_SIZE, self.INPUT_SIZE))
+        return resized.flatten().astype(np.float32)
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        norm = np.linalg.norm(embedding)
+        if norm > 0:
+            embedding = embedding / norm
+        return embedding.astype(np.float32)
+
+    def embed(self, face_image: np.ndarray) -> np.ndarray:
+        flat = self._preprocess(face_image)
+        flat = flat - flat.mean()
+        return self._normalize(flat @ self.projection)
+
+    def embed_batch(self, face_images: List[np.ndarray]) -> np.ndarray:
+        flats = np.stack([self._preprocess(img) for img in face_images])
+        flats -= flats.mean(axis=1, keepdims=True)
+
+        if self.exact_batch:
+            # Satır satır matris-vektör: tekli yol ile bit düzeyinde aynı sonuç.
+            # Tek GEMM toplama sırasını değiştirir (son bitlerde ~1e-7 fark).
+            projected = [flat @ self.projection for flat in flats]
+        else:
+            projected = flats @ self.projection
+
+        return np.stack([self._normalize(e) for e in projected])
+
+
 class EmbeddingExtractor:
-    def __init__(self):
-        self._model = None
-        self._init_model()
+    def __init__(self, fallback_cache_path: Optional[str] = FALLBACK_PROJECTION_PATH):
+        # fallback_cache_path=None → fallback projeksiyonu diske yazılmaz
+        self._model    = None
+        self._fallback = None
+        self._init_model(fallback_cache_path)
 
-    def _init_model(self) -> None:
+    def _init_model(self, fallback_cache_path: Optional[str]) -> None:
         if DLIB_AVAILABLE:
             self._model = dlib.face_recognition_model_v1(
                 DLIB_RECOGNITION_MODEL_PATH
             )
             print("[EmbeddingExtractor] Dlib ResNet-29 recognition model yüklendi.")
         else:
+            self._fallback = FallbackEmbedder(fallback_cache_path)
             print("[EmbeddingExtractor] ⚠️  Dlib model bulunamadı. Fallback aktif.")
 
+    @metrics.timed("embedding_extract_seconds", {"call": "single"})
     def extract(self, face_image: np.ndarray) -> Optional[np.ndarray]:
         if face_image is None:
             return None
+        metrics.inc("embeddings_total")
 
         if self._model is not None:
             return self._extract_dlib(face_image)
         else:
             return self._extract_fallback(face_image)
 
+    @metrics.timed("embedding_extract_seconds", {"call": "batch"})
+    def extract_batch(self, face_images: List[np.ndarray]) -> np.ndarray:
+        """
+        Birden çok yüz için tek çağrıda embedding çıkarır → (M×EMBEDDING_DIM).
+        Çıkarılamayan (None / hatalı) yüzlerin satırı sıfır vektördür.
+        """
+        embeddings = np.zeros((len(face_images), EMBEDDING_DIM), dtype=np.float32)
+        valid = [i for i, img in enumerate(face_images) if img is not None]
+        if not valid:
+            return embeddings
+
+        faces = [face_images[i] for i in valid]
+        metrics.inc("embeddings_total", len(faces))
+        if self._model is not None:
+            batch = self._extract_dlib_batch(faces)
+        else:
+            batch = self._extract_fallback_batch(faces)
+
+        if batch is not None:
+            embeddings[valid] = batch
+            return embeddings
+
+        # Toplu çağrı başarısız → yüz yüz
+        for i in valid:
+            embedding = (self._extract_dlib(face_images[i]) if self._model is not None
+                         else self._extract_fallback(face_images[i]))
+            if embedding is not None:
+                embeddings[i] = embedding
+
+        return embeddings
+
+    def _extract_dlib_batch(self, face_images: List[np.ndarray]) -> Optional[np.ndarray]:
+        try:
+            # dlib, hizalanmış yüz listesini tek bir ağ çağrısında işler
+            descriptors = self._model.compute_face_descriptor(face_images)
+            embeddings = np.array([np.array(d) for d in descriptors], dtype=np.float32)
+
+            assert embeddings.shape == (len(face_images), EMBEDDING_DIM), (
+                f"Beklenmeyen embedding boyutu: {embeddings.shape}"
+            )
+
+            return embeddings
+
+        except Exception as e:
+            print(f"[EmbeddingExtractor] Dlib batch extraction hata: {e}")
+            return None
+
     def _extract_dlib(self, face_image: np.ndarray) -> Optional[np.ndarray]:
         try:
             descriptor = self._model.compute_face_descriptor(face_image)
@@ -52,30 +193,17 @@ class EmbeddingExtractor:
             return None
 
     def _extract_fallback(self, face_image: np.ndarray) -> Optional[np.ndarray]:
-        import cv2
-
         try:
-            if len(face_image.shape) == 3:
-                gray = cv2.cvtColor(face_image, cv2.COLOR_RGB2GRAY)
-            else:
-                gray = face_image
-
-            resized = cv2.resize(gray, (32, 32))
-            flat = resized.flatten().astype(np.float32)
-            flat = flat - flat.mean()
-
-            rng = np.random.RandomState(42)
-            projection_matrix = rng.randn(1024, EMBEDDING_DIM).astype(np.float32)
-            projection_matrix /= np.linalg.norm(projection_matrix, axis=0)
+            return self._fallback.embed(face_image)
 
-            embedding = flat @ projection_matrix
-
-            norm = np.linalg.norm(embedding)
-            if norm > 0:
-                embedding = embedding / norm
+        except Exception as e:
+            print(f"[EmbeddingExtractor] Fallback extraction hata: {e}")
+            return None
 
-            return embedding.astype(np.float32)
+    def _extract_fallback_batch(self, face_images: List[np.ndarray]) -> Optional[np.ndarray]:
+        try:
+            return self._fallback.embed_batch(face_images)
 
         except Exception as e:
-            print(f"[EmbeddingExtractor] Fallback extraction hata: {e}")
-            return None
\ No newline at end of file
+            print(f"[EmbeddingExtractor] Fallback batch extraction hata: {e}")
+            return None
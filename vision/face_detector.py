@@ -8,6 +8,7 @@ try:
 except ImportError:
     DLIB_AVAILABLE = False
 
+from face_access_system.app_logging.metrics import metrics
 from face_access_system.config.settings import (
     DLIB_PREDICTOR_PATH,
     EMBEDDING_DIM,
@@ -41,13 +42,16 @@ class FaceDetector:
         self._haar = cv2.CascadeClassifier(cascade_path)
         print("[FaceDetector] ⚠️  OpenCV Haar Cascade fallback aktif.")
 
+    @metrics.timed("face_detect_seconds")
     def detect_faces(self, frame: np.ndarray) -> List[FaceROI]:
         if self._detector is not None:
-            return self._detect_dlib(frame)
+            faces = self._detect_dlib(frame)
         elif self._haar is not None:
-            return self._detect_opencv(frame)
+            faces = self._detect_opencv(frame)
         else:
             raise RuntimeError("Hiçbir yüz algılayıcı başlatılamadı.")
+        metrics.inc("faces_detected_total", len(faces))
+        return faces
 
     def _detect_dlib(self, frame: np.ndarray) -> List[FaceROI]:
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -70,6 +74,7 @@ class FaceDetector:
 
         return results
 
+    @metrics.timed("face_align_seconds")
     def _align_face(self, rgb: np.ndarray, shape) -> Optional[np.ndarray]:
         points = np.array([(shape.part(i).x, shape.part(i).y) for i in range(68)])
 
@@ -81,25 +86,30 @@ class FaceDetector:
         angle = np.degrees(np.arctan2(dy, dx))
 
         center = points.mean(axis=0)
-        tuple(center.astype(int))
 
         M = cv2.getRotationMatrix2D((int(center[0]), int(center[1])), angle, 1.0)
-        rotated = cv2.warpAffine(rgb, M, (rgb.shape[1], rgb.shape[0]))
 
         margin = 30
         ones  = np.ones((68, 1))
         pts_h = np.hstack([points, ones]).T
         new_pts = (M @ pts_h).T
 
+        frame_h, frame_w = rgb.shape[:2]
         x_min = max(0, int(new_pts[:, 0].min()) - margin)
-        x_max = min(rotated.shape[1], int(new_pts[:, 0].max()) + margin)
+        x_max = min(frame_w, int(new_pts[:, 0].max()) + margin)
         y_min = max(0, int(new_pts[:, 1].min()) - margin)
-        y_max = min(rotated.shape[0], int(new_pts[:, 1].max()) + margin)
+        y_max = min(frame_h, int(new_pts[:, 1].max()) + margin)
 
         if x_max - x_min < 10 or y_max - y_min < 10:
             return None
 
-        cropped = rotated[y_min:y_max, x_min:x_max]
+        # Tüm kareyi döndürüp kırpmak yerine yalnızca kırpılacak bölge üretilir:
+        # çıktıyı (x_min, y_min) kadar kaydırmak dönüşüme öteleme eklemektir.
+        # Maliyet kare çözünürlüğüyle değil yüz boyutuyla ölçeklenir.
+        M_local = M.copy()
+        M_local[0, 2] -= x_min
+        M_local[1, 2] -= y_min
+        cropped = cv2.warpAffine(rgb, M_local, (x_max - x_min, y_max - y_min))
         resized  = cv2.resize(cropped, (self.TARGET_SIZE, self.TARGET_SIZE))
 
         return resized
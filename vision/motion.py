@@ -0,0 +1,99 @@
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+from face_access_system.config.settings import (
+    MOTION_ANALYSIS_WIDTH,
+    MOTION_BACKGROUND_RATE,
+    MOTION_PIXEL_THRESHOLD,
+    MOTION_MIN_AREA_FRACTION,
+    MOTION_ROI_PADDING,
+)
+
+Box = Tuple[int, int, int, int]
+
+
+def merge_boxes(boxes: List[Box]) -> List[Box]:
+    """Kesişen kutuları birleştirir (aynı yüz iki ROI'de iki kez algılanmasın)."""
+    merged = [list(b) for b in boxes]
+    changed = True
+    while changed:
+        changed = False
+        out: List[List[int]] = []
+        for box in merged:
+            for other in out:
+                if (box[0] <= other[0] + other[2] and other[0] <= box[0] + box[2]
+                        and box[1] <= other[1] + other[3] and other[1] <= box[1] + box[3]):
+                    x1, y1 = min(box[0], other[0]), min(box[1], other[1])
+                    x2 = max(box[0] + box[2], other[0] + other[2])
+                    y2 = max(box[1] + box[3], other[1] + other[3])
+                    other[:] = [x1, y1, x2 - x1, y2 - y1]
+                    changed = True
+                    break
+            else:
+                out.append(box)
+        merged = out
+    return [tuple(b) for b in merged]
+
+
+class MotionDetector:
+    """
+    Ucuz hareket algılama: küçültülmüş gri kare, yavaş güncellenen arka plan
+    ortalamasından farkla eşiklenir. Hareketli bölgeler (dolgulu, birleştirilmiş)
+    orijinal kare koordinatlarında ROI olarak döner.
+    """
+
+    def __init__(
+        self,
+        analysis_width: int = MOTION_ANALYSIS_WIDTH,
+        background_rate: float = MOTION_BACKGROUND_RATE,
+        pixel_threshold: int = MOTION_PIXEL_THRESHOLD,
+        min_area_fraction: float = MOTION_MIN_AREA_FRACTION,
+        roi_padding: float = MOTION_ROI_PADDING
+    ):
+        self.analysis_width    = analysis_width
+        self.background_rate   = background_rate
+        self.pixel_threshold   = pixel_threshold
+        self.min_area_fraction = min_area_fraction
+        self.roi_padding       = roi_padding
+
+        self._background = None
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+
+    def reset(self) -> None:
+        self._background = None
+
+    def detect(self, frame: np.ndarray) -> List[Box]:
+        h, w = frame.shape[:2]
+        scale = self.analysis_width / float(w)
+        small = cv2.resize(frame, (self.analysis_width, max(1, int(h * scale))),
+                           interpolation=cv2.INTER_AREA)
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+
+        if self._background is None:
+            self._background = gray.astype(np.float32)
+            return []
+
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self._background))
+        cv2.accumulateWeighted(gray, self._background, self.background_rate)
+
+        _, mask = cv2.threshold(diff, self.pixel_threshold, 255, cv2.THRESH_BINARY)
+        mask = cv2.dilate(mask, self._kernel, iterations=2)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        min_area = self.min_area_fraction * mask.shape[0] * mask.shape[1]
+        boxes: List[Box] = []
+        for contour in contours:
+            if cv2.contourArea(contour) < min_area:
+                continue
+            x, y, bw, bh = cv2.boundingRect(contour)
+            # Yüz hareketli bölgenin kenarında kalabilir → kutuyu genişlet
+            pad_x, pad_y = int(bw * self.roi_padding), int(bh * self.roi_padding)
+            x1 = max(0, int((x - pad_x) / scale))
+            y1 = max(0, int((y - pad_y) / scale))
+            x2 = min(w, int((x + bw + pad_x) / scale))
+            y2 = min(h, int((y + bh + pad_y) / scale))
+            boxes.append((x1, y1, x2 - x1, y2 - y1))
+
+        return merge_boxes(boxes)
@@ -0,0 +1,157 @@
+import itertools
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from face_access_system.config.settings import (
+    TRACK_IOU_THRESHOLD,
+    TRACK_MAX_MISSES,
+    TRACK_REVERIFY_SEC,
+    TRACK_UNKNOWN_RETRY_SEC,
+    TRACK_CONFIDENCE_HALF_LIFE,
+)
+
+Box = Tuple[int, int, int, int]
+
+
+@dataclass
+class Track:
+    track_id:   int
+    box:        np.ndarray                  # [x, y, w, h] (float, filtrelenmiş)
+    velocity:   np.ndarray                  # [vx, vy] piksel/sn
+    updated_at: float
+    hits:       int = 1
+    misses:     int = 0
+    result:     Any = None                  # Son RecognitionResult
+    confidence: float = 0.0                 # Son doğrulamadaki benzerlik
+    verified_at: Optional[float] = None
+    recognized: bool = False
+
+    def predict(self, t: float) -> np.ndarray:
+        box = self.box.copy()
+        box[:2] += self.velocity * (t - self.updated_at)
+        return box
+
+
+def iou(a: np.ndarray, b: np.ndarray) -> float:
+    ax2, ay2 = a[0] + a[2], a[1] + a[3]
+    bx2, by2 = b[0] + b[2], b[1] + b[3]
+    iw = max(0.0, min(ax2, bx2) - max(a[0], b[0]))
+    ih = max(0.0, min(ay2, by2) - max(a[1], b[1]))
+    inter = iw * ih
+    union = a[2] * a[3] + b[2] * b[3] - inter
+    return inter / union if union > 0 else 0.0
+
+
+class FaceTracker:
+    """
+    Kareler arası hafif yüz takibi.
+
+    Algılanan kutular, izlerin tahmin edilen konumlarıyla IoU (yetmezse merkez
+    uzaklığı) üzerinden açgözlü eşleştirilir. Konum/hız sabit hızlı α-β
+    filtresiyle (durağan Kalman) güncellenir; böylece kutular algılamanın
+    çalışmadığı karelerde de tahminle ilerletilebilir.
+
+    Pahalı embedding + eşleştirme yalnızca iz yeniyse ya da yeniden doğrulama
+    süresi (tanınan iz için reverify_sec, tanınmayan için unknown_retry_sec)
+    dolduysa çalışır. Zamanla azalan kimlik güveni bu süreleri kısaltmaz;
+    aynı karede birden çok iz beklerken yalnızca sırayı belirler (en zayıf
+    kimlik önce).
+    """
+
+    ALPHA: float = 0.6      # Konum düzeltme kazancı
+    BETA:  float = 0.3      # Hız düzeltme kazancı
+
+    def __init__(
+        self,
+        iou_threshold: float = TRACK_IOU_THRESHOLD,
+        max_misses: int = TRACK_MAX_MISSES,
+        reverify_sec: float = TRACK_REVERIFY_SEC,
+        unknown_retry_sec: float = TRACK_UNKNOWN_RETRY_SEC,
+        confidence_half_life: float = TRACK_CONFIDENCE_HALF_LIFE
+    ):
+        self.iou_threshold        = iou_threshold
+        self.max_misses           = max_misses
+        self.reverify_sec         = reverify_sec
+        self.unknown_retry_sec    = unknown_retry_sec
+        self.confidence_half_life = confidence_half_life
+
+        self.tracks: List[Track] = []
+        self._ids = itertools.count(1)
+
+    # ─── İlişkilendirme ─────────────────────────────
+    def update(self, boxes: List[Box], t: float) -> List[Track]:
+        """Her algılama için (eşleşen ya da yeni) izi, aynı sırada döndürür."""
+        detections = [np.asarray(b, dtype=np.float64) for b in boxes]
+        predicted  = [track.predict(t) for track in self.tracks]
+
+        pairs = []
+        for ti, pbox in enumerate(predicted):
+            for di, dbox in enumerate(detections):
+                score = iou(pbox, dbox)
+                if score < self.iou_threshold:
+                    # Hızlı harekette IoU sıfırlanabilir → merkez uzaklığına bak
+                    dist = np.linalg.norm((pbox[:2] + pbox[2:] / 2) - (dbox[:2] + dbox[2:] / 2))
+                    if dist > 0.5 * max(pbox[2], dbox[2]):
+                        continue
+                    score = self.iou_threshold * (1.0 - dist / max(pbox[2], dbox[2], 1.0))
+                pairs.append((score, ti, di))
+
+        assigned: List[Optional[Track]] = [None] * len(detections)
+        used_tracks = set()
+        for _, ti, di in sorted(pairs, reverse=True):
+            if ti in used_tracks or assigned[di] is not None:
+                continue
+            used_tracks.add(ti)
+            assigned[di] = self._correct(self.tracks[ti], predicted[ti], detections[di], t)
+
+        for ti, track in enumerate(self.tracks):
+            if ti not in used_tracks:
+                track.misses += 1
+
+        self.tracks = [tr for tr in self.tracks if tr.misses <= self.max_misses]
+
+        for di, dbox in enumerate(detections):
+            if assigned[di] is None:
+                track = Track(track_id=next(self._ids), box=dbox,
+                              velocity=np.zeros(2), updated_at=t)
+                self.tracks.append(track)
+                assigned[di] = track
+
+        return assigned
+
+    def _correct(self, track: Track, predicted: np.ndarray, measured: np.ndarray, t: float) -> Track:
+        dt = max(t - track.updated_at, 1e-3)
+        residual = measured - predicted
+
+        track.box = predicted + self.ALPHA * residual
+        track.velocity = track.velocity + (self.BETA / dt) * residual[:2]
+        track.updated_at = t
+        track.hits += 1
+        track.misses = 0
+        return track
+
+    # ─── Kimlik doğrulama zamanlaması ───────────────
+    def identity_confidence(self, track: Track, t: float) -> float:
+        if track.verified_at is None:
+            return 0.0
+        age = t - track.verified_at
+        return track.confidence * 0.5 ** (age / self.confidence_half_life)
+
+    def needs_recognition(self, track: Track, t: float) -> bool:
+        if track.verified_at is None:
+            return True
+        age = t - track.verified_at
+        return age >= (self.reverify_sec if track.recognized else self.unknown_retry_sec)
+
+    def pending_recognitions(self, tracks: List[Track], t: float) -> List[int]:
+        """Tanıma gereken izlerin sırası; eşitlikte zayıf (azalmış) güven önce."""
+        due = [i for i, track in enumerate(tracks) if self.needs_recognition(track, t)]
+        return sorted(due, key=lambda i: self.identity_confidence(tracks[i], t))
+
+    def set_result(self, track: Track, result: Any, t: float) -> None:
+        track.result      = result
+        track.confidence  = float(result.confidence)
+        track.recognized  = bool(result.is_recognized)
+        track.verified_at = t